@@ -158,37 +158,30 @@ class HouseModelBuilder:
         vertices_3d = []
         voxels = []
 
+        table = self.modele.table_materiaux
+
+        # Centres des volumes de contrôle par axe, origine à la face basse du
+        # premier voxel (grille uniforme: (i + 0.5)·ds)
+        centres = []
+        for axe in range(3):
+            faces = self.params.faces_m(axe)
+            centres.append(0.5 * (faces[:-1] + faces[1:]) - faces[0])
+
         # Parcourir tous les voxels de la grille
         for i in range(self.params.N_x):
             for j in range(self.params.N_y):
                 for k in range(self.params.N_z):
                     # Coordonnées physiques du centre du voxel
-                    x = (i + 0.5) * self.params.ds
-                    y = (j + 0.5) * self.params.ds
-                    z = (k + 0.5) * self.params.ds
-
-                    # Identifier le matériau
-                    alpha_val = self.modele.Alpha[i, j, k]
-
-                    # Déterminer le matériau
-                    material_name = "AIR"
-                    if alpha_val < 0:
-                        material_name = "AIR"
-                    else:
-                        # Chercher le matériau correspondant
-                        lambda_val = self.modele.Lambda[i, j, k]
-                        rho_cp_val = self.modele.RhoCp[i, j, k]
-
-                        # Trouver le matériau qui correspond
-                        for nom, props in MATERIAUX.items():
-                            if props["type"] == "SOLIDE":
-                                if abs(props["alpha"] - alpha_val) < 1e-9:
-                                    material_name = nom
-                                    break
-                            elif props["type"] == "LIMITE_FIXE" and alpha_val == 0.0:
-                                if lambda_val == 0.0 and rho_cp_val == 0.0:
-                                    material_name = "LIMITE_FIXE"
-                                    break
+                    x = centres[0][i]
+                    y = centres[1][j]
+                    z = centres[2][k]
+
+                    # Identifier le matériau (lecture exacte dans la table)
+                    entree = table[self.modele.Materiau[i, j, k]]
+                    material_name = entree["nom"]
+                    alpha_val = entree["alpha"]
+                    lambda_val = entree["lambda"]
+                    rho_cp_val = entree["rho_cp"]
 
                     # Ne stocker que les voxels non-air pour optimiser
                     if material_name != "AIR" or alpha_val != 0.0:
@@ -269,6 +262,45 @@ class HouseModelBuilder:
 
         return {"status": "success", "model": model_json}
 
+    def save_model(self, filepath: str) -> dict:
+        """
+        Sauvegarde le modèle au format binaire .hsm (relisible par main.py).
+
+        Args:
+            filepath: Chemin du fichier .hsm
+
+        Returns:
+            dict: Résultat de l'opération
+        """
+        if not self.model_initialized:
+            return {"status": "error", "message": "Aucun modèle initialisé"}
+
+        self.modele.preparer_simulation()
+        self.modele.sauvegarder(filepath)
+        return {"status": "success", "message": f"Modèle sauvegardé dans {filepath}"}
+
+    def load_model(self, filepath: str) -> dict:
+        """
+        Ouvre un modèle .hsm (grilles projetées en mémoire, ouverture immédiate).
+        Les fichiers pickle sont refusés: ils peuvent exécuter du code.
+
+        Args:
+            filepath: Chemin du fichier .hsm
+
+        Returns:
+            dict: Informations sur le modèle chargé
+        """
+        logger = self.logger or LoggerSimulation(niveau="INFO")
+        modele = ModeleMaison.charger(filepath, logger)
+        if modele is None:
+            return {"status": "error", "message": f"Impossible de charger '{filepath}'"}
+
+        self.logger = logger
+        self.modele = modele
+        self.params = modele.params
+        self.model_initialized = True
+        return self.get_model_info()
+
     def get_model_info(self) -> dict:
         """
         Retourne les informations sur le modèle actuel.
@@ -281,17 +313,9 @@ class HouseModelBuilder:
 
         # Compter les voxels par type de matériau
         material_counts = {}
-        for i in range(self.params.N_x):
-            for j in range(self.params.N_y):
-                for k in range(self.params.N_z):
-                    alpha_val = self.modele.Alpha[i, j, k]
-                    if alpha_val < 0:
-                        mat = "AIR"
-                    elif alpha_val == 0.0:
-                        mat = "LIMITE_FIXE"
-                    else:
-                        mat = "SOLIDE"
-                    material_counts[mat] = material_counts.get(mat, 0) + 1
+        for nom, nb in self.modele.compter_materiaux().items():
+            mat = MATERIAUX[nom]["type"] if nom in MATERIAUX else "SOLIDE"
+            material_counts[mat] = material_counts.get(mat, 0) + nb
 
         return {
             "status": "success",
@@ -392,6 +416,28 @@ async def list_tools() -> list[Tool]:
                 }
             }
         ),
+        Tool(
+            name="save_model",
+            description="Sauvegarde le modèle au format binaire .hsm (utilisable par la simulation)",
+            inputSchema={
+                "type": "object",
+                "properties": {
+                    "filepath": {"type": "string", "description": "Chemin du fichier .hsm"}
+                },
+                "required": ["filepath"]
+            }
+        ),
+        Tool(
+            name="load_model",
+            description="Ouvre un modèle .hsm existant (chargement paresseux, pickle refusé)",
+            inputSchema={
+                "type": "object",
+                "properties": {
+                    "filepath": {"type": "string", "description": "Chemin du fichier .hsm"}
+                },
+                "required": ["filepath"]
+            }
+        ),
         Tool(
             name="get_model_info",
             description="Retourne les informations sur le modèle actuel (dimensions, nombre de voxels, etc.)",
@@ -427,6 +473,10 @@ async def call_tool(name: str, arguments: dict) -> list[TextContent]:
             result = builder.export_to_json(
                 filepath=arguments.get("filepath")
             )
+        elif name == "save_model":
+            result = builder.save_model(filepath=arguments["filepath"])
+        elif name == "load_model":
+            result = builder.load_model(filepath=arguments["filepath"])
         elif name == "get_model_info":
             result = builder.get_model_info()
         else:
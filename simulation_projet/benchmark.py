@@ -0,0 +1,290 @@
+# Fichier: benchmark.py
+# Mesure la vitesse des moteurs de simulation sur une maison type
+# construite sur la grille de creer_modele.py (9.5 x 15.0 x 6.6 m, ds=0.1 -> 96x151x67).
+#
+# Usage: python benchmark.py [nb_pas]
+
+import os
+import sys
+import tempfile
+import time
+import tracemalloc
+import numpy as np
+from logger import LoggerSimulation
+from parametres import ParametresSimulation, coordonnees_axe
+from modele import ModeleMaison
+from model_data import ZoneAir
+from simulation import Simulation
+from maillage_blocs import GeometrieBoites, SimulationBlocs
+from noyau_numba import NUMBA_DISPONIBLE
+
+
+def construire_maison_benchmark(logger, ds=0.1, dt=10.0, dims_m=(9.5, 15.0, 6.6), coords_m=None,
+                                geometrie=False):
+    '''
+    Construit une maison plain-pied type: sol, dalle isolée, murs parpaing
+    + isolant + placo, plafond isolé, une pièce d'air.
+    coords_m: grille non uniforme (voir coords_maison_non_uniforme), sinon pas ds.
+    geometrie: renvoie la description par boîtes (GeometrieBoites, pour
+    SimulationBlocs) au lieu d'un ModeleMaison préparé.
+    '''
+    L_x, L_y, L_z = dims_m
+    params = ParametresSimulation(
+        logger, dims_m=dims_m, ds=ds, dt=dt,
+        T_interieur_init=20.0, T_exterieur_init=0.0, T_sol_init=10.0, coords_m=coords_m
+    )
+    modele = GeometrieBoites(params) if geometrie else ModeleMaison(params)
+
+    # Extérieur et sol profond (limites fixes)
+    modele.construire_volume_metres((0.0, 0.0, 0.0), (L_x, L_y, L_z), "LIMITE_FIXE",
+                                    T_override_K=params.T_exterieur_init)
+    modele.construire_volume_metres((0.0, 0.0, 0.0), (L_x, L_y, 0.1), "LIMITE_FIXE",
+                                    T_override_K=params.T_sol_init)
+
+    # Terre sous la maison
+    modele.construire_volume_metres((0.5, 0.5, 0.2), (L_x - 0.5, L_y - 0.5, 0.8), "TERRE")
+    # Dalle: polystyrène + béton
+    modele.construire_volume_metres((1.0, 1.0, 0.9), (L_x - 1.0, L_y - 1.0, 1.0), "POLYSTYRENE")
+    modele.construire_volume_metres((1.0, 1.0, 1.1), (L_x - 1.0, L_y - 1.0, 1.2), "BETON")
+
+    # Murs: parpaing extérieur, laine de verre, placo intérieur
+    haut = 4.0
+    modele.construire_volume_metres((1.0, 1.0, 1.3), (L_x - 1.0, L_y - 1.0, haut), "PARPAING")
+    modele.construire_volume_metres((1.3, 1.3, 1.3), (L_x - 1.3, L_y - 1.3, haut), "LAINE_VERRE")
+    modele.construire_volume_metres((1.5, 1.5, 1.3), (L_x - 1.5, L_y - 1.5, haut), "PLACO")
+    modele.construire_volume_metres((1.6, 1.6, 1.3), (L_x - 1.6, L_y - 1.6, haut - 0.4), "AIR")
+
+    # Plafond isolé
+    modele.construire_volume_metres((1.0, 1.0, haut + 0.1), (L_x - 1.0, L_y - 1.0, haut + 0.4),
+                                    "LAINE_BOIS")
+
+    if not geometrie:
+        modele.preparer_simulation()
+    return modele
+
+
+def construire_maison_pieces(logger, nb_pieces=(6, 6), ds=0.1, dt=10.0, cote_m=0.7):
+    '''
+    Plateau de nb_pieces pièces carrées (une zone d'air chacune, 15 à 19°C)
+    séparées par des cloisons béton d'un voxel: les voxels des cloisons
+    touchent deux zones.
+    '''
+    pas_m = cote_m + ds
+    L_x, L_y, L_z = nb_pieces[0] * pas_m + 0.5, nb_pieces[1] * pas_m + 0.5, 3.0
+    params = ParametresSimulation(logger, dims_m=(L_x, L_y, L_z), ds=ds, dt=dt,
+                                  T_interieur_init=20.0, T_exterieur_init=0.0)
+    modele = ModeleMaison(params)
+    modele.construire_volume_metres((0.0, 0.0, 0.0), (L_x, L_y, L_z), "LIMITE_FIXE")
+    modele.construire_volume_metres((0.1, 0.1, 0.1), (L_x - 0.1, L_y - 0.1, L_z - 0.1), "BETON")
+    for i in range(nb_pieces[0]):
+        for j in range(nb_pieces[1]):
+            id_zone = -(1 + i * nb_pieces[1] + j)
+            T_init = 15.0 + (i + j) % 5
+            x0, y0 = 0.3 + i * pas_m, 0.3 + j * pas_m
+            s = tuple(slice(modele._coord_m_vers_idx(debut, axe), modele._coord_m_vers_idx(fin, axe) + 1)
+                      for axe, (debut, fin) in enumerate(((x0, x0 + cote_m - ds), (y0, y0 + cote_m - ds),
+                                                          (0.3, L_z - 0.3))))
+            modele.zones_air[id_zone] = ZoneAir(f"piece_{i}_{j}", logger, T_init)
+            modele._placer(s, "AIR", id_zone)
+            modele.T[s] = T_init
+    modele.preparer_simulation()
+    return modele
+
+
+def coords_maison_non_uniforme(ds_fin, ds_grossier, dims_m=(9.5, 15.0, 6.6)):
+    '''
+    Coordonnées non uniformes pour construire_maison_benchmark: pas ds_fin
+    dans l'épaisseur des murs, de la dalle et du plafond, ds_grossier dans
+    la pièce, la terre et l'extérieur.
+    '''
+    L_x, L_y, L_z = dims_m
+    coords = [coordonnees_axe(L, ds_grossier, [(0.9, 1.7, ds_fin), (L - 1.7, L - 0.9, ds_fin)])
+              for L in (L_x, L_y)]
+    coords.append(coordonnees_axe(L_z, ds_grossier, [(0.8, 1.4, ds_fin), (3.5, 4.5, ds_fin)]))
+    return tuple(coords)
+
+
+def mesurer_moteur(modele, nb_pas, reference=None, **options):
+    '''Exécute nb_pas pas de temps et renvoie (pas/s, écart max à la référence, T final).'''
+    with tempfile.TemporaryDirectory() as dossier:
+        sim = Simulation(modele, chemin_sortie=dossier, **options)
+        sim._pas_de_temps()  # Échauffement
+
+        debut = time.perf_counter()
+        for _ in range(nb_pas):
+            sim._pas_de_temps()
+        duree = time.perf_counter() - debut
+        sim.fermer()
+
+    # Remettre l'air dans l'état initial pour le moteur suivant
+    for zone in modele.zones_air.values():
+        zone.T = modele.params.T_interieur_init
+
+    ecart = None
+    if reference is not None:
+        ecart = float(np.max(np.abs(sim.grille_complete() - reference)))
+    return nb_pas / duree, ecart, sim.grille_complete()
+
+
+def mesurer_blocs(modele, nb_pas, niveaux_max=4):
+    '''Pas/s et nombre de cellules du maillage par blocs (SimulationBlocs).'''
+    with tempfile.TemporaryDirectory() as dossier:
+        sim = SimulationBlocs(modele, niveaux_max=niveaux_max, chemin_sortie=dossier)
+        sim._pas_de_temps()  # Échauffement
+
+        debut = time.perf_counter()
+        for _ in range(nb_pas):
+            sim._pas_de_temps()
+        duree = time.perf_counter() - debut
+
+    for zone in modele.zones_air.values():
+        zone.T = modele.params.T_interieur_init
+    return nb_pas / duree, sim.maillage.nb_cellules
+
+
+def mesurer_convection(modele, nb_repetitions, **options):
+    '''Durée moyenne (ms) de l'étape de convection semi-implicite (toutes les zones).'''
+    with tempfile.TemporaryDirectory() as dossier:
+        sim = Simulation(modele, chemin_sortie=dossier, **options)
+        sim._pas_de_temps()
+        debut = time.perf_counter()
+        for _ in range(nb_repetitions):
+            sim._etape_convection_implicite()
+        duree = time.perf_counter() - debut
+    return 1e3 * duree / nb_repetitions
+
+
+def mesurer_allocations(modele, nb_pas, **options):
+    '''Octets alloués temporairement par pas (pic tracemalloc au-dessus de l'état stable).'''
+    with tempfile.TemporaryDirectory() as dossier:
+        sim = Simulation(modele, chemin_sortie=dossier, **options)
+        sim._pas_de_temps()  # Échauffement (vues et caches créés au premier pas)
+        sim._pas_de_temps()
+
+        tracemalloc.start()
+        pic_max = 0
+        for _ in range(nb_pas):
+            courant = tracemalloc.get_traced_memory()[0]
+            tracemalloc.reset_peak()
+            sim._pas_de_temps()
+            pic_max = max(pic_max, tracemalloc.get_traced_memory()[1] - courant)
+        tracemalloc.stop()
+
+    for zone in modele.zones_air.values():
+        zone.T = modele.params.T_interieur_init
+    return pic_max
+
+
+def mesurer_regime_permanent(logger, ds, dims_m=(4.0, 4.0, 5.0)):
+    '''Itérations linéaires et durée du régime permanent pour chaque solveur itératif.'''
+    resultats = {}
+    for solveur in ("bicgstab", "multigrille"):
+        modele = construire_maison_benchmark(logger, ds=ds, dims_m=dims_m)
+        with tempfile.TemporaryDirectory() as dossier:
+            sim = Simulation(modele, chemin_sortie=dossier)
+            debut = time.perf_counter()
+            iterations = sim.resoudre_regime_permanent(solveur=solveur)["iterations_lineaires"]
+            duree = time.perf_counter() - debut
+        resultats[solveur] = (iterations, duree)
+    return resultats
+
+
+def main():
+    nb_pas = int(sys.argv[1]) if len(sys.argv) > 1 else 20
+    logger = LoggerSimulation(niveau="WARN")
+
+    modele = construire_maison_benchmark(logger)
+    p = modele.params
+    print(f"Grille: {p.N_x}x{p.N_y}x{p.N_z} ({p.N_x * p.N_y * p.N_z} voxels), {nb_pas} pas")
+
+    vitesse_ref, _, T_ref = mesurer_moteur(modele, nb_pas, moteur="numpy")
+    print(f"  moteur=numpy    : {vitesse_ref:8.2f} pas/s (référence)")
+
+    for moteur in Simulation.MOTEURS:
+        if moteur == "numpy":
+            continue
+        if moteur == "numba" and not NUMBA_DISPONIBLE:
+            print(f"  moteur={moteur:9s}: indisponible (numba non installé)")
+            continue
+        vitesse, ecart, _ = mesurer_moteur(modele, nb_pas, reference=T_ref, moteur=moteur)
+        print(f"  moteur={moteur:9s}: {vitesse:8.2f} pas/s (x{vitesse / vitesse_ref:.2f}), "
+              f"écart max = {ecart:.2e} K")
+
+    # Recadrage sur la boîte englobante des voxels non fixes
+    _, boite = modele.recadrer()
+    taille = np.prod([b.stop - b.start for b in boite])
+    print(f"Recadrage: {taille} voxels sur {T_ref.size} ({100.0 * taille / T_ref.size:.0f}%)")
+    for moteur in ("numpy", "creux"):
+        vitesse, ecart, _ = mesurer_moteur(modele, nb_pas, reference=T_ref, moteur=moteur, recadrer=True)
+        print(f"  moteur={moteur:9s} recadré: {vitesse:8.2f} pas/s (x{vitesse / vitesse_ref:.2f}), "
+              f"écart max = {ecart:.2e} K")
+
+    # Maillage par blocs: cellules grossières loin des interfaces (niveau 0 = voxel),
+    # construit depuis la description par boîtes (sans grille fine)
+    print("Maillage par blocs (niveaux_max=4):")
+    for ds in (0.1, 0.05):
+        geometrie = construire_maison_benchmark(logger, ds=ds, dt=2.0, geometrie=True)
+        nb_voxels = int(np.prod(geometrie.forme))
+        vitesse, nb_cellules = mesurer_blocs(geometrie, nb_pas)
+        print(f"  ds={ds:4.2f} m: {nb_cellules} cellules pour {nb_voxels} voxels "
+              f"(/{nb_voxels / nb_cellules:.1f}), {vitesse:8.2f} pas/s")
+
+    # Grille non uniforme: 2 cm dans les parois, 25 cm ailleurs, contre 2 cm partout
+    modele_nu = construire_maison_benchmark(logger, dt=5.0, coords_m=coords_maison_non_uniforme(0.02, 0.25))
+    p_fin = ParametresSimulation(logger, dims_m=(p.L_x, p.L_y, p.L_z), ds=0.02)
+    nb_fin = p_fin.N_x * p_fin.N_y * p_fin.N_z
+    vitesse, _, _ = mesurer_moteur(modele_nu, nb_pas, moteur="numpy")
+    print(f"Grille non uniforme (parois à 2 cm): {modele_nu.T.size} voxels contre {nb_fin} en uniforme "
+          f"(/{nb_fin / modele_nu.T.size:.0f}), {vitesse:8.2f} pas/s")
+
+    # Précision float32: températures et coefficients du stencil sur 4 octets
+    print("Précision float32 (stencil), bilans en float64:")
+    for moteur in ("numpy", "tampons"):
+        vitesse, ecart, _ = mesurer_moteur(modele, nb_pas, reference=T_ref, moteur=moteur, precision="float32")
+        print(f"  moteur={moteur:9s} float32: {vitesse:8.2f} pas/s (x{vitesse / vitesse_ref:.2f}), "
+              f"écart max = {ecart:.2e} K")
+
+    # Convection multi-zones: réductions par zone sur tables plates, coût indépendant du nombre de zones
+    print("Convection semi-implicite (plateau de pièces, cloisons d'un voxel):")
+    for nb_pieces in ((2, 2), (6, 6), (10, 10)):
+        modele_pieces = construire_maison_pieces(logger, nb_pieces=nb_pieces)
+        duree_ms = mesurer_convection(modele_pieces, 50)
+        nb_surfaces = modele_pieces.tables_surfaces()["indices"].size
+        print(f"  {len(modele_pieces.zones_air):3d} zones, {nb_surfaces:6d} surfaces: {duree_ms:7.3f} ms/étape")
+
+    # Allocations temporaires par pas (le moteur "tampons" n'alloue aucun tableau)
+    print(f"Allocations temporaires par pas (grille: {T_ref.nbytes / 1e6:.1f} Mo):")
+    for moteur in ("numpy", "creux", "tampons"):
+        octets = mesurer_allocations(modele, min(nb_pas, 5), moteur=moteur)
+        print(f"  moteur={moteur:9s}: {octets:12d} octets")
+
+    # Moteur parallèle: courbe de mise à l'échelle (résultat identique quel que soit nb_threads)
+    print("Moteur parallèle (tranches en x):")
+    nb_coeurs = os.cpu_count() or 1
+    vitesse_1 = None
+    for nb_threads in sorted({1, 2, 4, 8, 16, 32, nb_coeurs}):
+        if nb_threads > max(2, nb_coeurs):
+            continue
+        vitesse, ecart, _ = mesurer_moteur(modele, nb_pas, reference=T_ref,
+                                           moteur="parallele", nb_threads=nb_threads)
+        vitesse_1 = vitesse_1 or vitesse
+        print(f"  {nb_threads:3d} threads: {vitesse:8.2f} pas/s (x{vitesse / vitesse_1:.2f} / 1 thread), "
+              f"écart max = {ecart:.2e} K")
+
+    # Multi-pas: dt global au-delà de la CFL de la laine de verre (~525 s à ds=0.1)
+    print("Temps simulé par seconde de calcul:")
+    for moteur, dt in (("creux", 500.0), ("multi_pas", 1800.0)):
+        vitesse, _, _ = mesurer_moteur(construire_maison_benchmark(logger, dt=dt), nb_pas, moteur=moteur)
+        print(f"  moteur={moteur:9s} dt={dt:6.0f}s: {vitesse * dt:10.0f} s/s")
+
+    # Régime permanent: le nombre d'itérations du multigrille reste ~constant quand ds diminue
+    print("Régime permanent (maison 4x4x5 m), itérations linéaires / durée:")
+    for ds in (0.1, 0.05):
+        resultats = mesurer_regime_permanent(logger, ds)
+        print(f"  ds={ds:5.3f} m: " + ", ".join(
+            f"{solveur}={iterations} it ({duree:.2f}s)" for solveur, (iterations, duree) in resultats.items()
+        ))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,277 @@
+"""
+Bilan d'énergie de la simulation (validation numérique de la conservation).
+
+Bilan: historique borné (anneau des derniers enregistrements) et
+statistiques en flux (premier point, erreur max et moyenne, recomptages,
+pertes vers les limites fixes): la mémoire ne croît plus avec la durée
+simulée.
+
+ComptableEnergie: énergie stockée E = Σ C_i·T_i (solides) + air + parois
++ colonnes du sol semi-infini,
+tenue à jour pas à pas sans repasser sur toute la grille:
+
+- Conduction FTCS: C_i·ΔT_i = g_i·dt·Σ_voisins (T_j - T_i), g_i = C_i·α_i/ds².
+  Entre deux voxels actifs de même g les termes s'annulent deux à deux:
+  seules restent les faces vers une cellule non mise à jour (limites
+  fixes, air, bords, fantômes du sol et des plans de symétrie) et les
+  faces entre g différents (interfaces de matériaux, couche du milieu
+  d'un plan de symétrie). Somme calculée sur T(t), avant le pas.
+- Surfaces (convection, rayonnement) et voxels couplés aux parois:
+  variation lue sur ces seuls voxels (T après - T avant), dont on retire
+  leur propre part de conduction (déjà comptée par les faces).
+- Air, parois multicouches et colonnes du sol: énergie lue directement
+  (quelques valeurs). Le flux vers les fantômes du sol sort des solides
+  par les faces et entre dans les colonnes: il reste dans le bilan.
+
+Un recomptage complet tous les `cadence` pas mesure la dérive du suivi
+(arrondis, effets non modélisés) et recale l'énergie suivie. Le suivi
+incrémental suppose le stencil FTCS uniforme à pas fixe (moteurs numpy,
+creux, tampons, numba, parallele); sinon (implicite, multi-pas, grille
+non uniforme, pas adaptatif) l'énergie est recomptée à chaque pas sur les
+capacités précalculées.
+"""
+
+from collections import deque
+
+import numpy as np
+
+
+class Bilan:
+    """Classe pour tracker le bilan d'énergie de la simulation."""
+
+    def __init__(self, taille_historique=1000):
+        """
+        Args:
+            taille_historique: Nombre de derniers enregistrements conservés
+        """
+        self.energie_initiale = 0.0
+        self.energies = deque(maxlen=taille_historique)  # Derniers (temps, energie_totale, erreur_prc)
+        self.premier = None  # (temps, energie_totale, erreur_prc) du premier enregistrement
+        self.nb_enregistrements = 0
+        self.erreur_max_prc = 0.0
+        self._somme_erreurs_prc = 0.0
+        self.nb_recomptages = 0
+        self.derive_max_J = 0.0
+        self.pertes_max_W = None
+        self.energie_perdue_J = 0.0  # Σ pertes·dt depuis le premier enregistrement
+
+    def calculer_energie_totale(self, T, RhoCp, zones, volumes=None, parois=None, sol=None):
+        """
+        Calcule l'énergie thermique totale du système:
+        E = sum(ρ·cp·V·T) pour solides + sum(ρ·cp·V·T) pour air
+
+        zones: EtatZones (ModeleMaison.etat_zones)
+        volumes: volumes de contrôle (scalaire ds³ ou grille); None: ρ·cp·T seul
+        parois: EnsembleParois (énergie des parois multicouches ajoutée)
+        sol: SolSemiInfini (énergie des colonnes de sol ajoutée)
+        """
+        # Énergie des solides (J)
+        masque_solide = (RhoCp > 0)
+        if volumes is None:
+            E_solides = np.sum(RhoCp[masque_solide] * T[masque_solide])
+        else:
+            volumes = np.broadcast_to(volumes, RhoCp.shape)
+            E_solides = np.sum(RhoCp[masque_solide] * volumes[masque_solide] * T[masque_solide])
+
+        # Énergie des zones d'air (J)
+        E_air = zones.energie_J()
+
+        E_parois = parois.energie_J() if parois is not None else 0.0
+        E_sol = sol.energie_J() if sol is not None else 0.0
+
+        return E_solides + E_air + E_parois + E_sol
+
+    def ajouter(self, temps_s, E, pertes_W=None):
+        """Enregistre une énergie totale (J) déjà calculée; renvoie l'erreur relative (%).
+
+        pertes_W: puissance perdue vers les limites fixes à cet instant (optionnel)
+        """
+        if self.nb_enregistrements == 0:  # Premier appel
+            self.energie_initiale = E
+        elif pertes_W is not None:
+            self.energie_perdue_J += pertes_W * (temps_s - self.energies[-1][0])
+        if pertes_W is not None:
+            self.pertes_max_W = pertes_W if self.pertes_max_W is None else max(self.pertes_max_W, pertes_W)
+
+        erreur_prc = 100.0 * abs(E - self.energie_initiale) / max(abs(self.energie_initiale), 1.0)
+        point = (temps_s, E, erreur_prc)
+        if self.nb_enregistrements == 0:
+            self.premier = point
+        self.energies.append(point)
+        self.nb_enregistrements += 1
+        self.erreur_max_prc = max(self.erreur_max_prc, erreur_prc)
+        self._somme_erreurs_prc += erreur_prc
+
+        return erreur_prc
+
+    def enregistrer(self, temps_s, T, RhoCp, zones, volumes=None, parois=None, sol=None):
+        """Enregistre l'état d'énergie (recomptage complet)."""
+        return self.ajouter(temps_s, self.calculer_energie_totale(T, RhoCp, zones, volumes, parois, sol))
+
+    def noter_recomptage(self, derive_J):
+        """Écart (J) entre énergie suivie et recomptée lors d'une vérification."""
+        self.nb_recomptages += 1
+        self.derive_max_J = max(self.derive_max_J, abs(derive_J))
+
+    @property
+    def erreur_moyenne_prc(self):
+        return self._somme_erreurs_prc / max(self.nb_enregistrements, 1)
+
+    def rapport_final(self, logger):
+        """Affiche un rapport de conservation d'énergie."""
+        if not self.nb_enregistrements:
+            return
+
+        temps_final, E_final, err_final = self.energies[-1]
+        temps_init, E_init, err_init = self.premier
+
+        err_max = self.erreur_max_prc
+
+        logger.info("=" * 60)
+        logger.info("BILAN D'ÉNERGIE (VALIDATION NUMÉRIQUE)")
+        logger.info("=" * 60)
+        logger.info(f"Énergie initiale: {E_init:.2e} J")
+        logger.info(f"Énergie finale:   {E_final:.2e} J")
+        logger.info(f"Erreur absolue: {E_final - E_init:.2e} J")
+        logger.info(f"Erreur relative finale: {err_final:.4f}%")
+        logger.info(f"Erreur relative max: {err_max:.4f}% (moyenne {self.erreur_moyenne_prc:.4f}%, "
+                    f"{self.nb_enregistrements} pas)")
+        if self.pertes_max_W is not None and temps_final > temps_init:
+            logger.info(f"Pertes vers les limites fixes: {self.energie_perdue_J / (temps_final - temps_init):.2f} W "
+                        f"en moyenne, {self.pertes_max_W:.2f} W max ({self.energie_perdue_J:.2e} J)")
+        if self.nb_recomptages:
+            logger.info(f"Suivi incrémental: {self.nb_recomptages} recomptages, "
+                        f"dérive max {self.derive_max_J:.2e} J")
+        if err_max < 0.1:
+            logger.info("✓ EXCELLENT: Conservation d'énergie < 0.1%")
+        elif err_max < 1.0:
+            logger.info("✓ BON: Conservation d'énergie < 1%")
+        else:
+            logger.warn(f"⚠ ALERTE: Erreur > 1%, vérifier stabilité numérique")
+        logger.info("=" * 60)
+
+
+class ComptableEnergie:
+    """Énergie stockée (J) tenue à jour par les flux du pas, recomptée à cadence fixe."""
+
+    def __init__(self, modele, volumes, ds, bilan, logger, incremental=True, cadence=100,
+                 indices_surfaces=None):
+        """
+        Args:
+            modele: ModeleMaison préparé (Alpha, RhoCp)
+            volumes: Volume de chaque voxel (scalaire ou grille, pondérations de symétrie comprises)
+            ds: Discrétisation spatiale (m)
+            bilan: Bilan (dérive notée à chaque recomptage)
+            logger: Logger instance
+            incremental: Suivi par les flux (stencil FTCS uniforme, pas fixe); sinon recomptage à chaque pas
+            cadence: Recomptage complet tous les `cadence` pas (suivi incrémental)
+            indices_surfaces: Indices plats des voxels modifiés hors conduction
+                              (surfaces, voxels couplés aux parois)
+        """
+        if int(cadence) < 1:
+            logger.error(f"Cadence de recomptage du bilan invalide ({cadence}).")
+            raise ValueError("Cadence de recomptage du bilan: entier >= 1.")
+        self.logger = logger
+        self.bilan = bilan
+        self.cadence = int(cadence)
+        forme = modele.Materiau.shape
+        RhoCp = modele.RhoCp.reshape(-1)
+        V = np.ascontiguousarray(np.broadcast_to(volumes, forme), dtype=np.float64).reshape(-1)
+
+        # Capacités (J/K) des solides: l'air des voxels est porté par les zones
+        self.indices = np.flatnonzero(modele.Alpha > 0).astype(np.intp)
+        self.capacites = RhoCp[self.indices] * V[self.indices]
+
+        self.incremental = bool(incremental)
+        self.E_solides = 0.0
+        self.nb_pas = 0
+        self._variation = 0.0
+        if not self.incremental:
+            return
+
+        # Voxels actifs (conduction) et leur coefficient g = C·α/ds²
+        N_x, N_y, N_z = forme
+        interieur = np.zeros(forme, dtype=bool)
+        interieur[1:-1, 1:-1, 1:-1] = (modele.Alpha > 0)[1:-1, 1:-1, 1:-1]
+        actifs = np.flatnonzero(interieur).astype(np.intp)
+        g = np.zeros(interieur.size)
+        g[actifs] = RhoCp[actifs] * V[actifs] * modele.Alpha.reshape(-1)[actifs].astype(np.float64) / ds ** 2
+        est_actif = interieur.reshape(-1)
+
+        if indices_surfaces is None:
+            indices_surfaces = np.empty(0, dtype=np.intp)
+        self.surfaces = np.unique(np.asarray(indices_surfaces, dtype=np.intp))
+        self.capacites_surfaces = RhoCp[self.surfaces] * V[self.surfaces]
+        surfaces_actives = self.surfaces[est_actif[self.surfaces]]
+
+        faces_i, faces_j, coeffs = [], [], []
+        for pas in (N_y * N_z, N_z, 1):
+            for signe in (1, -1):
+                voisins = actifs + signe * pas
+                gardees = ~est_actif[voisins] | (g[voisins] != g[actifs])
+                faces_i.append(actifs[gardees])
+                faces_j.append(voisins[gardees])
+                coeffs.append(g[actifs[gardees]])
+                # Part de conduction des surfaces actives, déjà comptée par les faces
+                faces_i.append(surfaces_actives)
+                faces_j.append(surfaces_actives + signe * pas)
+                coeffs.append(-g[surfaces_actives])
+        self.faces_i = np.concatenate(faces_i)
+        self.faces_j = np.concatenate(faces_j)
+        self.coeffs_faces = np.concatenate(coeffs)
+
+        # Tampons de lecture préalloués (float64; copie de passage si la grille est en float32)
+        self._tampons = [np.empty(self.faces_i.size), np.empty(self.faces_j.size), np.empty(self.surfaces.size)]
+        self._tampons_grille = {}
+
+        self.logger.info(f"Bilan d'énergie incrémental: {self.faces_i.size} faces, "
+                         f"{self.surfaces.size} surfaces (recomptage tous les {self.cadence} pas)")
+
+    def recompter(self, T, zones, parois=None, sol=None):
+        """Recompte l'énergie totale (J) et recale le suivi sur cette valeur."""
+        self.E_solides = float(self.capacites @ T.reshape(-1)[self.indices])
+        return self._total(zones, parois, sol)
+
+    def avant_pas(self, T, dt):
+        """À appeler sur T(t), avant le pas: flux de conduction et températures de surface."""
+        if not self.incremental:
+            return
+        T_plat = T.reshape(-1)
+        T_i = self._lire(T_plat, self.faces_i, 0)
+        T_j = self._lire(T_plat, self.faces_j, 1)
+        flux = np.dot(self.coeffs_faces, np.subtract(T_j, T_i, out=T_j))
+        self._variation = dt * float(flux) - float(np.dot(self.capacites_surfaces,
+                                                          self._lire(T_plat, self.surfaces, 2)))
+
+    def apres_pas(self, T, zones, parois=None, sol=None):
+        """À appeler sur T(t+dt): énergie totale (J), recomptée à la cadence (ou à chaque pas)."""
+        self.nb_pas += 1
+        if not self.incremental:
+            return self.recompter(T, zones, parois, sol)
+
+        T_surfaces = self._lire(T.reshape(-1), self.surfaces, 2)
+        self.E_solides += self._variation + float(np.dot(self.capacites_surfaces, T_surfaces))
+        if self.nb_pas % self.cadence:
+            return self._total(zones, parois, sol)
+
+        E_suivie = self.E_solides
+        E = self.recompter(T, zones, parois, sol)
+        self.bilan.noter_recomptage(self.E_solides - E_suivie)
+        return E
+
+    def _lire(self, T_plat, indices, rang):
+        """T_plat[indices] dans le tampon float64 `rang`, sans allocation."""
+        tampon = self._tampons[rang]
+        if T_plat.dtype == tampon.dtype:
+            return np.take(T_plat, indices, out=tampon, mode="clip")
+        brut = self._tampons_grille.get((rang, T_plat.dtype))
+        if brut is None:
+            brut = self._tampons_grille[(rang, T_plat.dtype)] = np.empty(indices.size, dtype=T_plat.dtype)
+        np.take(T_plat, indices, out=brut, mode="clip")
+        np.copyto(tampon, brut)
+        return tampon
+
+    def _total(self, zones, parois, sol):
+        E_parois = parois.energie_J() if parois is not None else 0.0
+        E_sol = sol.energie_J() if sol is not None else 0.0
+        return self.E_solides + zones.energie_J() + E_parois + E_sol
@@ -0,0 +1,17 @@
+"""
+Fixtures communes aux tests.
+"""
+
+import itertools
+import pytest
+
+
+@pytest.fixture
+def sortie(tmp_path):
+    """Fabrique de dossiers de résultats distincts sous tmp_path.
+
+    StockageResultats vide le dossier qu'on lui donne: chaque simulation
+    d'un même test reçoit donc le sien (resultats_0, resultats_1, ...).
+    """
+    compteur = itertools.count()
+    return lambda: str(tmp_path / f"resultats_{next(compteur)}")
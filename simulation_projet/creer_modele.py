@@ -1,5 +1,7 @@
 # Fichier généré automatiquement par dispatcher_le_projet.py
-# Contient l'éditeur TUI pour 'modele.pkl'
+# Contient l'éditeur TUI pour 'modele.hsm'
+
+import os
 
 from logger import LoggerSimulation
 from model_data import MATERIAUX
@@ -22,9 +24,10 @@ class PlanWidget(Static):
         if not isinstance(app, ModelEditorTUI):
             return "Erreur: app invalide"
 
-        # Récupérer les données du modèle
-        plan_2d = app.modele.Alpha[:, :, app.current_z]
+        # Récupérer les données du modèle (indices de matériau)
+        plan_2d = app.modele.Materiau[:, :, app.current_z]
         plan_2d_T = plan_2d.T
+        noms = [entree["nom"] for entree in app.modele.table_materiaux]
 
         H, W = plan_2d_T.shape
         cursor_x = app.cursor_x
@@ -35,22 +38,7 @@ class PlanWidget(Static):
         for y in range(H):
             ligne = ""
             for x in range(W):
-                val = plan_2d_T[y, x]
-                # Chercher la clé dans la palette avec tolerance pour les floats
-                char = None
-                if val in palette_map:
-                    char = palette_map[val]
-                else:
-                    # Chercher une clé similaire (pour les erreurs de précision float)
-                    for key in palette_map.keys():
-                        if isinstance(key, (int, float)) and isinstance(val, (int, float)):
-                            if abs(key - val) < 1e-10:
-                                char = palette_map[key]
-                                break
-
-                if char is None:
-                    char = '?'
-                    plan_2d_T[y, x] = ''
+                char = palette_map.get(noms[plan_2d_T[y, x]], '?')
 
                 if x == cursor_x and y == cursor_y:
                     # Appliquer un style inversé pour le curseur
@@ -121,21 +109,9 @@ class ModelEditorTUI(App):
             'AIR': ' '
         }
 
-        for nom, char in base_palette.items():
-            if nom in MATERIAUX:
-                alpha = MATERIAUX[nom]["alpha"]
-                self.palette_map[alpha] = char
-
-        # Gérer les autres matériaux
-        for nom, props in MATERIAUX.items():
-            if nom not in base_palette:
-                alpha = props["alpha"]
-                if alpha not in self.palette_map:
-                    self.palette_map[alpha] = '?'
-
-        # Gérer les IDs d'air multiples
-        for i in range(-1, -10, -1):
-            self.palette_map[i] = ' '
+        # Clé = nom du matériau (toutes les zones d'air partagent le nom AIR)
+        for nom in MATERIAUX:
+            self.palette_map[nom] = base_palette.get(nom, '?')
 
     def compose(self) -> ComposeResult:
         """Crée l'interface utilisateur TUI."""
@@ -186,7 +162,7 @@ class ModelEditorTUI(App):
             try:
                 label = self.query_one(f"#mat-{mat_name}", Label)
                 if mat_name == self.selected_material:
-                    label.update(f"[reverse]{self.palette_map.get(MATERIAUX[mat_name]['alpha'], '?')} {mat_name}[/reverse]")
+                    label.update(f"[reverse]{self.palette_map.get(mat_name, '?')} {mat_name}[/reverse]")
                 else:
                     label.update(f"[ ] {mat_name}")
             except Exception as e:
@@ -251,9 +227,9 @@ class ModelEditorTUI(App):
 def creer_modele_initial(logger, params):
     '''
     Crée un modèle de maison "vide" (rempli de LIMITE_FIXE)
-    si aucun fichier modele.pkl n'est trouvé.
+    si aucun fichier modele.hsm n'est trouvé.
     '''
-    logger.info("Aucun 'modele.pkl' trouvé. Création d'un modèle vide...")
+    logger.info("Aucun 'modele.hsm' trouvé. Création d'un modèle vide...")
     modele = ModeleMaison(params)
 
     # Remplir le volume avec l'extérieur (0°C)
@@ -279,7 +255,8 @@ def main_editeur():
     logger = LoggerSimulation(niveau="DEBUG")
     logger.info("--- Démarrage de l'Éditeur de Modèle TUI ---")
 
-    chemin_sauvegarde = "modele.pkl"
+    chemin_sauvegarde = "modele.hsm"
+    chemin_ancien = "modele.pkl"  # Ancien format (pickle), converti à la sauvegarde
 
     # 1. Définir les paramètres (doivent être fixes)
     params = ParametresSimulation(
@@ -294,6 +271,8 @@ def main_editeur():
 
     # 2. Charger le modèle s'il existe, sinon en créer un vide
     modele = ModeleMaison.charger(chemin_sauvegarde, logger)
+    if modele is None and os.path.exists(chemin_ancien):
+        modele = ModeleMaison.charger(chemin_ancien, logger, autoriser_pickle=True)
     if modele is None:
         modele = creer_modele_initial(logger, params)
 
@@ -0,0 +1,136 @@
+"""
+Format de fichier BINAIRE des modèles (.hsm), projetable en mémoire.
+
+Structure (petit-boutiste):
+  - 8 octets : signature b"HSMODELE"
+  - uint32   : version du format
+  - uint32   : taille de l'en-tête JSON (octets)
+  - en-tête JSON UTF-8 (paramètres, zones, table des matériaux et
+    description des tableaux: dtype, forme, décalage)
+  - tableaux bruts, chacun aligné sur ALIGNEMENT octets
+
+Lecture: l'en-tête est décodé en JSON (jamais de pickle: un fichier non
+fiable ne peut pas exécuter de code), puis chaque tableau est ouvert avec
+np.memmap (aucune copie, pages lues à la demande). Les dtypes, formes et
+décalages sont vérifiés contre la taille du fichier avant projection.
+"""
+
+import json
+import os
+import struct
+
+import numpy as np
+
+SIGNATURE = b"HSMODELE"
+VERSION = 1
+ALIGNEMENT = 64
+TAILLE_ENTETE_MAX = 64 * 1024 * 1024
+
+# Seuls ces types peuvent être lus (pas de dtype objet)
+DTYPES_AUTORISES = ("<f8", "<f4", "|u1", "<u2", "<i8")
+
+
+class ErreurFormatModele(ValueError):
+    """Fichier modèle invalide ou corrompu."""
+
+
+def _aligner(position):
+    return (position + ALIGNEMENT - 1) // ALIGNEMENT * ALIGNEMENT
+
+
+def ecrire(chemin, entete, tableaux):
+    """
+    Écrit un en-tête (dict JSON-sérialisable) et des tableaux nommés.
+
+    Le fichier est écrit à côté puis renommé (os.replace): un modèle
+    encore projeté en mémoire depuis l'ancien fichier reste valide.
+    """
+    description = {}
+    tableaux_le = {}
+    for nom, tableau in tableaux.items():
+        tableau = np.ascontiguousarray(tableau)
+        dtype = tableau.dtype.newbyteorder("<") if tableau.dtype.byteorder == ">" else tableau.dtype
+        tableau = tableau.astype(dtype, copy=False)
+        if dtype.str not in DTYPES_AUTORISES:
+            raise ErreurFormatModele(f"Type {dtype.str} non supporté pour '{nom}'.")
+        tableaux_le[nom] = tableau
+        description[nom] = {"dtype": dtype.str, "forme": list(tableau.shape), "decalage": 0}
+
+    # Deux passes: les décalages dépendent de la taille de l'en-tête
+    debut_donnees = 0
+    for _ in range(2):
+        position = debut_donnees
+        for nom, tableau in tableaux_le.items():
+            position = _aligner(position)
+            description[nom]["decalage"] = position
+            position += tableau.nbytes
+        octets_entete = json.dumps(dict(entete, tableaux=description)).encode("utf-8")
+        debut_donnees = _aligner(len(SIGNATURE) + 8 + len(octets_entete))
+
+    chemin_tmp = f"{chemin}.tmp"
+    with open(chemin_tmp, "wb") as f:
+        f.write(SIGNATURE)
+        f.write(struct.pack("<II", VERSION, len(octets_entete)))
+        f.write(octets_entete)
+        for nom, tableau in tableaux_le.items():
+            f.write(b"\0" * (description[nom]["decalage"] - f.tell()))
+            f.write(tableau.tobytes(order="C"))
+    os.replace(chemin_tmp, chemin)
+
+
+def est_fichier_modele(chemin):
+    """True si le fichier commence par la signature du format binaire."""
+    try:
+        with open(chemin, "rb") as f:
+            return f.read(len(SIGNATURE)) == SIGNATURE
+    except OSError:
+        return False
+
+
+def lire(chemin, mode="c"):
+    """
+    Lit l'en-tête et projette les tableaux en mémoire.
+
+    Args:
+        chemin: Fichier .hsm
+        mode: Mode np.memmap: "c" (copie sur écriture, défaut: le fichier
+              n'est jamais modifié), "r" (lecture seule) ou "r+"
+
+    Returns:
+        (entete, tableaux): dict JSON et {nom: np.memmap}
+    """
+    taille_fichier = os.path.getsize(chemin)
+    with open(chemin, "rb") as f:
+        if f.read(len(SIGNATURE)) != SIGNATURE:
+            raise ErreurFormatModele("Signature absente: ce n'est pas un fichier modèle.")
+        version, taille_entete = struct.unpack("<II", f.read(8))
+        if version > VERSION:
+            raise ErreurFormatModele(f"Version {version} non supportée (max {VERSION}).")
+        if taille_entete > min(TAILLE_ENTETE_MAX, taille_fichier):
+            raise ErreurFormatModele("Taille d'en-tête invalide.")
+        try:
+            entete = json.loads(f.read(taille_entete).decode("utf-8"))
+        except (UnicodeDecodeError, json.JSONDecodeError) as e:
+            raise ErreurFormatModele(f"En-tête illisible: {e}")
+
+    if not isinstance(entete, dict) or not isinstance(entete.get("tableaux"), dict):
+        raise ErreurFormatModele("En-tête incomplet.")
+
+    tableaux = {}
+    for nom, desc in entete["tableaux"].items():
+        try:
+            dtype = np.dtype(str(desc["dtype"]))
+            forme = tuple(int(n) for n in desc["forme"])
+            decalage = int(desc["decalage"])
+        except (KeyError, TypeError, ValueError) as e:
+            raise ErreurFormatModele(f"Description du tableau '{nom}' invalide: {e}")
+        if dtype.str not in DTYPES_AUTORISES or any(n < 0 for n in forme):
+            raise ErreurFormatModele(f"Tableau '{nom}': type ou forme invalide.")
+        taille = dtype.itemsize * int(np.prod(forme, dtype=np.int64))
+        if decalage < 0 or decalage % ALIGNEMENT or decalage + taille > taille_fichier:
+            raise ErreurFormatModele(f"Tableau '{nom}' hors du fichier.")
+        if taille == 0:
+            tableaux[nom] = np.zeros(forme, dtype=dtype)
+        else:
+            tableaux[nom] = np.memmap(chemin, dtype=dtype, mode=mode, offset=decalage, shape=forme)
+    return entete, tableaux
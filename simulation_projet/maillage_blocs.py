@@ -0,0 +1,607 @@
+"""
+Module MAILLAGE PAR BLOCS (raffinement adaptatif, octree à blocs cubiques).
+
+Les grandes régions homogènes (terre, béton épais, extérieur, air) n'ont
+pas besoin de la résolution des interfaces:
+- le domaine est découpé en blocs de 2^niveaux_max voxels de côté;
+- un bloc est gardé entier (une seule cellule) s'il ne contient aucun
+  voxel "frontière" (voisin d'un autre matériau ou d'une autre
+  température initiale, bord du domaine, à `marge` voxels près), sinon
+  il est coupé en 8, et ainsi de suite jusqu'au voxel (niveau 0).
+Les interfaces entre matériaux et les surfaces de convection restent donc
+au niveau 0, comme dans la grille d'origine.
+
+Le maillage ne matérialise jamais la grille fine complète. La source est
+lue par régions (GeometrieBoites: description par boîtes, sans grille
+fine; ou un ModeleMaison déjà construit): une région homogène marge
+comprise donne directement ses blocs entiers, les autres sont coupées en
+8 jusqu'à quelques blocs, rasterisées localement (avec un halo de
+marge + 1 voxels) et découpées comme ci-dessus. Voisinages, surfaces de
+convection et zones d'air (une par volume d'air connexe) sont ensuite
+obtenus sur les cellules.
+
+Conduction en volumes finis sur le graphe des cellules (même convention
+que le moteur multi_pas): chaque face voxel entre deux cellules apporte
+une conductance ds² / (h_a/2λ_a + h_b/2λ_b) (h: côté de la cellule), les
+faces d'un même couple de cellules sont regroupées. Le flux G·ΔT est
+ajouté à une cellule et retiré de l'autre: l'énergie est conservée entre
+niveaux. Les cellules non actives (limites fixes, air, solides du bord)
+gardent leur température, comme dans Simulation.
+
+Convection (semi-implicite, Simulation.convection_semi_implicite) et
+rayonnement: sur les cellules de surface (niveau 0), comme Simulation. Le
+pas reste limité par les cellules fines (pas_stable_max); le gain est en
+mémoire et en calcul par pas, d'autant plus grand que ds est fin (les
+interfaces sont des surfaces). Le stockage et la visualisation
+rééchantillonnent à la demande sur une grille uniforme (vers_grille).
+"""
+
+import time
+
+import numpy as np
+from scipy.sparse import coo_matrix
+from scipy.sparse.csgraph import connected_components
+
+from bilan_energie import Bilan
+from model_data import MATERIAUX, ZoneAir
+from modele import ModeleMaison
+from rayonnement import ModeleRayonnement
+from simulation import Simulation
+from stockage import StockageResultats
+
+
+class GeometrieBoites:
+    """
+    Bâtiment décrit par des boîtes de matériaux (la dernière construite
+    l'emporte), sans grille fine: source de MaillageBlocs pour les grilles
+    trop fines pour tenir en mémoire. Même construction que ModeleMaison
+    (construire_volume_metres, bornes arrondies au voxel, mêmes
+    températures initiales), grille uniforme. Les zones d'air sont créées
+    par MaillageBlocs, une par volume d'air connexe.
+    """
+
+    def __init__(self, params):
+        self.params = params
+        self.logger = params.logger
+        if not params.uniforme:
+            self.logger.error("GeometrieBoites: grille uniforme uniquement.")
+            raise ValueError("Géométrie par boîtes non disponible sur grille non uniforme.")
+        self.forme = (params.N_x, params.N_y, params.N_z)
+
+        # Table des matériaux (format ModeleMaison), entrée 0: fond LIMITE_FIXE à T_interieur_init
+        self.table_materiaux = [ModeleMaison.entree_materiau("LIMITE_FIXE")]
+        self._index_table = {"LIMITE_FIXE": 0}
+        self.T_fond = params.T_interieur_init
+
+        # Boîtes dans l'ordre de construction: bornes (x1, y1, z1, x2, y2, z2), x2 exclu
+        self._bornes = np.empty((0, 6), dtype=np.int64)
+        self._indices = np.empty(0, dtype=np.intp)
+        self._T = np.empty(0)
+
+        self.zones_air = {}
+        self.parois = []
+
+    etat_zones = ModeleMaison.etat_zones
+
+    def construire_volume_metres(self, p1_m, p2_m, nom_materiau, T_override_K=None):
+        """Ajoute une boîte définie en mètres (voir ModeleMaison.construire_volume_metres)."""
+        if nom_materiau not in MATERIAUX:
+            self.logger.error(f"Matériau '{nom_materiau}' inconnu. Ignoré.")
+            return
+        p = self.params
+        bornes = [max(0, p.indice(axe, min(p1_m[axe], p2_m[axe]))) for axe in range(3)] + \
+                 [min(n, p.indice(axe, max(p1_m[axe], p2_m[axe])) + 1) for axe, n in enumerate(self.forme)]
+
+        props = MATERIAUX[nom_materiau]
+        if props["type"] == "AIR":
+            T = p.T_interieur_init
+        elif T_override_K is not None:
+            T = T_override_K
+        else:
+            T = p.T_exterieur_init if props["type"] == "LIMITE_FIXE" else p.T_interieur_init
+        if nom_materiau not in self._index_table:
+            self._index_table[nom_materiau] = len(self.table_materiaux)
+            self.table_materiaux.append(ModeleMaison.entree_materiau(nom_materiau))
+
+        self._bornes = np.vstack([self._bornes, bornes])
+        self._indices = np.append(self._indices, self._index_table[nom_materiau])
+        self._T = np.append(self._T, T)
+        self.logger.info(f"Boîte {bornes} remplie avec '{nom_materiau}'.")
+
+    def _boites_dans(self, debut, fin):
+        """Rangs des boîtes qui coupent la boîte de voxels [debut, fin)."""
+        return np.flatnonzero(np.all(self._bornes[:, :3] < fin, axis=1) & np.all(self._bornes[:, 3:] > debut, axis=1))
+
+    def homogene(self, debut, fin):
+        """(indice, T) si la boîte de voxels [debut, fin) est uniforme de façon évidente, sinon None."""
+        rangs = self._boites_dans(debut, fin)
+        if rangs.size == 0:
+            return 0, self.T_fond
+        derniere = rangs[-1]
+        if np.all(self._bornes[derniere, :3] <= debut) and np.all(self._bornes[derniere, 3:] >= fin):
+            return int(self._indices[derniere]), float(self._T[derniere])
+        return None
+
+    def rasteriser(self, debut, fin):
+        """Grilles (indices de matériau, T) de la boîte de voxels [debut, fin)."""
+        forme = tuple(int(n) for n in np.asarray(fin) - debut)
+        materiau = np.zeros(forme, dtype=np.intp)
+        T = np.full(forme, self.T_fond)
+        for rang in self._boites_dans(debut, fin):
+            s = tuple(slice(max(lo - d, 0), min(hi, f) - d)
+                      for lo, hi, d, f in zip(self._bornes[rang, :3], self._bornes[rang, 3:], debut, fin))
+            materiau[s] = self._indices[rang]
+            T[s] = self._T[rang]
+        return materiau, T
+
+
+class _GrilleModele:
+    """Lecture par régions d'un ModeleMaison (même interface que GeometrieBoites)."""
+
+    def __init__(self, modele):
+        self.modele = modele
+        self.forme = modele.Materiau.shape
+        self.table_materiaux = modele.table_materiaux
+
+    def rasteriser(self, debut, fin):
+        s = tuple(slice(int(a), int(b)) for a, b in zip(debut, fin))
+        return self.modele.Materiau[s], self.modele.T[s]
+
+    def homogene(self, debut, fin):
+        materiau, T = self.rasteriser(debut, fin)
+        if np.all(materiau == materiau.flat[0]) and np.all(T == T.flat[0]):
+            return int(materiau.flat[0]), float(T.flat[0])
+        return None
+
+
+class MaillageBlocs:
+    """Cellules cubiques de côté ds·2^niveau et conductances entre cellules voisines."""
+
+    TAILLE_REGION = 4  # Blocs par axe en deçà desquels une région est rasterisée
+    TRANCHE = 1 << 18  # Cellules traitées ensemble pour la recherche des voisins
+
+    def __init__(self, source, logger, niveaux_max=3, marge=2):
+        """
+        Args:
+            source: GeometrieBoites, ou ModeleMaison préparé (preparer_simulation), grille uniforme
+            logger: Logger instance
+            niveaux_max: Niveau de la plus grosse cellule (côté ds·2^niveaux_max)
+            marge: Épaisseur (voxels) gardée au niveau 0 de part et d'autre des frontières
+        """
+        self.logger = logger
+        params = source.params
+        if not params.uniforme:
+            self.logger.error("Maillage par blocs: grille uniforme uniquement.")
+            raise ValueError("Maillage par blocs non disponible sur grille non uniforme.")
+        if niveaux_max < 0:
+            raise ValueError("niveaux_max doit être >= 0.")
+        grille = source if isinstance(source, GeometrieBoites) else _GrilleModele(source)
+        self.ds = ds = params.ds
+        self.forme = forme = tuple(int(n) for n in grille.forme)
+        self.niveaux_max = niveaux_max
+        self.marge = marge
+        cote_max = 2 ** niveaux_max
+        nb_blocs = tuple(-(-n // cote_max) for n in forme)
+        forme_pad = np.array(nb_blocs) * cote_max
+
+        # --- Feuilles, région par région (jamais la grille fine complète) ---
+        morceaux = []
+        self._decouper(grille, np.zeros(3, dtype=np.int64), np.array(nb_blocs, dtype=np.int64), morceaux)
+        origines, niveaux, indices, T_initial = (np.concatenate(m) for m in zip(*morceaux))
+        del morceaux
+
+        # Ordre des cellules: niveau décroissant, puis ordre de la grille du niveau
+        cles = np.empty(origines.shape[0], dtype=np.int64)
+        for niveau in range(niveaux_max + 1):
+            choix = niveaux == niveau
+            cles[choix] = np.ravel_multi_index(tuple((origines[choix] >> niveau).T), tuple(forme_pad >> niveau))
+        ordre = np.lexsort((cles, -niveaux))
+        self.nb_cellules = nb_cellules = ordre.size
+        self.origines = origines[ordre]
+        self.niveaux = niveaux[ordre].astype(np.int8)
+        self.cotes_m = ds * 2.0 ** self.niveaux
+        cles, indices = cles[ordre], indices[ordre]
+
+        # --- Propriétés des cellules (uniformes dans une cellule) ---
+        table = grille.table_materiaux
+        self.Alpha = np.array([entree["alpha"] for entree in table], dtype=np.float64)[indices]
+        # λ par axe (x, y, z): un voxel partiellement couvert conduit différemment selon la direction
+        self.Lambda = np.array([entree.get("lambda_axes", (entree["lambda"],) * 3) for entree in table],
+                               dtype=np.float64).T[:, indices]
+        self.RhoCp = np.array([entree["rho_cp"] for entree in table], dtype=np.float64)[indices]
+        self.T_initial = T_initial[ordre].astype(np.float64)
+        del origines, niveaux, T_initial, ordre
+        self.capacites = self.RhoCp * self.cotes_m ** 3  # J/K
+        interieur = np.all((self.origines > 0) & (self.origines < np.array(forme) - 1), axis=1)
+        self.actif = (self.Alpha > 0) & interieur
+
+        # --- Faces entre cellules voisines (a, b, nombre de faces voxel), b du côté + de a ---
+        bornes_niveaux = np.searchsorted(-self.niveaux, np.arange(-niveaux_max, 1), side="left").tolist() + \
+            [nb_cellules]
+        recherche = [(niveau, tuple(forme_pad >> niveau), cles[bornes_niveaux[r]:bornes_niveaux[r + 1]],
+                      bornes_niveaux[r]) for r, niveau in enumerate(range(niveaux_max, -1, -1))]
+        faces_a, faces_b, nombres, axes = self._faces(recherche)
+        del recherche, cles
+
+        # --- Conduction: au moins un côté actif; un couple de cellules n'a qu'une face (regroupée) ---
+        garde = self.actif[faces_a] | self.actif[faces_b]
+        a, b, axes = faces_a[garde], faces_b[garde], axes[garde]
+        # Vers une cellule imposée: conductivité du côté actif (comme multi_pas: λ·ds au niveau 0)
+        lam_a = np.where(self.actif[a], self.Lambda[axes, a], self.Lambda[axes, b])
+        lam_b = np.where(self.actif[b], self.Lambda[axes, b], self.Lambda[axes, a])
+        conductances = nombres[garde] * ds ** 2 / (0.5 * self.cotes_m[a] / lam_a + 0.5 * self.cotes_m[b] / lam_b)
+        del lam_a, lam_b, garde, axes
+        ordre = np.argsort(np.minimum(a, b) * nb_cellules + np.maximum(a, b))
+        self.G = conductances[ordre]
+        self.faces_a, self.faces_b = np.minimum(a, b)[ordre], np.maximum(a, b)[ordre]
+        del a, b, conductances, ordre
+        sortante = ~self.actif[self.faces_b]
+        self.faces_limites = np.flatnonzero(self.actif[self.faces_a] != self.actif[self.faces_b])
+        self._signe_limites = np.where(sortante[self.faces_limites], 1.0, -1.0)
+
+        # --- Zones d'air et surfaces de convection (niveau 0: une cellule par voxel) ---
+        zones_air = self._zones_air(source, table, indices, faces_a, faces_b)
+        self._surfaces_convection(zones_air, faces_a, faces_b)
+
+        self.logger.info(f"Maillage par blocs: {nb_cellules} cellules pour {int(np.prod(forme))} voxels "
+                         f"(/{np.prod(forme) / nb_cellules:.1f}), niveaux "
+                         f"{dict(zip(*np.unique(self.niveaux, return_counts=True)))}, {self.G.size} faces")
+
+    def _decouper(self, grille, bloc_debut, bloc_fin, morceaux):
+        """Feuilles des blocs [bloc_debut, bloc_fin) (unités de 2^niveaux_max voxels), ajoutées à morceaux."""
+        cote_max = 2 ** self.niveaux_max
+        halo = self.marge + 1
+        debut, fin = bloc_debut * cote_max - halo, bloc_fin * cote_max + halo
+        if np.all(debut >= 0) and np.all(fin <= self.forme):
+            uniforme = grille.homogene(debut, fin)
+            if uniforme is not None:
+                # Aucune frontière à moins de marge voxels: blocs entiers, sans lecture voxel par voxel
+                blocs = np.indices(tuple(bloc_fin - bloc_debut)).reshape(3, -1).T + bloc_debut
+                n = blocs.shape[0]
+                morceaux.append((blocs * cote_max, np.full(n, self.niveaux_max, dtype=np.int64),
+                                 np.full(n, uniforme[0], dtype=np.intp), np.full(n, uniforme[1])))
+                return
+        taille = bloc_fin - bloc_debut
+        if np.all(taille <= self.TAILLE_REGION):
+            morceaux.append(self._feuilles_region(grille, bloc_debut, bloc_fin))
+            return
+        # Coupe en 8 (en 2 selon chaque axe de plus d'un bloc)
+        milieux = bloc_debut + taille // 2
+        coupes = [((bloc_debut[axe], milieux[axe]), (milieux[axe], bloc_fin[axe])) if taille[axe] > 1
+                  else ((bloc_debut[axe], bloc_fin[axe]),) for axe in range(3)]
+        for cx in coupes[0]:
+            for cy in coupes[1]:
+                for cz in coupes[2]:
+                    self._decouper(grille, np.array([cx[0], cy[0], cz[0]]), np.array([cx[1], cy[1], cz[1]]),
+                                   morceaux)
+
+    def _feuilles_region(self, grille, bloc_debut, bloc_fin):
+        """Découpage exact d'une région rasterisée: voxels frontière, puis blocs du plus gros au voxel."""
+        niveaux_max, marge = self.niveaux_max, self.marge
+        cote_max = 2 ** niveaux_max
+        forme = np.array(self.forme)
+        v_debut, v_fin = bloc_debut * cote_max, bloc_fin * cote_max
+        r_debut = np.maximum(v_debut - (marge + 1), 0)
+        r_fin = np.minimum(v_fin + (marge + 1), forme)
+        materiau, T = grille.rasteriser(r_debut, r_fin)
+
+        # --- Voxels frontière: voisin de matériau ou de température initiale différents, bord du domaine ---
+        frontiere = np.zeros(materiau.shape, dtype=bool)
+        for axe in range(3):
+            avant = [slice(None)] * 3
+            apres = [slice(None)] * 3
+            avant[axe], apres[axe] = slice(None, -1), slice(1, None)
+            avant, apres = tuple(avant), tuple(apres)
+            different = (materiau[avant] != materiau[apres]) | (T[avant] != T[apres])
+            frontiere[avant] |= different
+            frontiere[apres] |= different
+            bord = [slice(None)] * 3
+            for extremite, au_bord in ((0, r_debut[axe] == 0), (-1, r_fin[axe] == forme[axe])):
+                if au_bord:
+                    bord[axe] = extremite
+                    frontiere[tuple(bord)] = True
+        for _ in range(marge):
+            dilatee = frontiere.copy()
+            for axe in range(3):
+                dilatee[(slice(None),) * axe + (slice(1, None),)] |= frontiere[(slice(None),) * axe + (slice(None, -1),)]
+                dilatee[(slice(None),) * axe + (slice(None, -1),)] |= frontiere[(slice(None),) * axe + (slice(1, None),)]
+            frontiere = dilatee
+
+        # Région [v_debut, v_fin), voxels hors domaine comptés comme frontière
+        taille = v_fin - v_debut
+        dedans = np.minimum(v_fin, forme) - v_debut
+        decalage = v_debut - r_debut
+        frontiere_region = np.ones(tuple(taille), dtype=bool)
+        frontiere_region[:dedans[0], :dedans[1], :dedans[2]] = frontiere[
+            decalage[0]:decalage[0] + dedans[0], decalage[1]:decalage[1] + dedans[1],
+            decalage[2]:decalage[2] + dedans[2]]
+
+        # --- Feuilles: blocs sans frontière, du plus gros au voxel ---
+        origines, niveaux = [], []
+        libre_parent = None
+        for niveau in range(niveaux_max, -1, -1):
+            cote = 2 ** niveau
+            nb = tuple(taille // cote)
+            if niveau == 0:
+                libre = np.zeros(nb, dtype=bool)
+                libre[:dedans[0], :dedans[1], :dedans[2]] = True
+            else:
+                libre = ~frontiere_region.reshape(nb[0], cote, nb[1], cote, nb[2], cote).any(axis=(1, 3, 5))
+            feuille = libre
+            if libre_parent is not None:
+                parent = libre_parent.repeat(2, 0).repeat(2, 1).repeat(2, 2)
+                feuille = libre & ~parent
+                libre = libre | parent
+            origines.append(np.argwhere(feuille) * cote)
+            niveaux.append(np.full(origines[-1].shape[0], niveau, dtype=np.int64))
+            libre_parent = libre
+        origines = np.concatenate(origines)
+        o = tuple((origines + decalage).T)
+        return origines + v_debut, np.concatenate(niveaux), materiau[o].astype(np.intp), T[o]
+
+    @staticmethod
+    def _chercher(recherche, voxels):
+        """Cellule contenant chaque voxel (n, 3)."""
+        cellules = np.full(voxels.shape[0], -1, dtype=np.int64)
+        for niveau, dims, cles, premier in recherche:
+            if cles.size == 0:
+                continue
+            q = np.ravel_multi_index(tuple((voxels >> niveau).T), dims)
+            pos = np.minimum(np.searchsorted(cles, q), cles.size - 1)
+            trouve = cles[pos] == q
+            cellules[trouve] = premier + pos[trouve]
+        return cellules
+
+    def _faces(self, recherche):
+        """
+        Couples de cellules voisines (a, b) avec b du côté + de a, nombre
+        de faces voxel communes et axe de la face: chaque face de cellule est coupée en 4
+        tant que la cellule voisine est plus petite qu'elle (un couple
+        n'apparaît donc qu'une fois). Seules les faces utiles sont gardées:
+        un côté actif (conduction) ou un côté air (zones, surfaces).
+        """
+        utile = self.actif | (self.Alpha < 0)
+        faces_a, faces_b, nombres, axes = [], [], [], []
+        cotes = np.int64(1) << self.niveaux.astype(np.int64)
+        for axe, debut in ((axe, debut) for axe in range(3) for debut in range(0, self.nb_cellules, self.TRANCHE)):
+            # Par tranches de cellules: temporaires bornés
+            autres = [autre for autre in range(3) if autre != axe]
+            tranche = slice(debut, debut + self.TRANCHE)
+            a = debut + np.flatnonzero(self.origines[tranche, axe] + cotes[tranche] < self.forme[axe])
+            f = self.origines[a].copy()
+            f[:, axe] += cotes[a]
+            nf = self.niveaux[a].astype(np.int64)
+            while a.size:
+                b = self._chercher(recherche, f)
+                fini = self.niveaux[b] >= nf
+                garde = fini & (utile[a] | utile[b])
+                faces_a.append(a[garde])
+                faces_b.append(b[garde])
+                nombres.append(4.0 ** nf[garde])
+                axes.append(np.full(np.count_nonzero(garde), axe, dtype=np.int8))
+                a, f, nf = a[~fini], f[~fini], nf[~fini] - 1
+                demi = np.int64(1) << nf
+                sous = []
+                for d0 in (0, 1):
+                    for d1 in (0, 1):
+                        g = f.copy()
+                        g[:, autres[0]] += d0 * demi
+                        g[:, autres[1]] += d1 * demi
+                        sous.append(g)
+                a, f, nf = np.tile(a, 4), np.concatenate(sous), np.tile(nf, 4)
+        return np.concatenate(faces_a), np.concatenate(faces_b), np.concatenate(nombres), np.concatenate(axes)
+
+    def _zones_air(self, source, table, indices, faces_a, faces_b):
+        """
+        Zone de chaque cellule d'air: celle de la table (ModeleMaison
+        préparé) ou, pour une GeometrieBoites, une zone par volume d'air
+        connexe (ids -1, -2... par volume décroissant), créées dans
+        source.zones_air.
+        """
+        air = self.Alpha < 0
+        self.zone_cellules = np.zeros(self.nb_cellules, dtype=np.int64)
+        if not isinstance(source, GeometrieBoites):
+            self.zone_cellules[air] = np.array([entree["alpha"] for entree in table])[indices[air]].astype(np.int64)
+            return source.zones_air
+
+        cellules_air = np.flatnonzero(air)
+        rang_air = np.full(self.nb_cellules, -1, dtype=np.int64)
+        rang_air[cellules_air] = np.arange(cellules_air.size)
+        liens = air[faces_a] & air[faces_b]
+        graphe = coo_matrix((np.ones(int(np.count_nonzero(liens))),
+                             (rang_air[faces_a[liens]], rang_air[faces_b[liens]])),
+                            shape=(cellules_air.size, cellules_air.size))
+        nb_volumes, etiquettes = connected_components(graphe, directed=False)
+        volumes_m3 = np.bincount(etiquettes, self.cotes_m[cellules_air] ** 3, minlength=nb_volumes)
+        ids_volumes = np.empty(nb_volumes, dtype=np.int64)
+        ids_volumes[np.argsort(-volumes_m3, kind="stable")] = -1 - np.arange(nb_volumes)
+        self.zone_cellules[cellules_air] = ids_volumes[etiquettes]
+
+        source.zones_air = {}
+        for id_zone in sorted(ids_volumes.tolist(), reverse=True):
+            zone = ZoneAir(f"{id_zone}", self.logger, source.params.T_interieur_init)
+            zone.volume_m3 = float(volumes_m3[ids_volumes == id_zone][0])
+            zone.finaliser_capacite()
+            source.zones_air[id_zone] = zone
+        self.logger.info(f"Zones d'air: {nb_volumes} volumes connexes.")
+        return source.zones_air
+
+    def _surfaces_convection(self, zones_air, faces_a, faces_b):
+        """Cellules solides au contact de l'air de chaque zone, et tables plates de la convection."""
+        ids_zones = list(zones_air)
+        rang_zone = np.full(self.nb_cellules, -1, dtype=np.int64)
+        air = self.Alpha < 0
+        if ids_zones:
+            ids_tries = np.array(sorted(ids_zones))
+            rangs_tries = np.array([ids_zones.index(i) for i in ids_tries.tolist()])
+            pos = np.minimum(np.searchsorted(ids_tries, self.zone_cellules[air]), ids_tries.size - 1)
+            connue = ids_tries[pos] == self.zone_cellules[air]
+            rang_zone[np.flatnonzero(air)[connue]] = rangs_tries[pos[connue]]
+
+        # Couples (zone, cellule solide) en contact, triés par zone puis par position dans la grille
+        solide = self.Alpha > 0
+        n_voxels = int(np.prod(self.forme))
+        cles, cellules = [], []
+        for cote_solide, cote_air in ((faces_a, faces_b), (faces_b, faces_a)):
+            contact = solide[cote_solide] & (rang_zone[cote_air] >= 0)
+            plat = np.ravel_multi_index(tuple(self.origines[cote_solide[contact]].T), self.forme)
+            cles.append(rang_zone[cote_air[contact]] * n_voxels + plat)
+            cellules.append(cote_solide[contact])
+        cles, premiers = np.unique(np.concatenate(cles), return_index=True)
+        zone = (cles // n_voxels).astype(np.intp)
+        cellules = np.concatenate(cellules)[premiers].astype(np.intp)
+
+        self.surfaces_zone = {id_zone: cellules[zone == rang] for rang, id_zone in enumerate(ids_zones)}
+        self.surfaces = np.unique(cellules)
+        aires = np.full(cellules.size, self.ds ** 2)
+        self.tables_surfaces = ModeleMaison.construire_tables_surfaces(ids_zones, zone, cellules, aires,
+                                                                       self.capacites[cellules])
+
+    def pas_stable_max(self):
+        """Plus grand dt explicite stable: min C / ΣG sur les cellules actives (s)."""
+        somme_G = np.bincount(self.faces_a, self.G, self.nb_cellules) + \
+            np.bincount(self.faces_b, self.G, self.nb_cellules)
+        actives = self.actif & (somme_G > 0)
+        return float(np.min(self.capacites[actives] / somme_G[actives], initial=np.inf))
+
+    def conduction(self, T, dt):
+        """Avance T (températures des cellules) d'un pas explicite de conduction, en place."""
+        flux = self.G * (T[self.faces_b] - T[self.faces_a])
+        energie = np.bincount(self.faces_a, flux, self.nb_cellules) - np.bincount(self.faces_b, flux, self.nb_cellules)
+        T[self.actif] += dt * energie[self.actif] / self.capacites[self.actif]
+
+    def pertes_W(self, T):
+        """Puissance conduite des cellules actives vers les cellules imposées (W)."""
+        a, b = self.faces_a[self.faces_limites], self.faces_b[self.faces_limites]
+        return float(np.sum(self._signe_limites * self.G[self.faces_limites] * (T[a] - T[b])))
+
+    def vers_grille(self, valeurs, facteur=1):
+        """
+        Rééchantillonne des valeurs par cellule sur une grille uniforme.
+
+        Args:
+            valeurs: Tableau (nb_cellules,)
+            facteur: Puissance de 2; pas de la grille = ds·facteur (moyenne
+                     volumique des cellules plus petites)
+
+        Returns:
+            Grille (N_x, N_y, N_z) pour facteur=1, ceil(N/facteur) sinon
+        """
+        m = int(np.log2(facteur))
+        if 2 ** m != facteur:
+            raise ValueError("facteur doit être une puissance de 2.")
+        forme = tuple(-(-n // facteur) for n in self.forme)
+        cote_max = 2 ** max(self.niveaux_max - m, 0)
+        forme_pad = tuple(-(-n // cote_max) * cote_max for n in forme)
+        somme = np.zeros(forme_pad)
+        poids = np.zeros(forme_pad)
+
+        # Cellules plus petites que la maille de sortie: moyenne volumique
+        fines = self.niveaux < m
+        if np.any(fines):
+            o = tuple((self.origines[fines] // facteur).T)
+            v = 8.0 ** self.niveaux[fines]
+            np.add.at(somme, o, v * valeurs[fines])
+            np.add.at(poids, o, v)
+
+        # Cellules plus grosses: recopiées sur leurs 8^(niveau - m) mailles
+        for niveau in range(m, self.niveaux_max + 1):
+            choix = self.niveaux == niveau
+            if not np.any(choix):
+                continue
+            cote = 2 ** (niveau - m)
+            nb_blocs = tuple(n // cote for n in forme_pad)
+            bi, bj, bk = (self.origines[choix] // facteur // cote).T
+            somme.reshape(nb_blocs[0], cote, nb_blocs[1], cote, nb_blocs[2], cote)[bi, :, bj, :, bk, :] = \
+                valeurs[choix][:, None, None, None]
+            poids.reshape(nb_blocs[0], cote, nb_blocs[1], cote, nb_blocs[2], cote)[bi, :, bj, :, bk, :] = 1.0
+        grille = somme[:forme[0], :forme[1], :forme[2]] / poids[:forme[0], :forme[1], :forme[2]]
+        return grille
+
+
+class SimulationBlocs:
+    """Schéma explicite de Simulation (conduction, convection, rayonnement) sur un MaillageBlocs."""
+
+    def __init__(self, modele, niveaux_max=3, marge=2, chemin_sortie="resultats_sim", enable_rayonnement=True,
+                 facteur_stockage=1):
+        """
+        Args:
+            modele: GeometrieBoites (sans grille fine), ou ModeleMaison préparé
+                    (preparer_simulation), grille uniforme
+            niveaux_max: Niveau de la plus grosse cellule (côté ds·2^niveaux_max)
+            marge: Voxels gardés au niveau 0 autour des frontières (MaillageBlocs)
+            chemin_sortie: Dossier des résultats (StockageResultats)
+            enable_rayonnement: Rayonnement externe actif
+            facteur_stockage: Grilles stockées au pas ds·facteur_stockage (puissance de 2)
+        """
+        self.modele = modele
+        self.params = modele.params
+        self.logger = modele.logger
+        if getattr(modele, "parois", None):
+            self.logger.error("Maillage par blocs: parois multicouches non gérées.")
+            raise ValueError("Parois multicouches: utiliser Simulation.")
+        self.maillage = MaillageBlocs(modele, self.logger, niveaux_max=niveaux_max, marge=marge)
+        self.zones = modele.etat_zones()  # Après le maillage (zones d'une GeometrieBoites)
+        self.zones.hA[:] = self.params.h_convection * self.maillage.tables_surfaces["aires_zones"]
+        self.T = self.maillage.T_initial.copy()
+        self.dt = self.params.dt
+        self.facteur_stockage = facteur_stockage
+        self.stockage = StockageResultats(chemin_sortie, self.logger)
+        self.bilan = Bilan()
+        self.rayonnement = ModeleRayonnement(self.logger, enable_external=enable_rayonnement)
+
+        dt_max = self.maillage.pas_stable_max()
+        self.logger.info(f"Maillage par blocs: dt stable max {dt_max:.1f}s (dt={self.dt}s)")
+        if self.dt > dt_max:
+            self.logger.error(f"Instabilité détectée! dt ({self.dt}s) > {dt_max:.1f}s.")
+            raise ValueError("Simulation instable (CFL).")
+
+    def grille_complete(self):
+        """Températures rééchantillonnées au pas ds·facteur_stockage."""
+        return self.maillage.vers_grille(self.T, self.facteur_stockage)
+
+    def _pas_de_temps(self):
+        """Avance d'un pas dt: conduction, convection semi-implicite, rayonnement."""
+        m = self.maillage
+        T = self.T
+        dt = self.dt
+        m.conduction(T, dt)
+        Simulation.convection_semi_implicite(T, m.tables_surfaces, self.zones, self.params.h_convection, dt,
+                                             self.logger)
+
+        if self.rayonnement.enable_external and m.surfaces.size:
+            T_surfaces = T[m.surfaces]
+            T[m.surfaces] = T_surfaces + self.rayonnement.calculer_dT_surfaces(
+                T_surfaces, m.RhoCp[m.surfaces], self.params.ds, dt, emissivite_default=0.85)
+
+    def _energie_J(self):
+        """Énergie des cellules solides et de l'air (J, référence 0°C)."""
+        return float(np.sum(self.maillage.capacites * self.T)) + self.zones.energie_J()
+
+    def _calculer_pertes_W(self):
+        """Pertes de puissance (W) vers les cellules imposées (limites fixes, air, bords)."""
+        return self.maillage.pertes_W(self.T)
+
+    def lancer_simulation(self, duree_s, intervalle_stockage_s=600):
+        """Même boucle (et mêmes instants de stockage) que Simulation.lancer_simulation."""
+        debut = time.time()
+        dt = self.dt
+        temps_s = 0.0
+        self.bilan.ajouter(temps_s, self._energie_J())
+        self.stockage.stocker_etape(temps_s, self.grille_complete(), self.zones)
+        prochain_stockage_s = intervalle_stockage_s
+        while temps_s <= duree_s:
+            self._pas_de_temps()
+            temps_s += dt
+            self.bilan.ajouter(temps_s, self._energie_J())
+            if temps_s >= prochain_stockage_s:
+                self.stockage.stocker_etape(temps_s, self.grille_complete(), self.zones)
+                prochain_stockage_s += intervalle_stockage_s
+        if (temps_s - dt) < (prochain_stockage_s - intervalle_stockage_s):
+            self.stockage.stocker_etape(temps_s, self.grille_complete(), self.zones)
+
+        temperatures_air = {zone.nom: zone.T for zone in self.modele.zones_air.values()}
+        self.logger.info(f"Simulation par blocs terminée en {time.time() - debut:.2f}s.")
+        self.logger.info(f"--- Température Finale de l'Air: {temperatures_air} ---")
+        self.bilan.rapport_final(self.logger)
+        return temperatures_air
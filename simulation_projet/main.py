@@ -1,7 +1,7 @@
 
 # Fichier généré: main.py
 # C'est votre "Simulateur".
-# Il charge le fichier 'modele.pkl' (créé par creer_modele.py)
+# Il charge le fichier 'modele.hsm' (créé par creer_modele.py)
 # et lance la simulation physique.
 
 import os
@@ -25,7 +25,7 @@ def main():
     logger = LoggerSimulation(niveau="DEBUG")
     logger.info("--- Démarrage de la Simulation ---")
 
-    chemin_modele = "modele.pkl"
+    chemin_modele = "modele.hsm"
     chemin_resultats = "resultats_sim"
 
     # 1. Charger le Modèle
@@ -1,6 +1,7 @@
 # Fichier généré automatiquement par dispatcher_le_projet.py
 
 from logger import LoggerSimulation
+import numpy as np
 
 
 # --- Constantes de MATERIAUX (Dictionnaire) ---
@@ -124,28 +125,111 @@ for nom, props in MATERIAUX.items():
 
 
 
+class EtatZones:
+    """
+    État des zones d'air en tableaux contigus, une entrée par zone (ordre de
+    `ids`): températures T (°C), volumes (m³), capacites (J/K), puissances
+    d'apport (W) et hA, conductance de convection h·A (W/K, renseignée par
+    la simulation). Les ZoneAir regroupées sont des vues sur leur entrée:
+    mises à jour, sommes d'énergie et instantanés sont des opérations
+    vectorielles.
+    """
+
+    # Attribut de ZoneAir -> tableau de l'état
+    CHAMPS = {"T": "T", "volume_m3": "volumes", "capacite_thermique_J_K": "capacites",
+              "puissance_apport_W": "puissances", "hA_W_K": "hA"}
+
+    def __init__(self, nb_zones, ids=None):
+        self.ids = list(ids) if ids is not None else list(range(nb_zones))
+        self.zones = []
+        for tableau in self.CHAMPS.values():
+            setattr(self, tableau, np.zeros(nb_zones))
+
+    @classmethod
+    def regrouper(cls, zones_air):
+        """État commun des zones {id: ZoneAir} (valeurs recopiées), les zones devenant des vues."""
+        etat = cls(len(zones_air), ids=zones_air.keys())
+        etat.zones = list(zones_air.values())
+        for rang, zone in enumerate(etat.zones):
+            for tableau in cls.CHAMPS.values():
+                getattr(etat, tableau)[rang] = getattr(zone._etat, tableau)[zone._rang]
+            zone._etat, zone._rang = etat, rang
+        return etat
+
+    def est_regroupement(self, zones_air):
+        """Vrai si l'état est celui des zones {id: ZoneAir}, dans le même ordre."""
+        return (self.ids == list(zones_air.keys())
+                and all(zone._etat is self and zone._rang == rang for rang, zone in enumerate(zones_air.values())))
+
+    def energie_J(self):
+        """Énergie des zones (J, référence 0°C)."""
+        return float(self.capacites @ self.T)
+
+    def temperatures(self):
+        """Instantané {id: T} des températures."""
+        return dict(zip(self.ids, self.T.tolist()))
+
+
+def _vue_etat(champ):
+    """Attribut de ZoneAir lu et écrit dans l'entrée de la zone de son EtatZones."""
+    tableau = EtatZones.CHAMPS[champ]
+
+    def lire(self):
+        return float(getattr(self._etat, tableau)[self._rang])
+
+    def ecrire(self, valeur):
+        getattr(self._etat, tableau)[self._rang] = valeur
+
+    return property(lire, ecrire)
+
+
 class ZoneAir:
-    """Représente un volume d'air (nœud) à une température unique."""
+    """
+    Représente un volume d'air (nœud) à une température unique.
+
+    T, volume_m3, capacite_thermique_J_K, puissance_apport_W et hA_W_K sont
+    des vues sur une entrée d'EtatZones: propre à la zone à sa création,
+    commune à toutes les zones du modèle après ModeleMaison.etat_zones().
+    """
+
+    T = _vue_etat("T")
+    volume_m3 = _vue_etat("volume_m3")
+    capacite_thermique_J_K = _vue_etat("capacite_thermique_J_K")  # V * rho * cp (J/K)
+    puissance_apport_W = _vue_etat("puissance_apport_W")  # Apport de puissance (radiateur, W)
+    hA_W_K = _vue_etat("hA_W_K")
 
     def __init__(self, nom, logger, T_init=20.0):
         self.nom = nom
         self.logger = logger
+        self._etat, self._rang = EtatZones(1), 0
         self.T = T_init  # Température actuelle de la zone
-        self.volume_m3 = 0.0
-
-        # --- Apport de puissance (Radiateur) ---
-        self.puissance_apport_W = 0.0  # (W)
 
         # Propriétés de l'air
         props = MATERIAUX["AIR"]
         self.rho = props["rho"]
         self.cp = props["cp"]
 
-        # Capacité thermique totale (J/K) = V * rho * cp
-        self.capacite_thermique_J_K = 0.0
-
         self.logger.info(f"Zone '{self.nom}' créée, T_init={self.T}°C")
 
+    def __copy__(self):
+        """Copie détachée: état propre, valeurs courantes."""
+        copie = ZoneAir.__new__(ZoneAir)
+        copie.__setstate__(self.__getstate__())
+        return copie
+
+    def __getstate__(self):
+        etat = {cle: valeur for cle, valeur in self.__dict__.items() if cle not in ("_etat", "_rang")}
+        etat.update({champ: getattr(self, champ) for champ in EtatZones.CHAMPS})
+        return etat
+
+    def __setstate__(self, etat):
+        etat = dict(etat)
+        valeurs = {champ: etat.pop(champ, 0.0) for champ in EtatZones.CHAMPS}
+        self.__dict__.update(etat)
+        self._etat, self._rang = EtatZones(1), 0
+        for champ, valeur in valeurs.items():
+            setattr(self, champ, valeur)
+
     def set_apport_puissance(self, puissance_W):
         """Règle la puissance du "radiateur" pour cette zone."""
         self.puissance_apport_W = puissance_W
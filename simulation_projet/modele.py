@@ -2,14 +2,33 @@
 
 from logger import LoggerSimulation
 from model_data import MATERIAUX
-from model_data import ZoneAir
+from model_data import EtatZones, ZoneAir
+from paroi_multicouche import ParoiMulticouche
 from parametres import ParametresSimulation
 import numpy as np
+from scipy import ndimage
+import copy
+import os
 import pickle
 
+import format_modele
+
 
 class ModeleMaison:
-    """Gère la géométrie 3D, les matériaux et la détection des surfaces."""
+    """Gère la géométrie 3D, les matériaux et la détection des surfaces.
+
+    Représentation: une grille d'indices de matériau (Materiau, uint8, ou
+    uint16 au-delà de 256 entrées) et une table de propriétés (une entrée par
+    matériau solide/limite, une par zone d'air). Les grilles Alpha, Lambda et
+    RhoCp sont dérivées à la demande (table[Materiau]) et mises en cache, en
+    LECTURE SEULE: on modifie le modèle par set_material_at,
+    construire_volume_metres ou construire_depuis_plans. Le cache ne sert
+    qu'à la préparation: preparer_simulation et Simulation le vident
+    (liberer_proprietes) une fois leurs tableaux compacts extraits, pour ne
+    garder pendant le calcul que Materiau (1 octet par voxel).
+
+    Alpha garde sa convention: > 0 solide, 0 limite fixe, id de zone (< 0) air.
+    """
 
     def __init__(self, params):
         self.params = params
@@ -21,14 +40,15 @@ class ModeleMaison:
         # Matrice de Température (initialisée à T_interieur)
         self.T = np.full(dims, self.params.T_interieur_init, dtype=np.float64)
 
-        # Matrice de Diffusivité (alpha)
-        self.Alpha = np.full(dims, 0.0, dtype=np.float64)
+        # Table des matériaux: entrées {"nom", "type", "alpha", "lambda", "rho_cp", "id_zone"}
+        self.table_materiaux = []
+        self._index_table = {}  # (nom, id_zone) -> indice
+        self.dtype_alpha = np.float64
+        self._cache = {}
 
-        # Matrice de Conductivité (lambda)
-        self.Lambda = np.full(dims, 0.0, dtype=np.float64)
-
-        # Matrice de Capacité Thermique Volumique (rho * cp)
-        self.RhoCp = np.full(dims, 0.0, dtype=np.float64)
+        # Grille des indices de matériau (entrée 0: LIMITE_FIXE)
+        self.Materiau = np.zeros(dims, dtype=np.uint8)
+        self.indice_materiau("LIMITE_FIXE")
 
         # Dictionnaire des zones d'air
         self.zones_air = {}  # ex: {-1: ZoneAir(...)}
@@ -36,51 +56,246 @@ class ModeleMaison:
         # Index des surfaces de convection (pré-calculé)
         self.surfaces_convection_idx = {}
 
+        # Parois multicouches 1D hors grille (voir ajouter_paroi)
+        self.parois = []
+
         self.logger.info("Modèle 3D (matrices NumPy) initialisé.")
 
-    # --- NOUVEAU: Sauvegarde et Chargement du modèle ---
+    # --- Table des matériaux et grilles de propriétés dérivées ---
+    def indice_materiau(self, nom_materiau, id_zone=None):
+        """Indice de la table pour un matériau (ajouté si absent). id_zone: zones d'air."""
+        cle = (nom_materiau, id_zone)
+        indice = self._index_table.get(cle)
+        if indice is not None:
+            return indice
+        return self._ajouter_entree(cle, self.entree_materiau(nom_materiau, id_zone))
+
+    @staticmethod
+    def entree_materiau(nom_materiau, id_zone=None):
+        """Entrée de table d'un matériau (air: alpha = id de zone, -1 si id_zone est None)."""
+        props = MATERIAUX[nom_materiau]
+        if props["type"] == "AIR":
+            entree = {"alpha": float(id_zone if id_zone is not None else -1), "lambda": 0.0, "rho_cp": 0.0}
+        elif props["type"] == "LIMITE_FIXE":
+            entree = {"alpha": 0.0, "lambda": 0.0, "rho_cp": 0.0}
+        else:
+            entree = {"alpha": props["alpha"], "lambda": props["lambda"],
+                      "rho_cp": props["rho"] * props["cp"]}
+        entree.update({"nom": nom_materiau, "type": props["type"], "id_zone": id_zone})
+        return entree
+
+    def _ajouter_entree(self, cle, entree):
+        """Ajoute une entrée à la table (passe la grille en uint16 si nécessaire)."""
+        indice = len(self.table_materiaux)
+        if indice > np.iinfo(self.Materiau.dtype).max:
+            if self.Materiau.dtype == np.uint16:
+                self.logger.error("Table des matériaux pleine (65536 entrées).")
+                raise ValueError("Trop de matériaux distincts.")
+            self.Materiau = self.Materiau.astype(np.uint16)
+        self.table_materiaux.append(entree)
+        self._index_table[cle] = indice
+        self._cache = {}
+        return indice
+
+    # Conductivités par axe: "lambda_axes" des mélanges orientés, sinon "lambda" (isotrope)
+    CHAMPS_LAMBDA_AXES = ("lambda_x", "lambda_y", "lambda_z")
+    CHAMPS_PROPRIETES = ("alpha", "lambda", "rho_cp") + CHAMPS_LAMBDA_AXES
+
+    def table_propriete(self, champ, dtype=np.float64):
+        """Valeur d'une propriété pour chaque entrée de la table (à indexer par Materiau)."""
+        if champ in self.CHAMPS_LAMBDA_AXES:
+            axe = self.CHAMPS_LAMBDA_AXES.index(champ)
+            return np.array([entree["lambda_axes"][axe] if "lambda_axes" in entree else entree["lambda"]
+                             for entree in self.table_materiaux], dtype=dtype)
+        return np.array([entree[champ] for entree in self.table_materiaux], dtype=dtype)
+
+    def _propriete(self, champ, dtype=np.float64):
+        """Grille d'une propriété, dérivée de la table et mise en cache (lecture seule)."""
+        grille = self._cache.get(champ)
+        if grille is None:
+            grille = self.table_propriete(champ, dtype)[self.Materiau]
+            grille.flags.writeable = False
+            self._cache[champ] = grille
+        return grille
+
+    def invalider_proprietes(self):
+        """Oublie les grilles dérivées (après une modification directe de Materiau)."""
+        self._cache = {}
+
+    def liberer_proprietes(self):
+        """Libère les grilles Alpha, Lambda et RhoCp du cache (recalculées à la prochaine lecture)."""
+        for champ in self.CHAMPS_PROPRIETES:
+            self._cache.pop(champ, None)
+
+    @property
+    def Alpha(self):
+        """Diffusivité (m²/s) > 0 pour les solides, 0 limite fixe, id de zone pour l'air."""
+        return self._propriete("alpha", self.dtype_alpha)
+
+    @property
+    def Lambda(self):
+        """Conductivité (W/m.K)."""
+        return self._propriete("lambda")
+
+    def Lambda_axe(self, axe):
+        """Conductivité (W/m.K) pour un flux selon l'axe (0, 1, 2): diffère de Lambda aux mélanges orientés."""
+        return self._propriete(self.CHAMPS_LAMBDA_AXES[axe])
+
+    @property
+    def RhoCp(self):
+        """Capacité thermique volumique ρ·cp (J/m³.K)."""
+        return self._propriete("rho_cp")
+
+    def materiau_en(self, x, y, z):
+        """Nom du matériau du voxel (x, y, z) (lecture exacte dans la table)."""
+        return self.table_materiaux[self.Materiau[x, y, z]]["nom"]
+
+    def compter_materiaux(self):
+        """Nombre de voxels par nom de matériau."""
+        comptes = np.bincount(self.Materiau.reshape(-1), minlength=len(self.table_materiaux))
+        resultat = {}
+        for entree, nb in zip(self.table_materiaux, comptes):
+            if nb:
+                resultat[entree["nom"]] = resultat.get(entree["nom"], 0) + int(nb)
+        return resultat
+
+    def _placer(self, s, nom_materiau, id_zone=None):
+        """Affecte un matériau à une sélection de voxels (slices ou indices)."""
+        self.Materiau[s] = self.indice_materiau(nom_materiau, id_zone)
+        self._cache = {}
+
+    ID_ZONE_DEFAUT = -1
+
+    def _zone_air_par_defaut(self):
+        """
+        Zone des voxels d'air placés par les constructions (créée si absente).
+        Les volumes d'air disjoints sont séparés en zones, et les volumes
+        calculés, par preparer_simulation.
+        """
+        if self.ID_ZONE_DEFAUT not in self.zones_air:
+            self.zones_air[self.ID_ZONE_DEFAUT] = ZoneAir(f"{self.ID_ZONE_DEFAUT}", self.logger,
+                                                          self.params.T_interieur_init)
+        return self.ID_ZONE_DEFAUT
+
+    def __getstate__(self):
+        etat = self.__dict__.copy()
+        etat["_cache"] = {}  # Les grilles dérivées ne sont pas sauvegardées
+        etat.pop("_etat_zones", None)  # Zones sauvegardées avec leurs valeurs
+        return etat
+
+    def __setstate__(self, etat):
+        self.__dict__.update(etat)
+        self._cache = {}
+        self.__dict__.setdefault("parois", [])
+        if "Materiau" not in etat:
+            self._depuis_grilles_proprietes(etat.pop("Alpha"), etat.pop("Lambda"), etat.pop("RhoCp"))
+            for nom in ("Alpha", "Lambda", "RhoCp"):
+                self.__dict__.pop(nom, None)
+
+    def _depuis_grilles_proprietes(self, Alpha, Lambda, RhoCp):
+        """Reconstruit Materiau et la table depuis des grilles de propriétés (anciens fichiers)."""
+        self.table_materiaux = []
+        self._index_table = {}
+        self.dtype_alpha = np.float64
+        self.Materiau = np.zeros(Alpha.shape, dtype=np.uint8)
+        triplets, inverse = np.unique(np.stack([Alpha.ravel(), Lambda.ravel(), RhoCp.ravel()], axis=1),
+                                      axis=0, return_inverse=True)
+        indices = np.empty(len(triplets), dtype=np.intp)
+        for n, (alpha, lam, rho_cp) in enumerate(triplets):
+            if alpha < 0:
+                indices[n] = self.indice_materiau("AIR", int(alpha))
+            elif alpha == 0:
+                indices[n] = self.indice_materiau("LIMITE_FIXE")
+            else:
+                nom = next((nom for nom, props in MATERIAUX.items()
+                            if props["type"] == "SOLIDE" and props["alpha"] == alpha
+                            and props["lambda"] == lam and props["rho"] * props["cp"] == rho_cp),
+                           f"INCONNU_{n}")
+                if nom in MATERIAUX:
+                    indices[n] = self.indice_materiau(nom)
+                else:
+                    indices[n] = self._ajouter_entree((nom, None), {
+                        "nom": nom, "type": "SOLIDE", "alpha": float(alpha), "lambda": float(lam),
+                        "rho_cp": float(rho_cp), "id_zone": None})
+        self.Materiau = indices[inverse.reshape(-1)].reshape(Alpha.shape).astype(self.Materiau.dtype)
+
+    # --- Sauvegarde et Chargement du modèle (format binaire .hsm) ---
+    # Attributs numériques des paramètres et des zones écrits dans l'en-tête
+    CHAMPS_ZONE = ("T", "volume_m3", "puissance_apport_W", "rho", "cp", "capacite_thermique_J_K")
+    CHAMPS_TABLE = ("nom", "type", "alpha", "lambda", "rho_cp", "id_zone")
+
     def sauvegarder(self, chemin_fichier):
-        """Sauvegarde l'objet ModeleMaison complet dans un fichier pickle."""
+        """
+        Sauvegarde le modèle au format binaire projetable (voir format_modele):
+        en-tête JSON (paramètres, zones, table des matériaux) + grilles brutes.
+        """
         self.logger.info(f"Sauvegarde du modèle dans '{chemin_fichier}'...")
         try:
-            # On ne veut pas sauvegarder le logger
-            logger_temp = self.logger
-            self.logger = None
-            self.params.logger = None
-            for zone in self.zones_air.values():
-                zone.logger = None
-
-            with open(chemin_fichier, 'wb') as f:
-                pickle.dump(self, f)
-
-            # Restaurer le logger
-            self.logger = logger_temp
-            self.params.logger = logger_temp
-            for zone in self.zones_air.values():
-                zone.logger = logger_temp
-
+            params = {cle: valeur for cle, valeur in vars(self.params).items()
+                      if isinstance(valeur, (int, float, tuple, list)) and not isinstance(valeur, bool)
+                      and cle != "coords_m"}
+            entete = {
+                "params": params,
+                "dtype_alpha": np.dtype(self.dtype_alpha).name,
+                "table_materiaux": [{champ: entree[champ] for champ in self.CHAMPS_TABLE}
+                                    for entree in self.table_materiaux],
+                "zones": [dict({"id": int(id_zone), "nom": str(zone.nom)},
+                               **{champ: float(getattr(zone, champ)) for champ in self.CHAMPS_ZONE})
+                          for id_zone, zone in self.zones_air.items()],
+            }
+            tableaux = {"T": self.T, "Materiau": self.Materiau}
+            if not self.params.uniforme:
+                for nom_axe, coords in zip("xyz", self.params.coords_m):
+                    tableaux[f"coords_{nom_axe}"] = coords
+            for id_zone, indices_tuple in self.surfaces_convection_idx.items():
+                tableaux[f"surfaces_{int(id_zone)}"] = np.array(indices_tuple, dtype=np.int64).reshape(3, -1)
+            entete["parois"] = []
+            for n, paroi in enumerate(self.parois):
+                cotes = []
+                for nom_cote, cote in zip("ab", paroi.cotes):
+                    if cote["type"] == "voxels":
+                        tableaux[f"paroi_{n}_voxels_{nom_cote}"] = np.array(cote["indices"], dtype=np.int64)
+                    cotes.append({cle: valeur for cle, valeur in cote.items() if cle != "indices"})
+                entete["parois"].append({"nom": str(paroi.nom), "couches": paroi.couches,
+                                         "aire_m2": paroi.aire_m2, "ds_max": paroi.ds_max, "cotes": cotes})
+                tableaux[f"paroi_{n}_T"] = paroi.T
+            format_modele.ecrire(chemin_fichier, entete, tableaux)
             self.logger.info("Sauvegarde terminée.")
         except Exception as e:
             self.logger.error(f"Erreur lors de la sauvegarde du modèle: {e}")
-            # Restaurer le logger même en cas d'échec
-            self.logger = logger_temp
-            self.params.logger = logger_temp
-            for zone in self.zones_air.values():
-                zone.logger = logger_temp
 
     @staticmethod
-    def charger(chemin_fichier, logger):
-        """Charge un objet ModeleMaison depuis un fichier pickle."""
+    def charger(chemin_fichier, logger, mode="c", autoriser_pickle=False):
+        """
+        Charge un modèle. Les grilles sont projetées en mémoire (np.memmap):
+        l'ouverture ne lit que l'en-tête, les pages sont lues à la demande.
+
+        Args:
+            chemin_fichier: Fichier .hsm
+            logger: Logger attaché au modèle
+            mode: "c" (copie sur écriture: le fichier n'est jamais modifié) ou "r"
+            autoriser_pickle: Accepte les anciens fichiers pickle. Un pickle
+                              peut exécuter du code: uniquement pour des
+                              fichiers de confiance.
+        """
         logger.info(f"Chargement du modèle depuis '{chemin_fichier}'...")
         try:
-            with open(chemin_fichier, 'rb') as f:
-                modele = pickle.load(f)
-
-            # Attacher un nouveau logger
-            modele.logger = logger
-            modele.params.logger = logger
-            for zone in modele.zones_air.values():
-                zone.logger = logger
+            if format_modele.est_fichier_modele(chemin_fichier):
+                modele = ModeleMaison._depuis_fichier(chemin_fichier, logger, mode)
+            elif autoriser_pickle:
+                logger.warn(f"'{chemin_fichier}': ancien format pickle, à réenregistrer en .hsm.")
+                with open(chemin_fichier, 'rb') as f:
+                    modele = pickle.load(f)
+                modele.logger = logger
+                modele.params.logger = logger
+                for zone in modele.zones_air.values():
+                    zone.logger = logger
+            elif not os.path.exists(chemin_fichier):
+                raise FileNotFoundError(chemin_fichier)
+            else:
+                logger.error(f"'{chemin_fichier}' n'est pas un fichier modèle (pickle refusé, "
+                             "voir autoriser_pickle).")
+                return None
 
             logger.info("Modèle chargé avec succès.")
             logger.info(f"Grille: {modele.params.N_x}x{modele.params.N_y}x{modele.params.N_z}")
@@ -92,9 +307,95 @@ class ModeleMaison:
             logger.error(f"Erreur lors du chargement du modèle: {e}")
             return None
 
-    def _coord_m_vers_idx(self, coord_m):
-        """Convertit une coordonnée physique (m) en index de grille."""
-        return int(round(coord_m / self.params.ds))
+    @staticmethod
+    def _depuis_fichier(chemin_fichier, logger, mode):
+        """Reconstruit le modèle depuis l'en-tête validé et les tableaux projetés."""
+        entete, tableaux = format_modele.lire(chemin_fichier, mode=mode)
+        erreur = format_modele.ErreurFormatModele
+
+        params = ParametresSimulation.__new__(ParametresSimulation)
+        for cle, valeur in entete.get("params", {}).items():
+            if not isinstance(valeur, (int, float, list)) or isinstance(valeur, bool):
+                raise erreur(f"Paramètre '{cle}' invalide.")
+            setattr(params, str(cle), tuple(valeur) if isinstance(valeur, list) else valeur)
+        params.logger = logger
+        params.coords_m = None
+        if "coords_x" in tableaux:
+            params.coords_m = tuple(np.array(tableaux[f"coords_{nom_axe}"], dtype=np.float64)
+                                    for nom_axe in "xyz")
+
+        modele = ModeleMaison.__new__(ModeleMaison)
+        modele.params = params
+        modele.logger = logger
+        modele._cache = {}
+        if entete.get("dtype_alpha") not in ("float64", "float32"):
+            raise erreur("dtype_alpha invalide.")
+        modele.dtype_alpha = np.dtype(entete["dtype_alpha"]).type
+
+        modele.table_materiaux = []
+        modele._index_table = {}
+        for entree in entete.get("table_materiaux", []):
+            entree = {champ: entree[champ] for champ in ModeleMaison.CHAMPS_TABLE}
+            if not all(isinstance(entree[c], (int, float)) for c in ("alpha", "lambda", "rho_cp")):
+                raise erreur("Table des matériaux invalide.")
+            modele._index_table[(entree["nom"], entree["id_zone"])] = len(modele.table_materiaux)
+            modele.table_materiaux.append(entree)
+
+        dims = (params.N_x, params.N_y, params.N_z)
+        if "T" not in tableaux or "Materiau" not in tableaux:
+            raise erreur("Grilles T ou Materiau absentes.")
+        if tableaux["T"].shape != dims or tableaux["Materiau"].shape != dims:
+            raise erreur(f"Grilles de forme différente de {dims}.")
+        if tableaux["Materiau"].dtype.kind != "u":
+            raise erreur("Materiau doit être une grille d'entiers non signés.")
+        if params.coords_m is not None and (tuple(c.size for c in params.coords_m) != dims
+                                            or any(np.any(np.diff(c) <= 0) for c in params.coords_m)):
+            raise erreur("Coordonnées de grille invalides.")
+        modele.T = tableaux["T"]
+        modele.Materiau = tableaux["Materiau"]
+
+        modele.zones_air = {}
+        modele.surfaces_convection_idx = {}
+        for desc in entete.get("zones", []):
+            id_zone = int(desc["id"])
+            zone = ZoneAir(str(desc["nom"]), logger, T_init=float(desc["T"]))
+            for champ in ModeleMaison.CHAMPS_ZONE:
+                setattr(zone, champ, float(desc[champ]))
+            modele.zones_air[id_zone] = zone
+            surfaces = tableaux.get(f"surfaces_{id_zone}")
+            if surfaces is not None:
+                if surfaces.ndim != 2 or surfaces.shape[0] != 3:
+                    raise erreur(f"Surfaces de la zone {id_zone} invalides.")
+                # Indices lus et bornés une fois (utilisés en indexation avancée)
+                surfaces = np.asarray(surfaces, dtype=np.intp)
+                if surfaces.size and ((surfaces < 0).any() or (surfaces.max(axis=1) >= dims).any()):
+                    raise erreur(f"Surfaces de la zone {id_zone} hors de la grille.")
+                modele.surfaces_convection_idx[id_zone] = tuple(surfaces)
+
+        modele.parois = []
+        for n, desc in enumerate(entete.get("parois", [])):
+            cotes = []
+            for nom_cote, cote in zip("ab", desc["cotes"]):
+                cote = {cle: valeur for cle, valeur in cote.items() if cle in ("type", "id_zone", "T", "h")}
+                if cote.get("type") == "voxels":
+                    indices = np.asarray(tableaux[f"paroi_{n}_voxels_{nom_cote}"], dtype=np.intp)
+                    if indices.ndim != 2 or indices.shape[0] != 3 or (indices < 0).any() \
+                            or (indices.max(axis=1, initial=0) >= dims).any():
+                        raise erreur(f"Voxels de la paroi {n} hors de la grille.")
+                    cote["indices"] = tuple(indices)
+                cotes.append(cote)
+            paroi = ParoiMulticouche(str(desc["nom"]), desc["couches"], float(desc["aire_m2"]),
+                                     cotes[0], cotes[1], logger, ds_max=float(desc["ds_max"]))
+            T_paroi = tableaux[f"paroi_{n}_T"]
+            if T_paroi.shape != paroi.T.shape:
+                raise erreur(f"Températures de la paroi {n} invalides.")
+            paroi.T[:] = T_paroi
+            modele.parois.append(paroi)
+        return modele
+
+    def _coord_m_vers_idx(self, coord_m, axe=0):
+        """Convertit une coordonnée physique (m) en index de grille (point le plus proche)."""
+        return self.params.indice(axe, coord_m)
 
     # --- NOUVEAU: Méthode pour l'éditeur TUI ---
     def set_material_at(self, x, y, z, nom_materiau):
@@ -113,74 +414,69 @@ class ModeleMaison:
 
         props_new = MATERIAUX[nom_materiau]
 
-        # --- Gestion complexe des zones d'air ---
-        id_zone_existante = self.Alpha[x, y, z]
-        volume_voxel_m3 = self.params.ds ** 3
-
-        # Cas 1: On remplace un matériau par de l'AIR
+        # Zones d'air: le voxel rejoint une zone voisine (ou la zone par défaut);
+        # preparer_simulation fusionne/sépare les zones et calcule leurs volumes
         if props_new["type"] == "AIR":
-            id_zone_a_rejoindre = -1  # On suppose une seule zone d'air
-
-            # Si on remplace un solide, on doit ajouter du volume
-            if id_zone_existante >= 0:  # C'était un SOLIDE ou LIMITE
-                if id_zone_a_rejoindre not in self.zones_air:
-                    self.zones_air[id_zone_a_rejoindre] = ZoneAir(
-                        f"{id_zone_a_rejoindre}", self.logger, self.params.T_interieur_init
-                    )
-                self.zones_air[id_zone_a_rejoindre].volume_m3 += volume_voxel_m3
-
-            # Si on remplace une AUTRE zone d'air (fusion), on ne gère pas
-            elif id_zone_existante != id_zone_a_rejoindre and id_zone_existante < 0:
-                self.logger.warn("La fusion de zones d'air n'est pas gérée.")
-                # (On devrait transférer le volume, etc.)
-
-            self.Alpha[x, y, z] = id_zone_a_rejoindre
-            self.Lambda[x, y, z] = 0.0
-            self.RhoCp[x, y, z] = 0.0
+            alpha = self.table_propriete("alpha")  # Lecture ponctuelle, sans grille Alpha
+            if alpha[self.Materiau[x, y, z]] < 0:
+                return  # Déjà de l'air
+            ids_voisins = []
+            for axe in range(3):
+                for sens in (-1, 1):
+                    voisin = [x, y, z]
+                    voisin[axe] += sens
+                    if 0 <= voisin[axe] < self.Materiau.shape[axe]:
+                        id_voisin = int(alpha[self.Materiau[tuple(voisin)]])
+                        if id_voisin in self.zones_air:
+                            ids_voisins.append(id_voisin)
+            id_zone = ids_voisins[0] if ids_voisins else self._zone_air_par_defaut()
+            self._placer((x, y, z), "AIR", id_zone)
             self.T[x, y, z] = self.params.T_interieur_init
-
-        # Cas 2: On remplace de l'AIR par un matériau
-        elif id_zone_existante < 0:  # C'était de l'AIR
-            if id_zone_existante in self.zones_air:
-                self.zones_air[id_zone_existante].volume_m3 -= volume_voxel_m3
-
-            # Appliquer les nouvelles propriétés (SOLIDE ou LIMITE)
-            self._apply_material_props(x, y, z, nom_materiau, props_new)
-
-        # Cas 3: On remplace un SOLIDE/LIMITE par un autre SOLIDE/LIMITE
         else:
             self._apply_material_props(x, y, z, nom_materiau, props_new)
 
     def _apply_material_props(self, x, y, z, nom_materiau, props):
         """Helper pour appliquer les propriétés d'un matériau (non-air)."""
         if props["type"] == "LIMITE_FIXE":
-            self.Alpha[x, y, z] = 0.0
-            self.Lambda[x, y, z] = 0.0
-            self.RhoCp[x, y, z] = 0.0
+            self._placer((x, y, z), nom_materiau)
             if nom_materiau == "TERRE":  # Cas spécial
                 self.T[x, y, z] = self.params.T_sol_init
             else:
                 self.T[x, y, z] = self.params.T_exterieur_init
 
         elif props["type"] == "SOLIDE":
-            self.Alpha[x, y, z] = props["alpha"]
-            self.Lambda[x, y, z] = props["lambda"]
-            self.RhoCp[x, y, z] = props["rho"] * props["cp"]
+            self._placer((x, y, z), nom_materiau)
             if nom_materiau == "TERRE":
                 self.T[x, y, z] = self.params.T_sol_init
             else:
                 self.T[x, y, z] = self.params.T_interieur_init
 
-    def construire_volume_metres(self, p1_m, p2_m, nom_materiau, T_override_K=None):
-        """Remplit un volume de la grille (défini en mètres) avec un matériau."""
+    def construire_volume_metres(self, p1_m, p2_m, nom_materiau, T_override_K=None, fractions=False,
+                                 melange="oriente"):
+        """
+        Remplit un volume de la grille (défini en mètres) avec un matériau.
+
+        fractions=False: bornes arrondies au voxel le plus proche (inclusives).
+        fractions=True: fraction de chaque voxel couverte par la boîte; un
+        voxel partiellement couvert d'un solide par un solide devient un
+        mélange (ρ·cp moyen en volume, λ selon melange, voir _melanger:
+        "oriente" par défaut, en série à travers la coupe et en parallèle le
+        long). Avec l'air ou une limite fixe, le voxel va au matériau
+        majoritaire. λ par axe (Lambda_axe) est utilisé par les schémas en
+        forme flux (multi_pas, implicite, régime permanent, blocs, pertes);
+        le FTCS de référence (α centré) ne voit que la moyenne des axes.
+        """
+        if fractions:
+            self._construire_fractions(p1_m, p2_m, nom_materiau, T_override_K, melange)
+            return
 
-        x1 = self._coord_m_vers_idx(min(p1_m[0], p2_m[0]))
-        y1 = self._coord_m_vers_idx(min(p1_m[1], p2_m[1]))
-        z1 = self._coord_m_vers_idx(min(p1_m[2], p2_m[2]))
+        x1 = self._coord_m_vers_idx(min(p1_m[0], p2_m[0]), 0)
+        y1 = self._coord_m_vers_idx(min(p1_m[1], p2_m[1]), 1)
+        z1 = self._coord_m_vers_idx(min(p1_m[2], p2_m[2]), 2)
 
-        x2 = self._coord_m_vers_idx(max(p1_m[0], p2_m[0])) + 1
-        y2 = self._coord_m_vers_idx(max(p1_m[1], p2_m[1])) + 1
-        z2 = self._coord_m_vers_idx(max(p1_m[2], p2_m[2])) + 1
+        x2 = self._coord_m_vers_idx(max(p1_m[0], p2_m[0]), 0) + 1
+        y2 = self._coord_m_vers_idx(max(p1_m[1], p2_m[1]), 1) + 1
+        z2 = self._coord_m_vers_idx(max(p1_m[2], p2_m[2]), 2) + 1
 
         x1 = max(0, x1);
         x2 = min(self.params.N_x, x2)
@@ -199,24 +495,11 @@ class ModeleMaison:
         props = MATERIAUX[nom_materiau]
 
         if props["type"] == "AIR":
-            id_zone = -1
-            if id_zone not in self.zones_air:
-                self.zones_air[id_zone] = ZoneAir(
-                    f"{id_zone}", self.logger, self.params.T_interieur_init
-                )
-
-            volume_bloc_m3 = (x2 - x1) * (y2 - y1) * (z2 - z1) * (self.params.ds ** 3)
-            self.zones_air[id_zone].volume_m3 += volume_bloc_m3
-
-            self.Alpha[s] = id_zone
-            self.Lambda[s] = 0.0
-            self.RhoCp[s] = 0.0
+            self._placer(s, "AIR", self._zone_air_par_defaut())
             self.T[s] = self.params.T_interieur_init
 
         elif props["type"] == "LIMITE_FIXE":
-            self.Alpha[s] = 0.0
-            self.Lambda[s] = 0.0
-            self.RhoCp[s] = 0.0
+            self._placer(s, nom_materiau)
 
             if T_override_K is not None:
                 self.T[s] = T_override_K
@@ -224,15 +507,149 @@ class ModeleMaison:
                 self.T[s] = self.params.T_exterieur_init
 
         elif props["type"] == "SOLIDE":
-            self.Alpha[s] = props["alpha"]
-            self.Lambda[s] = props["lambda"]
-            self.RhoCp[s] = props["rho"] * props["cp"]
+            self._placer(s, nom_materiau)
 
             if T_override_K is not None:
                 self.T[s] = T_override_K
             else:
                 self.T[s] = self.params.T_interieur_init
 
+    MELANGES = ("oriente", "serie", "parallele")
+
+    def _construire_fractions(self, p1_m, p2_m, nom_materiau, T_override_K, melange):
+        """construire_volume_metres(fractions=True): fractions volumiques par voxel."""
+        if nom_materiau not in MATERIAUX:
+            self.logger.error(f"Matériau '{nom_materiau}' inconnu. Ignoré.")
+            return
+        if melange not in self.MELANGES:
+            self.logger.error(f"Mélange '{melange}' inconnu. Choix: {self.MELANGES}")
+            raise ValueError("Règle de mélange inconnue.")
+
+        # Fraction couverte par axe: recouvrement [min, max] ∩ [face_i, face_i+1] / largeur
+        tranches, fractions_axes = [], []
+        for axe, (a, b) in enumerate(zip(p1_m, p2_m)):
+            faces = self.params.faces_m(axe)
+            f = np.clip(np.minimum(max(a, b), faces[1:]) - np.maximum(min(a, b), faces[:-1]), 0.0, None)
+            f /= np.diff(faces)
+            couverts = np.nonzero(f > 1e-9)[0]
+            if couverts.size == 0:
+                return
+            tranches.append(slice(couverts[0], couverts[-1] + 1))
+            fractions_axes.append(np.minimum(f[couverts[0]:couverts[-1] + 1], 1.0))
+        s = tuple(tranches)
+        fraction = fractions_axes[0][:, None, None] * fractions_axes[1][None, :, None] * fractions_axes[2][None, None, :]
+        self.logger.info(f"Volume {s} rempli avec '{nom_materiau}' (fractions, "
+                         f"{np.count_nonzero(fraction < 1 - 1e-9)} voxels partiels).")
+
+        props = MATERIAUX[nom_materiau]
+        id_zone = self._zone_air_par_defaut() if props["type"] == "AIR" else None
+        if props["type"] == "SOLIDE":
+            T_nouveau = self.params.T_interieur_init if T_override_K is None else T_override_K
+        elif props["type"] == "LIMITE_FIXE":
+            T_nouveau = self.params.T_exterieur_init if T_override_K is None else T_override_K
+        else:
+            T_nouveau = self.params.T_interieur_init
+
+        indice_nouveau = self.indice_materiau(nom_materiau, id_zone)
+        types_existants = np.array([entree["type"] for entree in self.table_materiaux])[self.Materiau[s]]
+        pleins = fraction >= 1 - 1e-9
+        if props["type"] == "SOLIDE":
+            partiels = ~pleins & (types_existants == "SOLIDE") & (self.Materiau[s] != indice_nouveau)
+            remplaces = pleins | (~partiels & (fraction >= 0.5))
+        else:
+            partiels = np.zeros_like(pleins)
+            remplaces = fraction >= 0.5
+
+        bloc = self.Materiau[s]
+        # Mélanges: un par (matériau existant, fractions par axe arrondies au millième)
+        if np.any(partiels):
+            f_axes = [np.round(np.broadcast_to(f.reshape([-1 if a == axe else 1 for a in range(3)]),
+                                               fraction.shape)[partiels], 3) * 1000
+                      for axe, f in enumerate(fractions_axes)]
+            couples, inverse = np.unique(np.stack([bloc[partiels].astype(np.int64)] + f_axes, axis=1),
+                                         axis=0, return_inverse=True)
+            indices = np.array([self._melanger(int(m), indice_nouveau, (fx / 1000, fy / 1000, fz / 1000), melange)
+                                for m, fx, fy, fz in couples])
+            bloc = self.Materiau[s]  # La grille a pu passer en uint16
+            bloc[partiels] = indices[inverse.reshape(-1)]
+        bloc[remplaces] = indice_nouveau
+        self.Materiau[s] = bloc
+        T_bloc = self.T[s]
+        T_bloc[remplaces | (partiels & (fraction >= 0.5))] = T_nouveau
+        self.T[s] = T_bloc
+        self._cache = {}
+
+    def _melanger(self, indice_existant, indice_nouveau, fractions_axes, melange):
+        """
+        Entrée de table d'un voxel solide dont le nouveau solide couvre une
+        sous-boîte de fractions (f_x, f_y, f_z) (fraction volumique f = f_x·f_y·f_z).
+
+        ρ·cp: moyenne volumique (exacte). λ:
+        - "oriente": par axe d, colonne traversant la sous-boîte (section
+          A = produit des deux autres fractions) en série avec le reste du
+          voxel selon d, en parallèle avec la section hors sous-boîte:
+          λ_d = (1 - A)·λ_e + A / ((1 - f_d)/λ_e + f_d/λ_n). Une couche
+          coupée par une face de voxel est en série à travers la couche
+          (résistance de la paroi conservée) et en parallèle le long.
+          "lambda" (isotrope, pour les calculs sans direction) est la
+          moyenne des trois axes.
+        - "serie" (1/λ = Σ f/λ) ou "parallele" (λ = Σ f·λ): même λ sur les trois axes.
+        """
+        existant, nouveau = self.table_materiaux[indice_existant], self.table_materiaux[indice_nouveau]
+        fraction = float(np.prod(fractions_axes))
+        rho_cp = (1 - fraction) * existant["rho_cp"] + fraction * nouveau["rho_cp"]
+        entree = {"type": "SOLIDE", "rho_cp": rho_cp, "id_zone": None}
+        if melange == "oriente":
+            lam_e = existant.get("lambda_axes", (existant["lambda"],) * 3)
+            lam_n = nouveau.get("lambda_axes", (nouveau["lambda"],) * 3)
+            lambda_axes = []
+            for axe, f in enumerate(fractions_axes):
+                A = float(np.prod([fractions_axes[autre] for autre in range(3) if autre != axe]))
+                lambda_axes.append((1 - A) * lam_e[axe] + A / ((1 - f) / lam_e[axe] + f / lam_n[axe]))
+            entree["lambda_axes"] = lambda_axes
+            lam = float(np.mean(lambda_axes))
+            nom = f"{existant['nom']}/{nouveau['nom']}@" + "x".join(f"{f:.3f}" for f in fractions_axes)
+        elif melange == "serie":
+            lam = 1.0 / ((1 - fraction) / existant["lambda"] + fraction / nouveau["lambda"])
+            nom = f"{existant['nom']}+{nouveau['nom']}@{fraction:.3f}"
+        else:
+            lam = (1 - fraction) * existant["lambda"] + fraction * nouveau["lambda"]
+            nom = f"{existant['nom']}|{nouveau['nom']}@{fraction:.3f}"
+        indice = self._index_table.get((nom, None))
+        if indice is not None:
+            return indice
+        entree.update({"nom": nom, "alpha": lam / rho_cp, "lambda": lam})
+        return self._ajouter_entree((nom, None), entree)
+
+    def ajouter_paroi(self, nom, couches, aire_m2, cote_a, cote_b, ds_max=0.01):
+        """
+        Ajoute une paroi multicouche 1D hors grille (voir paroi_multicouche).
+
+        Une extrémité "voxels" peut être donnée par une boîte en mètres:
+        {"type": "voxels", "p1_m": (...), "p2_m": (...)} (voxels solides de la boîte).
+
+        Returns:
+            ParoiMulticouche
+        """
+        extremites = []
+        for cote in (cote_a, cote_b):
+            cote = dict(cote)
+            if cote.get("type") == "voxels" and "indices" not in cote:
+                p1_m, p2_m = cote.pop("p1_m"), cote.pop("p2_m")
+                s = tuple(slice(self._coord_m_vers_idx(min(a, b), axe), self._coord_m_vers_idx(max(a, b), axe) + 1)
+                          for axe, (a, b) in enumerate(zip(p1_m, p2_m)))
+                indices = np.nonzero(self.Alpha[s] > 0)
+                cote["indices"] = tuple(idx + tranche.start for idx, tranche in zip(indices, s))
+            elif cote.get("type") == "zone" and cote.get("id_zone") not in self.zones_air:
+                self.logger.error(f"Paroi '{nom}': zone d'air {cote.get('id_zone')} inexistante.")
+                raise ValueError("Zone d'air de la paroi inexistante.")
+            extremites.append(cote)
+
+        paroi = ParoiMulticouche(nom, couches, aire_m2, extremites[0], extremites[1], self.logger,
+                                 ds_max=ds_max, T_init=self.params.T_interieur_init)
+        self.parois.append(paroi)
+        return paroi
+
     def construire_depuis_plans_ascii(self, plans_definition_str, mappage_ascii):
         """Construit le modèle 3D en "extrudant" des plans 2D (dessinés en ASCII)."""
         self.logger.info("Construction du modèle à partir de plans ASCII...")
@@ -304,8 +721,8 @@ class ModeleMaison:
                                   f"Attendu: {dims_plan_attendues}, Reçu: {plan.shape}. Ignoré.")
                 continue
 
-            k1 = self._coord_m_vers_idx(z_min_m)
-            k2 = self._coord_m_vers_idx(z_max_m)
+            k1 = self._coord_m_vers_idx(z_min_m, 2)
+            k2 = self._coord_m_vers_idx(z_max_m, 2)
             k1 = max(0, k1);
             k2 = min(self.params.N_z, k2)
 
@@ -327,28 +744,14 @@ class ModeleMaison:
                 s = (indices_x, indices_y, slice_z)
 
                 if props["type"] == "AIR":
-                    id_zone = -1
-                    if id_zone not in self.zones_air:
-                        self.zones_air[id_zone] = ZoneAir(
-                            f"{id_zone}", self.logger, self.params.T_interieur_init
-                        )
-                    volume_bloc_m3 = indices_x.size * (k2 - k1) * (self.params.ds ** 3)
-                    self.zones_air[id_zone].volume_m3 += volume_bloc_m3
-                    self.Alpha[s] = id_zone
-                    self.Lambda[s] = 0.0
-                    self.RhoCp[s] = 0.0
+                    self._placer(s, "AIR", self._zone_air_par_defaut())
                     self.T[s] = self.params.T_interieur_init
 
                 elif props["type"] == "LIMITE_FIXE":
-                    self.Alpha[s] = 0.0
-                    self.Lambda[s] = 0.0
-                    self.RhoCp[s] = 0.0
-                    pass
+                    self._placer(s, nom_materiau)
 
                 elif props["type"] == "SOLIDE":
-                    self.Alpha[s] = props["alpha"]
-                    self.Lambda[s] = props["lambda"]
-                    self.RhoCp[s] = props["rho"] * props["cp"]
+                    self._placer(s, nom_materiau)
                     if nom_materiau == "TERRE":
                         self.T[s] = self.params.T_sol_init
                     else:
@@ -357,36 +760,325 @@ class ModeleMaison:
     def preparer_simulation(self):
         """Finalise le modèle avant de lancer la simulation."""
         self.logger.info("Préparation de la simulation...")
+        # Une zone d'air par volume d'air connexe, volumes mesurés sur la grille
+        self._etiqueter_zones_air()
+
         # Finaliser la capacité thermique des zones d'air
         for zone in self.zones_air.values():
             zone.finaliser_capacite()
 
         # Détecter toutes les surfaces de convection
         self._detecter_surfaces_convection()
+        self.tables_surfaces()  # Tables plates de la convection, calculées une fois
+        self.etat_zones()
+        self.liberer_proprietes()
+
+    def _etiqueter_zones_air(self):
+        """
+        Étiquetage des volumes d'air connexes (voisins par une face,
+        scipy.ndimage.label) et correspondance avec les zones d'air:
+        - une zone répartie sur plusieurs volumes garde son id pour le plus
+          grand; les autres volumes deviennent de nouvelles zones (même
+          température, puissance répartie au prorata du volume);
+        - un volume contenant plusieurs zones va à sa zone majoritaire
+          (température moyenne pondérée par le volume, puissances
+          additionnées); les zones absorbées disparaissent.
+        Le volume de chaque zone est mesuré sur la grille. Une passe sur la
+        grille, mémoire indépendante du nombre de zones.
+        """
+        A = self.Alpha
+        etiquettes, nb_volumes = ndimage.label(A < 0)
+        air = np.flatnonzero(etiquettes)
+        volume = etiquettes.reshape(-1)[air] - 1
+        del etiquettes
+        volumes_voxels = (np.full(air.size, self.params.ds ** 3) if self.params.uniforme
+                          else self.params.volumes_m3().reshape(-1)[air])
+
+        # Volume de chaque couple (volume connexe, zone d'origine)
+        couples, inverse = np.unique(np.stack([volume, A.reshape(-1)[air].astype(np.int64)], axis=1),
+                                     axis=0, return_inverse=True)
+        volumes_couples = np.bincount(inverse.reshape(-1), volumes_voxels, minlength=len(couples))
+        volumes_m3 = np.bincount(couples[:, 0], volumes_couples, minlength=nb_volumes)
+        origines = [[] for _ in range(nb_volumes)]  # (id d'origine, volume) par volume connexe
+        for (v, id_zone), volume_m3 in zip(couples.tolist(), volumes_couples.tolist()):
+            origines[v].append((id_zone, volume_m3))
+        volume_origine = {}
+        for id_zone, volume_m3 in zip(couples[:, 1].tolist(), volumes_couples.tolist()):
+            volume_origine[id_zone] = volume_origine.get(id_zone, 0.0) + volume_m3
+
+        # Zone de chaque volume: sa zone majoritaire, nouvel id sauf pour le plus grand volume de la zone
+        id_libre = min(list(self.zones_air) + list(volume_origine) + [0]) - 1
+        ids_finaux = np.empty(nb_volumes, dtype=np.int64)
+        deja_pris = set()
+        for v in sorted(range(nb_volumes), key=lambda v: -volumes_m3[v]):
+            majoritaire = max(origines[v], key=lambda origine: origine[1])[0]
+            if majoritaire in deja_pris:
+                ids_finaux[v] = id_libre
+                id_libre -= 1
+            else:
+                ids_finaux[v] = majoritaire
+                deja_pris.add(majoritaire)
+
+        T_origine = {id_zone: self.zones_air[id_zone].T if id_zone in self.zones_air else self.params.T_interieur_init
+                     for id_zone in volume_origine}
+        P_origine = {id_zone: self.zones_air[id_zone].puissance_apport_W if id_zone in self.zones_air else 0.0
+                     for id_zone in volume_origine}
+        zones = {id_zone: zone for id_zone, zone in self.zones_air.items()
+                 if id_zone in deja_pris or id_zone not in volume_origine}
+        absorbees, nb_parties = {}, {}
+        for v in np.argsort(-ids_finaux, kind="stable").tolist():
+            id_final = int(ids_finaux[v])
+            if id_final not in zones:
+                principale = max(origines[v], key=lambda origine: origine[1])[0]
+                nom_source = self.zones_air[principale].nom if principale in self.zones_air else f"{principale}"
+                nb_parties[principale] = nb_parties.get(principale, 1) + 1
+                nom = f"{id_final}" if nom_source == f"{principale}" else f"{nom_source}_{nb_parties[principale]}"
+                zones[id_final] = ZoneAir(nom, self.logger, T_origine[principale])
+                self.logger.info(f"Zone '{nom_source}': volume d'air disjoint -> nouvelle zone '{nom}'.")
+            zone = zones[id_final]
+            zone.volume_m3 = float(volumes_m3[v])
+            if len(origines[v]) > 1:
+                zone.T = sum(T_origine[id_zone] * vol for id_zone, vol in origines[v]) / volumes_m3[v]
+                for id_zone, _ in origines[v]:
+                    if id_zone != id_final:
+                        self.logger.warn(f"Zones d'air {id_zone} et {id_final} connexes: fusionnées dans {id_final}.")
+                        if id_zone not in deja_pris:
+                            absorbees[id_zone] = id_final
+            zone.puissance_apport_W = sum(P_origine[id_zone] * (vol / volume_origine[id_zone])
+                                          for id_zone, vol in origines[v])
+        for id_zone, zone in zones.items():
+            if id_zone not in volume_origine and id_zone not in ids_finaux:
+                zone.volume_m3 = 0.0
+        self.zones_air = zones
+
+        # Parois couplées à une zone absorbée: couplées à la zone qui l'a absorbée
+        for paroi in self.parois:
+            paroi.cotes = tuple(dict(cote, id_zone=absorbees.get(cote.get("id_zone"), cote.get("id_zone")))
+                                if cote["type"] == "zone" else cote for cote in paroi.cotes)
+
+        # Grille des matériaux réétiquetée si des voxels changent de zone
+        if np.any(couples[:, 1] != ids_finaux[couples[:, 0]]):
+            indices = np.array([self.indice_materiau("AIR", int(id_zone)) for id_zone in ids_finaux])
+            self.Materiau[np.unravel_index(air, self.Materiau.shape)] = indices[volume]
+            self._cache = {}
+        self.logger.info(f"Zones d'air: {nb_volumes} volumes connexes, {len(self.zones_air)} zones.")
+
+    def recadrer(self):
+        """
+        Copie du modèle restreinte à la boîte englobante des voxels non fixes
+        (solides et air), plus une couche de voxels fixes autour: ces voxels
+        portent les températures imposées des faces de bord.
+
+        Les zones d'air et les paramètres sont partagés avec le modèle complet
+        (paramètres copiés, coordonnées recadrées, sur grille non uniforme).
+
+        Returns:
+            (modele_recadre, boite): boite = tuple de slices dans la grille complète
+        """
+        actifs = np.nonzero(self.Alpha != 0)
+        if actifs[0].size == 0:
+            boite = tuple(slice(0, n) for n in self.Materiau.shape)
+        else:
+            boite = tuple(slice(max(int(idx.min()) - 1, 0), min(int(idx.max()) + 2, n))
+                          for idx, n in zip(actifs, self.Materiau.shape))
+        recadre = self.extraire(boite)
+        self.logger.info(f"Recadrage: grille {self.Materiau.shape} -> {recadre.Materiau.shape} "
+                         f"({100.0 * recadre.Materiau.size / max(self.Materiau.size, 1):.1f}% des voxels)")
+        return recadre, boite
+
+    def extraire(self, boite):
+        """
+        Copie du modèle restreinte à une boîte (tuple de slices). Zones d'air
+        partagées, indices des surfaces et des parois décalés (supposés dans
+        la boîte), coordonnées recadrées sur grille non uniforme.
+        """
+        origine = tuple(s.start for s in boite)
+
+        recadre = copy.copy(self)
+        recadre.T = self.T[boite].copy()
+        if not self.params.uniforme:
+            # Grille non uniforme: coordonnées de la boîte (valeurs inchangées: mêmes pas au bit près)
+            recadre.params = copy.copy(self.params)
+            recadre.params.coords_m = tuple(c[b] for c, b in zip(self.params.coords_m, boite))
+            recadre.params.N_x, recadre.params.N_y, recadre.params.N_z = (b.stop - b.start for b in boite)
+        recadre.Materiau = self.Materiau[boite].copy()
+        recadre._cache = {}
+        recadre.table_materiaux = list(self.table_materiaux)
+        recadre._index_table = dict(self._index_table)
+        recadre.surfaces_convection_idx = {
+            id_zone: tuple(idx - o for idx, o in zip(indices_tuple, origine))
+            for id_zone, indices_tuple in self.surfaces_convection_idx.items()
+        }
+        recadre.parois = []
+        for paroi in self.parois:
+            # Copie de surface: les températures des mailles restent partagées
+            copie = copy.copy(paroi)
+            copie.cotes = tuple(dict(cote, indices=tuple(idx - o for idx, o in zip(cote["indices"], origine)))
+                                if cote["type"] == "voxels" else cote for cote in paroi.cotes)
+            recadre.parois.append(copie)
+        return recadre
+
+    def en_precision(self, dtype):
+        """
+        Copie du modèle dont les tableaux du stencil (T, Alpha) sont dans le
+        type dtype (ex: np.float32). RhoCp et Lambda (bilans d'énergie,
+        pertes) restent en float64. Zones d'air, paramètres et grille des
+        matériaux partagés.
+        """
+        converti = copy.copy(self)
+        converti.T = self.T.astype(dtype)
+        converti.dtype_alpha = dtype
+        converti._cache = {}
+        converti.table_materiaux = list(self.table_materiaux)
+        converti._index_table = dict(self._index_table)
+        return converti
 
     def _detecter_surfaces_convection(self):
         """
         Scan (en NumPy) la grille Alpha pour trouver les interfaces
-        entre 'AIR' (val < 0) et 'SOLIDE' (val >= 0).
-        Stocke les *indices des solides* en contact.
+        entre 'AIR' (val < 0) et 'SOLIDE' (val > 0), toutes zones en une
+        passe (six décalages de la grille): mémoire indépendante du nombre
+        de zones. Stocke par zone les *indices des solides* en contact
+        (ordre de la grille).
         """
         self.logger.info("Détection des surfaces de convection (NumPy)...")
+        self._cache.pop("surfaces", None)
+        ids_zones = sorted(self.zones_air)
+        if not ids_zones:
+            return
+        A = self.Alpha
+        ids_tries = np.array(ids_zones, dtype=np.float64)
+        masque_solide = A > 0  # SOLIDES (pas LIMITE_FIXE)
+        masque_air = A < 0
+
+        # Clés (rang de la zone, indice plat du solide) des contacts dans les six directions
+        cles = []
+        for axe in range(3):
+            bas, haut = [slice(None)] * 3, [slice(None)] * 3
+            bas[axe], haut[axe] = slice(0, -1), slice(1, None)
+            for cote_solide, cote_air, decalage in ((bas, haut, 0), (haut, bas, 1)):
+                contact = masque_solide[tuple(cote_solide)] & masque_air[tuple(cote_air)]
+                ids = A[tuple(cote_air)][contact]
+                idx = list(np.nonzero(contact))
+                idx[axe] += decalage
+                rang = np.minimum(np.searchsorted(ids_tries, ids), ids_tries.size - 1)
+                connue = ids_tries[rang] == ids
+                cles.append(rang[connue] * A.size + np.ravel_multi_index(idx, A.shape)[connue])
+        cles = np.unique(np.concatenate(cles))
+        bornes = np.searchsorted(cles // A.size, np.arange(len(ids_zones) + 1))
+
+        for rang, id_zone in enumerate(ids_zones):
+            indices_tuple = np.unravel_index(cles[bornes[rang]:bornes[rang + 1]] % A.size, A.shape)
+            self.surfaces_convection_idx[id_zone] = indices_tuple
+            self.logger.debug(f"Zone {self.zones_air[id_zone].nom}: {indices_tuple[0].size} cellules de surface.")
+        self.logger.info(f"Détection terminée: {cles.size} cellules de surface pour {len(ids_zones)} zones.")
 
-        for id_zone, zone in self.zones_air.items():
-            masque_air = (self.Alpha == id_zone)
-            masque_solide = (self.Alpha > 0)  # SOLIDES (pas LIMITE_FIXE)
-
-            surfaces = np.zeros_like(self.Alpha, dtype=bool)
+    def etat_zones(self):
+        """
+        État des zones d'air en tableaux contigus (EtatZones, ordre de
+        zones_air), les ZoneAir en étant des vues. Regroupé à nouveau si
+        zones_air a changé.
+        """
+        etat = getattr(self, "_etat_zones", None)
+        if etat is None or not etat.est_regroupement(self.zones_air):
+            etat = EtatZones.regrouper(self.zones_air)
+            self._etat_zones = etat
+        return etat
 
-            surfaces[1:, :, :] |= (masque_solide[1:, :, :] & masque_air[:-1, :, :])
-            surfaces[:-1, :, :] |= (masque_solide[:-1, :, :] & masque_air[1:, :, :])
-            surfaces[:, 1:, :] |= (masque_solide[:, 1:, :] & masque_air[:, :-1, :])
-            surfaces[:, :-1, :] |= (masque_solide[:, :-1, :] & masque_air[:, 1:, :])
-            surfaces[:, :, 1:] |= (masque_solide[:, :, 1:] & masque_air[:, :, :-1])
-            surfaces[:, :, :-1] |= (masque_solide[:, :, :-1] & masque_air[:, :, 1:])
+    def tables_surfaces(self):
+        """
+        Surfaces de convection de toutes les zones en tableaux plats (une
+        entrée par couple voxel-zone, zones contiguës dans l'ordre de
+        zones_air), mises en cache:
+        - ids_zones: ids des zones; zone: position de la zone de chaque entrée
+        - indices: indice plat du voxel; surfaces: indices plats uniques,
+          position: rang du voxel de l'entrée dans surfaces
+        - rangs: [(entrées, positions)] par rang d'apparition du voxel (un
+          voxel au contact de plusieurs zones a plusieurs entrées); au rang
+          0, positions = tous les voxels de surfaces, dans l'ordre
+        - aires: aire d'échange (m²); inv_capacites: 1/(ρ·cp·V) (0 si ρ·cp nul)
+        - aires_zones: aire totale par zone (m²)
+        """
+        tables = self._cache.get("surfaces")
+        if tables is not None:
+            return tables
+
+        ids_zones = list(self.zones_air)
+        vide = (np.empty(0, dtype=np.intp),) * 3
+        volumes_grille = None if self.params.uniforme else self.params.volumes_m3()
+        zone, indices, aires, volumes = [], [], [], []
+        for position, id_zone in enumerate(ids_zones):
+            indices_tuple = self.surfaces_convection_idx.get(id_zone, vide)
+            nb = indices_tuple[0].size
+            zone.append(np.full(nb, position, dtype=np.intp))
+            indices.append(np.ravel_multi_index(indices_tuple, self.Materiau.shape).astype(np.intp))
+            if self.params.uniforme:
+                aires.append(np.full(nb, self.params.ds ** 2))
+                volumes.append(np.full(nb, self.params.ds ** 3))
+            else:
+                aires.append(self.aires_surfaces(indices_tuple, id_zone))
+                volumes.append(volumes_grille[indices_tuple])
 
-            indices_tuple = np.where(surfaces)
-            self.surfaces_convection_idx[id_zone] = indices_tuple
+        zone = np.concatenate([np.empty(0, dtype=np.intp)] + zone)
+        indices = np.concatenate([np.empty(0, dtype=np.intp)] + indices)
+        aires = np.concatenate([np.empty(0)] + aires)
+        capacites = self.RhoCp.reshape(-1)[indices] * np.concatenate([np.empty(0)] + volumes)
+        tables = self.construire_tables_surfaces(ids_zones, zone, indices, aires, capacites)
+        self._cache["surfaces"] = tables
+        return tables
 
-            nb_surfaces = len(indices_tuple[0])
-            self.logger.info(f"Détection terminée: {nb_surfaces} cellules de surface trouvées pour Zone {zone.nom}.")
+    @staticmethod
+    def construire_tables_surfaces(ids_zones, zone, indices, aires, capacites):
+        """
+        Tables plates de la convection (format de tables_surfaces) à partir
+        des entrées couple surface-zone: position de la zone, indice plat de
+        la surface (voxel ou cellule), aire (m²) et capacité (J/K).
+        """
+        surfaces, position = np.unique(indices, return_inverse=True)
+        # Rang de chaque entrée parmi celles de son voxel (dans l'ordre des entrées):
+        # au rang r, chaque voxel apparaît au plus une fois (écriture sans conflit)
+        ordre = np.argsort(position, kind="stable")
+        debuts = np.searchsorted(position[ordre], np.arange(surfaces.size))
+        rang = np.empty(indices.size, dtype=np.intp)
+        rang[ordre] = np.arange(indices.size) - debuts[position[ordre]]
+        rangs = []
+        for r in range(int(rang.max(initial=-1)) + 1):
+            entrees = np.flatnonzero(rang == r)
+            entrees = entrees[np.argsort(position[entrees], kind="stable")].astype(np.intp)
+            rangs.append((entrees, position[entrees].astype(np.intp)))
+        tables = {
+            "ids_zones": ids_zones,
+            "zone": zone,
+            "indices": indices,
+            "surfaces": surfaces.astype(np.intp),
+            "position": position.astype(np.intp),
+            "rangs": rangs,
+            "aires": aires,
+            "inv_capacites": np.divide(1.0, capacites, out=np.zeros_like(capacites), where=capacites != 0),
+            "aires_zones": np.bincount(zone, aires, minlength=len(ids_zones)),
+        }
+        return tables
+
+    def aires_surfaces(self, indices_tuple, id_zone=None):
+        """
+        Aire d'échange (m²) de chaque voxel de surface en grille non
+        uniforme: somme des aires de ses faces au contact de l'air (de la
+        zone id_zone, ou de toute zone si None). Un voxel d'angle échange
+        par ses deux faces, chacune avec sa propre aire.
+        """
+        A = self.Alpha
+        forme = A.shape
+        largeurs = [self.params.largeurs_m(axe) for axe in range(3)]
+        aires = np.zeros(indices_tuple[0].size)
+        for axe in range(3):
+            autres = [a for a in range(3) if a != axe]
+            aire_face = largeurs[autres[0]][indices_tuple[autres[0]]] * largeurs[autres[1]][indices_tuple[autres[1]]]
+            for sens in (-1, 1):
+                voisin = list(indices_tuple)
+                voisin[axe] = indices_tuple[axe] + sens
+                valide = (voisin[axe] >= 0) & (voisin[axe] < forme[axe])
+                voisin[axe] = np.clip(voisin[axe], 0, forme[axe] - 1)
+                alpha_voisin = A[tuple(voisin)]
+                contact = valide & ((alpha_voisin == id_zone) if id_zone is not None else (alpha_voisin < 0))
+                aires += np.where(contact, aire_face, 0.0)
+        return aires
@@ -0,0 +1,141 @@
+"""
+Module MULTIGRILLE GÉOMÉTRIQUE pour la grille voxel.
+
+Hiérarchie construite directement à partir de la géométrie du modèle:
+- Niveau fin: les inconnues de OperateurThermique (voxels solides + nœuds d'air)
+- Grossissement: chaque agrégat regroupe les voxels d'un même bloc 2x2x2
+  ET d'un même matériau (les interfaces entre matériaux ne sont jamais
+  moyennées). Les LIMITE_FIXE ne sont pas des inconnues: elles restent des
+  conditions de Dirichlet à tous les niveaux. Les nœuds d'air restent des
+  agrégats à part.
+- Prolongation par agrégation (constante par agrégat): P
+- Opérateurs grossiers de Galerkin: A_c = Pᵀ·A·P (somme des conductances
+  entre agrégats: reste une M-matrice). K n'est pas symétrique (conductance
+  "de la cellule" λ_i·ds), d'où l'agrégation non lissée, plus robuste.
+- Lisseur: Jacobi amorti; niveau le plus grossier: factorisation LU
+
+Utilisable comme solveur autonome (cycles en V) ou comme préconditionneur
+(un cycle en V) d'un solveur de Krylov. Le nombre d'itérations reste à peu
+près constant quand ds diminue, contrairement à Jacobi.
+"""
+
+import numpy as np
+import scipy.sparse as sp
+import scipy.sparse.linalg as spla
+
+
+class MultigrilleGeometrique:
+    """Hiérarchie multigrille (agrégation par blocs 2x2x2 et par matériau)."""
+
+    def __init__(self, A, coords, materiaux, n_zones, logger,
+                 taille_grossiere=500, niveaux_max=12, nb_lissages=2, omega_lissage=0.7):
+        """
+        Args:
+            A: Matrice du système (n x n, creuse), n = n_solides + n_zones
+            coords: Indices (i, j, k) des voxels solides (n_solides x 3)
+            materiaux: Identifiant de matériau de chaque voxel solide (n_solides)
+            n_zones: Nombre de nœuds d'air (en fin de vecteur)
+            logger: Logger instance
+            taille_grossiere: Taille sous laquelle on résout directement
+            niveaux_max: Nombre maximal de niveaux
+            nb_lissages: Nombre de balayages de Jacobi avant/après correction
+            omega_lissage: Facteur d'amortissement du lisseur
+        """
+        self.logger = logger
+        self.nb_lissages = nb_lissages
+        self.omega_lissage = omega_lissage
+
+        self.A = []        # Opérateurs par niveau
+        self.P = []        # Prolongations niveau l+1 -> l
+        self.diag_inv = []
+
+        A = sp.csr_matrix(A)
+        coords = np.asarray(coords, dtype=np.int64)
+        materiaux = np.asarray(materiaux, dtype=np.int64)
+
+        while True:
+            self.A.append(A)
+            self.diag_inv.append(1.0 / A.diagonal())
+            n = A.shape[0]
+            if n <= taille_grossiere or len(self.A) >= niveaux_max or coords.shape[0] == 0:
+                break
+
+            P0, coords_c, materiaux_c = self._agreger(coords, materiaux, n_zones)
+            if P0.shape[1] >= n:
+                break  # Plus rien à regrouper
+
+            self.P.append(P0)
+            A = sp.csr_matrix(P0.T @ A @ P0)
+            coords, materiaux = coords_c, materiaux_c
+
+        self._lu_grossier = spla.splu(sp.csc_matrix(self.A[-1]))
+
+        tailles = " -> ".join(str(a.shape[0]) for a in self.A)
+        self.logger.info(f"Multigrille: {len(self.A)} niveaux ({tailles} inconnues)")
+
+    @staticmethod
+    def _agreger(coords, materiaux, n_zones):
+        """Agrège les voxels par bloc 2x2x2 et par matériau. Renvoie (P, coords, matériaux)."""
+        coords_c = coords // 2
+        cles = np.column_stack([coords_c, materiaux])
+        cles_uniques, agregat = np.unique(cles, axis=0, return_inverse=True)
+        agregat = agregat.ravel()
+        n_agregats = cles_uniques.shape[0]
+
+        # Les nœuds d'air restent des agrégats individuels
+        lignes = np.arange(coords.shape[0] + n_zones)
+        colonnes = np.concatenate([agregat, n_agregats + np.arange(n_zones)])
+        P0 = sp.csr_matrix((np.ones(lignes.size), (lignes, colonnes)),
+                           shape=(lignes.size, n_agregats + n_zones))
+        return P0, cles_uniques[:, :3], cles_uniques[:, 3]
+
+    @classmethod
+    def depuis_operateur(cls, operateur, A, logger, **options):
+        """Construit la hiérarchie pour la matrice A d'un OperateurThermique."""
+        coords = np.column_stack(np.unravel_index(operateur.indices_solides, operateur.forme))
+        Alpha_solides = operateur.modele.Alpha.reshape(-1)[operateur.indices_solides]
+        _, materiaux = np.unique(Alpha_solides, return_inverse=True)
+        return cls(A, coords, materiaux.ravel(), operateur.n_zones, logger, **options)
+
+    def _lisser(self, niveau, x, b):
+        A = self.A[niveau]
+        D_inv = self.diag_inv[niveau]
+        for _ in range(self.nb_lissages):
+            x += self.omega_lissage * D_inv * (b - A @ x)
+        return x
+
+    def cycle_v(self, b, x=None, niveau=0):
+        """Un cycle en V pour A·x = b (x=None: départ de zéro)."""
+        if niveau == len(self.A) - 1:
+            return self._lu_grossier.solve(b)
+
+        if x is None:
+            x = np.zeros(b.shape)
+        x = self._lisser(niveau, x, b)
+
+        residu = b - self.A[niveau] @ x
+        P = self.P[niveau]
+        x += P @ self.cycle_v(P.T @ residu, niveau=niveau + 1)
+
+        return self._lisser(niveau, x, b)
+
+    def preconditionneur(self):
+        """Un cycle en V, sous forme de LinearOperator (pour un solveur de Krylov)."""
+        return spla.LinearOperator(self.A[0].shape, dtype=np.float64,
+                                   matvec=lambda v: self.cycle_v(np.asarray(v, dtype=np.float64).ravel()))
+
+    def resoudre(self, b, x0=None, tolerance=1e-10, iterations_max=200):
+        """
+        Solveur autonome: cycles en V jusqu'à ||b - A·x|| <= tolerance·||b||.
+
+        Returns:
+            (x, nb_cycles)
+        """
+        x = np.zeros_like(b) if x0 is None else np.array(x0, dtype=np.float64)
+        norme_b = max(np.linalg.norm(b), 1e-300)
+        for cycle in range(1, iterations_max + 1):
+            x = self.cycle_v(b, x)
+            if np.linalg.norm(b - self.A[0] @ x) <= tolerance * norme_b:
+                return x, cycle
+        self.logger.warn(f"Multigrille: non convergé après {iterations_max} cycles.")
+        return x, iterations_max
@@ -0,0 +1,88 @@
+"""
+Noyau de CONDUCTION CREUX (voxels actifs uniquement).
+
+Au lieu de calculer un laplacien sur toute la grille puis de masquer,
+on construit UNE FOIS la liste des voxels solides intérieurs (indices
+"plats" dans la grille) et les indices de leurs 6 voisins. Chaque pas
+ne touche alors que ces entrées.
+
+Les opérations sont faites dans le MÊME ORDRE que le schéma FTCS de
+référence (Simulation._etape_conduction), le résultat est donc
+identique bit à bit:
+
+  lap = T(y+1) + T(y-1) + T(x+1) + T(x-1) + T(z+1) + T(z-1) - 6·T
+  T_new = T + (α·dt/ds²)·lap
+"""
+
+import numpy as np
+
+
+class NoyauConductionCreux:
+    """Conduction FTCS restreinte aux voxels solides intérieurs."""
+
+    def __init__(self, Alpha, masque_solide, ds, dt, logger, journaliser=True):
+        """
+        Args:
+            Alpha: Diffusivité (3D array), > 0 pour les solides
+            masque_solide: Masque des voxels calculés par conduction
+            ds: Discrétisation spatiale (m)
+            dt: Pas de temps (s)
+            logger: Logger instance
+            journaliser: Résumé au niveau INFO (False pour les sous-domaines)
+        """
+        self.logger = logger
+        self.forme = Alpha.shape
+        self.ds = ds
+
+        N_x, N_y, N_z = self.forme
+        pas_x = N_y * N_z
+        pas_y = N_z
+
+        # Seuls les solides intérieurs sont mis à jour (comme la référence)
+        interieur = np.zeros(self.forme, dtype=bool)
+        interieur[1:-1, 1:-1, 1:-1] = masque_solide[1:-1, 1:-1, 1:-1]
+        self.indices = np.flatnonzero(interieur).astype(np.intp)
+
+        # Ordre des voisins = ordre des termes du laplacien de référence
+        decalages = (pas_y, -pas_y, pas_x, -pas_x, 1, -1)
+        self.voisins = [self.indices + d for d in decalages]
+
+        self.alpha_actif = Alpha.reshape(-1)[self.indices]
+        self.coeff = None
+        self.mettre_a_jour_dt(dt)
+
+        # Tampons de travail (évite les temporaires à chaque pas)
+        n = self.indices.size
+        self._T_centre = np.empty(n, dtype=Alpha.dtype)
+        self._lap = np.empty(n, dtype=Alpha.dtype)
+        self._tmp = np.empty(n, dtype=Alpha.dtype)
+
+        (self.logger.info if journaliser else self.logger.debug)(
+            f"Noyau creux: {n} voxels actifs sur {Alpha.size} "
+            f"({100.0 * n / max(Alpha.size, 1):.1f}% de la grille)")
+
+    def mettre_a_jour_dt(self, dt):
+        """Recalcule le coefficient α·dt/ds² (si dt change)."""
+        ds2 = self.ds ** 2
+        self.coeff = self.alpha_actif * dt / ds2
+
+    def avancer(self, T, T_new):
+        """Écrit T(t+dt) dans T_new pour les voxels actifs, à partir de T(t)."""
+        T_plat = T.reshape(-1)
+        lap = self._lap
+        tmp = self._tmp
+        T_centre = self._T_centre
+
+        np.take(T_plat, self.voisins[0], out=lap, mode='clip')
+        for voisins in self.voisins[1:]:
+            np.take(T_plat, voisins, out=tmp, mode='clip')
+            lap += tmp
+
+        np.take(T_plat, self.indices, out=T_centre, mode='clip')
+        np.multiply(T_centre, 6, out=tmp)
+        lap -= tmp
+
+        lap *= self.coeff
+        lap += T_centre
+
+        T_new.reshape(-1)[self.indices] = lap
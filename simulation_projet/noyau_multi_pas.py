@@ -0,0 +1,182 @@
+"""
+Noyau de CONDUCTION MULTI-PAS (pas de temps local par matériau).
+
+Le FTCS global est limité par le solide le plus diffusif (LAINE_VERRE,
+α ≈ 3e-6 m²/s), alors que les murs massifs ou la laine de bois
+(α ≈ 1e-7) supporteraient un dt 20 fois plus grand.
+
+Ici chaque voxel actif reçoit un niveau k: il avance par sous-pas
+dt/2^k, avec k le plus petit niveau tel que dt/2^k respecte SA limite
+de stabilité locale:
+
+  dt_local = C_i / Σ_j G_ij     (C_i = ρ·cp·ds³, G_ij conductances des faces)
+
+Forme FLUX (volumes finis) pour rester conservatif aux interfaces:
+- Face solide-solide: conductance harmonique G = 2·λi·λj/(λi+λj)·ds
+- Face vers une température imposée (limite fixe, voxel d'air, solide
+  de bord): G = λi·ds, comme le schéma de référence
+- Chaque face est évaluée au rythme de son côté le plus rapide; l'énergie
+  G·ΔT·dt_k est ajoutée à un côté et retirée de l'autre (accumulateurs,
+  même G et même ΔT des deux côtés).
+  Un voxel lent applique ce qu'il a reçu à la fin de son propre pas.
+
+Même interface que NoyauConductionCreux: indices, mettre_a_jour_dt, avancer.
+"""
+
+import numpy as np
+
+
+class NoyauConductionMultiPas:
+    """Conduction explicite à pas de temps local (groupes de niveaux 2^k)."""
+
+    def __init__(self, Alpha, Lambda, RhoCp, masque_solide, ds, dt, logger, niveaux_max=8):
+        """
+        Args:
+            Alpha: Diffusivité (3D array), > 0 pour les solides
+            Lambda: Conductivité (3D array, W/m.K), ou suite de 3 grilles
+                    (λ par axe x, y, z, voxels partiellement couverts)
+            RhoCp: Capacité volumique (3D array, J/m³.K)
+            masque_solide: Masque des voxels calculés par conduction
+            ds: Discrétisation spatiale (m)
+            dt: Pas de temps global (s)
+            logger: Logger instance
+            niveaux_max: Nombre max de subdivisions (dt/2^niveaux_max)
+        """
+        self.logger = logger
+        self.forme = Alpha.shape
+        self.ds = ds
+        self.niveaux_max = niveaux_max
+
+        N_x, N_y, N_z = self.forme
+        decalages = (N_y * N_z, -N_y * N_z, N_z, -N_z, 1, -1)
+
+        interieur = np.zeros(self.forme, dtype=bool)
+        interieur[1:-1, 1:-1, 1:-1] = masque_solide[1:-1, 1:-1, 1:-1]
+        self.indices = np.flatnonzero(interieur).astype(np.intp)
+        n = self.indices.size
+
+        numero = np.full(Alpha.size, -1, dtype=np.intp)
+        numero[self.indices] = np.arange(n)
+        if isinstance(Lambda, np.ndarray):
+            Lambda = (Lambda, Lambda, Lambda)
+        lambda_axes = [L.reshape(-1)[self.indices] for L in Lambda]
+        self.C = RhoCp.reshape(-1)[self.indices] * ds ** 3
+
+        # 6 demi-faces par voxel: voisin dans x_ext = [x actifs ; T imposées]
+        # et conductance. Une face actif-actif apparaît des deux côtés avec le
+        # même G: les deux contributions s'annulent exactement (conservatif).
+        self._voisins = np.empty((6, n), dtype=np.intp)
+        self._G = np.empty((6, n), dtype=np.float64)
+        self._voisin_actif = np.empty((6, n), dtype=bool)
+        indices_imposes = []
+        n_imposes = 0
+        for s, d in enumerate(decalages):
+            voisins = self.indices + d
+            j = numero[voisins]
+            actif = (j >= 0)
+            lambda_actif = lambda_axes[s // 2]
+            lam_voisin = lambda_actif[np.where(actif, j, 0)]
+            self._G[s] = np.where(actif, 2.0 * lambda_actif * lam_voisin / (lambda_actif + lam_voisin),
+                                  lambda_actif) * ds
+            nb_imposes = np.count_nonzero(~actif)
+            j[~actif] = n + n_imposes + np.arange(nb_imposes)
+            indices_imposes.append(voisins[~actif])
+            n_imposes += nb_imposes
+            self._voisins[s] = j
+            self._voisin_actif[s] = actif
+        self._indices_imposes = np.concatenate(indices_imposes).astype(np.intp)
+        self._x_ext = np.empty(n + n_imposes, dtype=np.float64)
+        self._accumulateur = np.zeros(n, dtype=np.float64)  # Énergie reçue en attente d'application
+
+        # Pas stable local: dt·ΣG/C <= 1
+        somme_G = self._G.sum(axis=0)
+        self.dt_local = np.divide(self.C, somme_G, out=np.full(n, np.inf), where=somme_G > 0)
+
+        self.dt = None
+        self.niveaux = None
+        self._groupes = []
+        self.mettre_a_jour_dt(dt)
+
+        repartition = ", ".join(f"dt/{2 ** k}: {g['cellules'].size}" for k, g in enumerate(self._groupes))
+        self.logger.info(f"Noyau multi-pas: {n} voxels actifs, pas stable local de "
+                         f"{self.dt_local.min():.0f}s à {self.dt_local.max():.0f}s ({repartition})")
+
+    def mettre_a_jour_dt(self, dt):
+        """Recalcule les niveaux (groupes de voxels) pour le pas global dt."""
+        self.dt = dt
+        n = self.indices.size
+        rapport = dt / self.dt_local
+        niveaux = np.zeros(n, dtype=np.intp)
+        trop_rapides = rapport > 1.0
+        niveaux[trop_rapides] = np.ceil(np.log2(rapport[trop_rapides])).astype(np.intp)
+        # Garde-fou arrondi: dt/2^k doit rester <= dt_local
+        niveaux[dt / 2.0 ** niveaux > self.dt_local] += 1
+
+        if n and niveaux.max() > self.niveaux_max:
+            self.logger.error(f"Multi-pas: dt={dt}s exige {niveaux.max()} niveaux "
+                              f"(max {self.niveaux_max}).")
+            raise ValueError("Pas de temps trop grand pour le schéma multi-pas.")
+        self.niveaux = niveaux
+        self.niveau_max = int(niveaux.max()) if n else 0
+
+        # Niveau d'une face = niveau du côté le plus rapide
+        niveau_voisin = niveaux[np.where(self._voisin_actif, self._voisins, 0)]
+        niveau_faces = np.where(self._voisin_actif, np.maximum(niveaux, niveau_voisin), niveaux)
+
+        self._groupes = []
+        for k in range(self.niveau_max + 1):
+            dt_k = dt / 2.0 ** k
+            face_k = (niveau_faces == k)
+            touches = np.flatnonzero(face_k.any(axis=0))
+            cellules = np.flatnonzero(niveaux == k)
+            self._groupes.append({
+                "cellules": cellules,
+                "touches": touches,
+                "voisins": [np.ascontiguousarray(v[touches]) for v in self._voisins],
+                # G·dt_k sur les demi-faces de ce niveau, 0 ailleurs
+                "G_dt": [np.where(f[touches], G[touches] * dt_k, 0.0) for f, G in zip(face_k, self._G)],
+                "inv_C": 1.0 / self.C[cellules],
+                # Tampons de travail
+                "energie": np.empty(touches.size), "tmp": np.empty(touches.size),
+            })
+            g = self._groupes[-1]
+            g["somme_G_dt"] = np.sum(g["G_dt"], axis=0)
+
+        repartition = ", ".join(f"k={k}: {g['cellules'].size}" for k, g in enumerate(self._groupes))
+        self.logger.debug(f"Multi-pas: dt={dt}s, {self.niveau_max + 1} niveaux ({repartition} voxels)")
+
+    def avancer(self, T, T_new):
+        """Écrit T(t+dt) dans T_new pour les voxels actifs, à partir de T(t)."""
+        T_plat = T.reshape(-1)
+        n = self.indices.size
+        x_ext = self._x_ext
+        x_ext[:n] = T_plat[self.indices]
+        x_ext[n:] = T_plat[self._indices_imposes]
+        accumulateur = self._accumulateur
+        accumulateur.fill(0.0)
+
+        K = self.niveau_max
+        for m in range(2 ** K):
+            # Flux des faces dont le niveau commence un sous-pas à l'instant m
+            for k, g in enumerate(self._groupes):
+                if m % 2 ** (K - k) or g["touches"].size == 0:
+                    continue
+                # Σ G·dt·(x_voisin - x) = Σ G·dt·x_voisin - (Σ G·dt)·x
+                energie, tmp = g["energie"], g["tmp"]
+                np.take(x_ext, g["touches"], out=energie, mode='clip')
+                energie *= -g["somme_G_dt"]
+                for voisins, G_dt in zip(g["voisins"], g["G_dt"]):
+                    np.take(x_ext, voisins, out=tmp, mode='clip')
+                    tmp *= G_dt
+                    energie += tmp
+                accumulateur[g["touches"]] += energie
+
+            # Voxels dont le sous-pas se termine à m+1: application de l'énergie reçue
+            for k, g in enumerate(self._groupes):
+                if (m + 1) % 2 ** (K - k):
+                    continue
+                cellules = g["cellules"]
+                x_ext[cellules] += accumulateur[cellules] * g["inv_C"]
+                accumulateur[cellules] = 0.0
+
+        T_new.reshape(-1)[self.indices] = x_ext[:n]
@@ -0,0 +1,193 @@
+"""
+Noyau NUMBA (pas explicite fusionné, compilé à la volée).
+
+Le pas NumPy de référence parcourt la grille plusieurs fois (laplacien
+et ses temporaires, masques, dT_rayonnement plein, restauration des
+limites, np.copyto). Ici un pas complet se fait en:
+
+1. UNE passe parallèle sur les voxels solides intérieurs (conduction,
+   aucun temporaire, même ordre d'opérations que la référence)
+2. Des passes sur les seules surfaces: sommes par zone, convection
+   semi-implicite (mêmes 2 itérations de couplage), rayonnement
+
+Les limites fixes et les voxels d'air ne sont jamais écrits: il n'y a
+rien à restaurer. Les deux tampons de température sont échangés au
+lieu d'être recopiés.
+
+Comme la référence, chaque itération prend les moyennes de surface de
+toutes les zones avant de mettre à jour les voxels: seul l'ordre des
+sommes diffère (écarts d'arrondi).
+
+Numba est optionnel: sans lui, NUMBA_DISPONIBLE vaut False et
+Simulation(moteur="numba") est refusé.
+"""
+
+import os
+
+import numpy as np
+
+try:
+    from numba import config, njit, prange
+    NUMBA_DISPONIBLE = True
+    # TBB ne survit pas à un fork (SimulationDistribuee après un pas Numba: le processus
+    # parent bloque à sa sortie). Sauf choix explicite de l'utilisateur: OpenMP puis workqueue.
+    if "NUMBA_THREADING_LAYER" not in os.environ and "NUMBA_THREADING_LAYER_PRIORITY" not in os.environ:
+        config.THREADING_LAYER_PRIORITY = ["omp", "workqueue", "tbb"]
+except ImportError:
+    NUMBA_DISPONIBLE = False
+    prange = range
+
+    def njit(*args, **kwargs):
+        """Repli sans Numba: les noyaux restent des fonctions Python (lentes)."""
+        if len(args) == 1 and callable(args[0]):
+            return args[0]
+        return lambda fonction: fonction
+
+
+@njit(parallel=True, cache=True)
+def _conduction(T, T_new, indices, coeff, pas_x, pas_y):
+    """FTCS sur les voxels actifs (même ordre des termes que la référence)."""
+    for n in prange(indices.size):
+        i = indices[n]
+        lap = (T[i + pas_y] + T[i - pas_y] + T[i + pas_x] + T[i - pas_x]
+               + T[i + 1] + T[i - 1] - 6 * T[i])
+        T_new[i] = T[i] + coeff[n] * lap
+
+
+@njit(cache=True)
+def _copier(T, T_new, indices):
+    """Recopie T(t) pour les surfaces non conductrices (bord du domaine)."""
+    for n in range(indices.size):
+        T_new[indices[n]] = T[indices[n]]
+
+
+@njit(cache=True)
+def _sommes_surfaces(T, debut_zone, surfaces_zone, sommes):
+    """Somme des températures de surface de chaque zone."""
+    for z in range(sommes.size):
+        somme = 0.0
+        for n in range(debut_zone[z], debut_zone[z + 1]):
+            somme += T[surfaces_zone[n]]
+        sommes[z] = somme
+
+
+@njit(cache=True)
+def _convection_surfaces(T, debut_zone, surfaces_zone, capacite_zone, T_air, h_A, dt, variations):
+    """
+    Échange surfaces <-> air de chaque zone: T -= h·A·(T - T_air)·dt / C.
+    Toutes les zones lues avant d'écrire (comme la référence): un voxel au
+    contact de deux zones cumule les deux échanges.
+    """
+    for z in range(T_air.size):
+        for n in range(debut_zone[z], debut_zone[z + 1]):
+            variations[n] = 0.0
+            if capacite_zone[n] != 0:
+                variations[n] = (h_A * (T[surfaces_zone[n]] - T_air[z]) * dt) / capacite_zone[n]
+    for n in range(surfaces_zone.size):
+        T[surfaces_zone[n]] -= variations[n]
+
+
+@njit(parallel=True, cache=True)
+def _rayonnement(T, surfaces, capacite, coeff_rad, T_ciel_K, dt):
+    """Rayonnement vers le ciel: ΔT = -ε·σ·A·(T⁴ - T_ciel⁴)·dt / C."""
+    T_ciel4 = T_ciel_K ** 4
+    for n in prange(surfaces.size):
+        if capacite[n] != 0:
+            i = surfaces[n]
+            T_K = T[i] + 273.15
+            T[i] += (-(coeff_rad * (T_K ** 4 - T_ciel4)) * dt) / capacite[n]
+
+
+class NoyauNumba:
+    """Pas explicite complet (conduction + convection + rayonnement) fusionné."""
+
+    def __init__(self, modele, ds, dt, logger, emissivite=0.85):
+        """
+        Args:
+            modele: ModeleMaison préparé (Alpha, RhoCp, zones, surfaces)
+            ds: Discrétisation spatiale (m)
+            dt: Pas de temps (s)
+            logger: Logger instance
+            emissivite: Émissivité des surfaces (rayonnement)
+        """
+        self.logger = logger
+        self.ds = ds
+        self.h = modele.params.h_convection
+        self.emissivite = emissivite
+        forme = modele.Materiau.shape
+        N_x, N_y, N_z = forme
+        self.pas_x = N_y * N_z
+        self.pas_y = N_z
+
+        interieur = np.zeros(forme, dtype=bool)
+        interieur[1:-1, 1:-1, 1:-1] = (modele.Alpha > 0)[1:-1, 1:-1, 1:-1]
+        self.indices = np.flatnonzero(interieur).astype(np.intp)
+        self.alpha_actif = modele.Alpha.reshape(-1)[self.indices]
+        self.coeff = None
+        self.dt = None
+
+        # Surfaces par zone (un voxel peut appartenir à plusieurs zones)
+        RhoCp = modele.RhoCp.reshape(-1)
+        self.zones = modele.etat_zones()
+        rangs_zones = []
+        surfaces_par_zone = []
+        for rang, id_zone in enumerate(self.zones.ids):
+            indices_tuple = modele.surfaces_convection_idx[id_zone]
+            if indices_tuple[0].size == 0:
+                continue
+            rangs_zones.append(rang)
+            surfaces_par_zone.append(np.ravel_multi_index(indices_tuple, forme).astype(np.intp))
+        self.rangs_zones = np.array(rangs_zones, dtype=np.intp)
+        self.nb_surfaces = np.array([s.size for s in surfaces_par_zone], dtype=np.intp)
+        self.debut_zone = np.concatenate([[0], np.cumsum(self.nb_surfaces)]).astype(np.intp)
+        self.surfaces_zone = np.concatenate([np.empty(0, dtype=np.intp)] + surfaces_par_zone)
+        self.capacite_zone = RhoCp[self.surfaces_zone] * ds ** 3
+
+        self.surfaces = np.unique(self.surfaces_zone).astype(np.intp)
+        self.capacite_surfaces = RhoCp[self.surfaces] * ds ** 3
+        self.surfaces_non_actives = np.setdiff1d(self.surfaces, self.indices).astype(np.intp)
+
+        self._sommes = np.zeros(self.rangs_zones.size)
+        self._variations = np.zeros(self.surfaces_zone.size)
+        self.mettre_a_jour_dt(dt)
+
+        self.logger.info(f"Noyau Numba: {self.indices.size} voxels actifs, "
+                         f"{self.surfaces.size} surfaces, {self.rangs_zones.size} zones")
+
+    def mettre_a_jour_dt(self, dt):
+        """Recalcule le coefficient α·dt/ds² (si dt change)."""
+        self.dt = dt
+        self.coeff = self.alpha_actif * dt / self.ds ** 2
+
+    def pas(self, T, T_new, rayonnement, nb_iter_max=2, tolerance=0.01):
+        """
+        Calcule T(t+dt) dans T_new (grilles aplaties) et met à jour les zones.
+
+        Seules les entrées des voxels actifs et des surfaces sont écrites:
+        les autres doivent déjà être identiques dans T et T_new.
+        """
+        dt = self.dt
+        _conduction(T, T_new, self.indices, self.coeff, self.pas_x, self.pas_y)
+        _copier(T, T_new, self.surfaces_non_actives)
+
+        # Convection semi-implicite (mêmes itérations que la référence)
+        h_A = self.h * self.ds ** 2
+        T_air = self.zones.T[self.rangs_zones]
+        C_air = self.zones.capacites[self.rangs_zones]
+        actives = C_air > 0
+        A_total = self.ds ** 2 * self.nb_surfaces
+        k = np.divide(self.h * A_total * dt, C_air, out=np.zeros_like(C_air), where=actives)
+        for _ in range(nb_iter_max):
+            _sommes_surfaces(T_new, self.debut_zone, self.surfaces_zone, self._sommes)
+            T_air_new = np.where(actives, (T_air + k * (self._sommes / self.nb_surfaces)) / (1.0 + k), T_air)
+            dT_max = float(np.max(np.abs(T_air_new - T_air), initial=0.0))
+            T_air = T_air_new
+            _convection_surfaces(T_new, self.debut_zone, self.surfaces_zone, self.capacite_zone,
+                                 T_air, h_A, dt, self._variations)
+            if dT_max < tolerance:
+                break
+        self.zones.T[self.rangs_zones] = T_air
+
+        if rayonnement.enable_external:
+            coeff_rad = self.emissivite * rayonnement.SIGMA * self.ds ** 2
+            _rayonnement(T_new, self.surfaces, self.capacite_surfaces, coeff_rad, rayonnement.T_sky_K, dt)
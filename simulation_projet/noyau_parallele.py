@@ -0,0 +1,166 @@
+"""
+Moteur PARALLÈLE par tranches en x (threads).
+
+La grille est découpée en tranches de plans x contigus. Chaque tranche a
+son propre noyau creux (NoyauConductionCreux): les écritures de deux
+tranches ne se recouvrent jamais, et les noyaux NumPy (take, add,
+multiply) relâchent le GIL sur de grands tableaux, ce qui permet
+aux threads de travailler en même temps.
+
+Un pas = plusieurs phases, chacune suivie d'une barrière (attente de
+toutes les tranches):
+1. Conduction (lecture T(t), écriture T(t+dt) sur les voxels de la tranche)
+2. Convection: sommes partielles des surfaces par zone et par tranche,
+   réduites dans l'ordre des tranches, puis mise à jour des surfaces
+3. Rayonnement des surfaces de la tranche, recopie dans T_suivant
+
+Le découpage (nb_tranches) est fixe et indépendant du nombre de threads:
+les réductions se font toujours dans le même ordre, le résultat ne
+dépend donc pas de nb_threads.
+"""
+
+import os
+from concurrent.futures import ThreadPoolExecutor
+
+import numpy as np
+
+from noyau_creux import NoyauConductionCreux
+
+
+class Tranche:
+    """Plans x [x_debut, x_fin): noyau de conduction et surfaces par zone."""
+
+    def __init__(self, x_debut, x_fin, modele, masque_solide, ds, dt, ids_zones, logger):
+        forme = masque_solide.shape
+        masque_tranche = np.zeros(forme, dtype=bool)
+        masque_tranche[x_debut:x_fin] = masque_solide[x_debut:x_fin]
+        self.noyau = NoyauConductionCreux(modele.Alpha, masque_tranche, ds, dt, logger, journaliser=False)
+
+        RhoCp = modele.RhoCp.reshape(-1)
+        self.surfaces_zone = []
+        self.capacites_zone = []
+        for id_zone in ids_zones:
+            indices_tuple = modele.surfaces_convection_idx[id_zone]
+            dans_tranche = (indices_tuple[0] >= x_debut) & (indices_tuple[0] < x_fin)
+            surfaces = np.ravel_multi_index(
+                tuple(idx[dans_tranche] for idx in indices_tuple), forme).astype(np.intp)
+            self.surfaces_zone.append(surfaces)
+            self.capacites_zone.append(RhoCp[surfaces] * ds ** 3)
+
+        self.surfaces = np.unique(np.concatenate(
+            [np.empty(0, dtype=np.intp)] + self.surfaces_zone)).astype(np.intp)
+        self.RhoCp_surfaces = RhoCp[self.surfaces]
+        self.indices_modifies = np.union1d(self.noyau.indices, self.surfaces).astype(np.intp)
+
+
+class MoteurParallele:
+    """Pas explicite (conduction + convection + rayonnement) sur un pool de threads."""
+
+    def __init__(self, modele, ds, dt, logger, nb_threads=None, nb_tranches=32):
+        """
+        Args:
+            modele: ModeleMaison préparé
+            ds: Discrétisation spatiale (m)
+            dt: Pas de temps (s)
+            logger: Logger instance
+            nb_threads: Taille du pool (None: nombre de cœurs)
+            nb_tranches: Nombre de tranches en x (fixe: garantit des
+                         résultats identiques quel que soit nb_threads)
+        """
+        self.logger = logger
+        self.modele = modele
+        self.ds = ds
+        self.nb_threads = nb_threads or os.cpu_count() or 1
+
+        N_x = modele.Materiau.shape[0]
+        nb_tranches = max(1, min(nb_tranches, N_x))
+        bornes = np.linspace(0, N_x, nb_tranches + 1).round().astype(int)
+
+        masque_solide = (modele.Alpha > 0)
+        self.ids_zones = [id_zone for id_zone in modele.zones_air
+                          if modele.surfaces_convection_idx[id_zone][0].size > 0]
+        self.nb_surfaces = np.array([modele.surfaces_convection_idx[id_zone][0].size
+                                     for id_zone in self.ids_zones])
+        self.zones = modele.etat_zones()
+        self.rangs_zones = np.array([self.zones.ids.index(id_zone) for id_zone in self.ids_zones], dtype=np.intp)
+        self.tranches = [Tranche(bornes[t], bornes[t + 1], modele, masque_solide, ds, dt,
+                                 self.ids_zones, logger)
+                         for t in range(nb_tranches) if bornes[t + 1] > bornes[t]]
+        self.indices = np.concatenate([t.noyau.indices for t in self.tranches])
+
+        self.pool = None  # Créé au premier pas, libéré par fermer()
+        self.logger.info(f"Moteur parallèle: {len(self.tranches)} tranches en x, "
+                         f"{self.nb_threads} threads")
+
+    def _executer(self, fonction):
+        """Applique fonction à chaque tranche sur le pool (barrière en sortie)."""
+        if self.pool is None:
+            self.pool = ThreadPoolExecutor(max_workers=self.nb_threads)
+        return list(self.pool.map(fonction, self.tranches))
+
+    def fermer(self):
+        """Arrête les threads du pool (recréé si un nouveau pas est demandé)."""
+        if self.pool is not None:
+            self.pool.shutdown()
+            self.pool = None
+
+    def mettre_a_jour_dt(self, dt):
+        """Recalcule le coefficient α·dt/ds² de chaque tranche."""
+        for tranche in self.tranches:
+            tranche.noyau.mettre_a_jour_dt(dt)
+
+    def pas(self, T, T_suivant, dt, h, rayonnement, nb_iter_max=2, tolerance=0.01):
+        """
+        Avance d'un pas: T_suivant contient T(t), T reçoit T(t+dt).
+        En sortie T_suivant = T sur tous les voxels modifiés.
+        """
+        T_plat = T.reshape(-1)
+        surface_cellule = self.ds ** 2
+
+        # 1. Conduction
+        self._executer(lambda tranche: tranche.noyau.avancer(T_suivant, T))
+
+        # 2. Convection semi-implicite: sommes par tranche, réduction ordonnée
+        T_air = self.zones.T[self.rangs_zones]
+        C_air = self.zones.capacites[self.rangs_zones]
+        actives = C_air > 0
+        A_total = surface_cellule * self.nb_surfaces
+        k = np.divide(h * A_total * dt, C_air, out=np.zeros_like(C_air), where=actives)
+        for _ in range(nb_iter_max):
+            sommes = np.array(self._executer(
+                lambda tranche: [np.sum(T_plat[s], dtype=np.float64) for s in tranche.surfaces_zone]
+            )).reshape(len(self.tranches), T_air.size)
+            sommes_zones = np.zeros(T_air.size)
+            for sommes_tranche in sommes:  # Toujours dans l'ordre des tranches
+                sommes_zones += sommes_tranche
+
+            T_air_new = np.where(actives, (T_air + k * (sommes_zones / self.nb_surfaces)) / (1.0 + k), T_air)
+            dT_max = float(np.max(np.abs(T_air_new - T_air), initial=0.0))
+            T_air = T_air_new
+
+            def convection(tranche):
+                # Toutes les zones lues avant d'écrire (comme la référence): un voxel
+                # au contact de deux zones cumule les deux échanges
+                variations = []
+                for z, (surfaces, capacites) in enumerate(zip(tranche.surfaces_zone, tranche.capacites_zone)):
+                    energie_J = h * surface_cellule * (T_plat[surfaces] - T_air[z]) * dt
+                    variations.append(np.divide(energie_J, capacites, out=np.zeros_like(energie_J),
+                                                where=capacites != 0))
+                for surfaces, dT in zip(tranche.surfaces_zone, variations):
+                    T_plat[surfaces] -= dT
+
+            self._executer(convection)
+            if dT_max < tolerance:
+                break
+        self.zones.T[self.rangs_zones] = T_air
+
+        # 3. Rayonnement et recopie des voxels modifiés dans T_suivant
+        def finaliser(tranche):
+            if rayonnement.enable_external:
+                T_surfaces = T_plat[tranche.surfaces]
+                T_plat[tranche.surfaces] = T_surfaces + rayonnement.calculer_dT_surfaces(
+                    T_surfaces, tranche.RhoCp_surfaces, self.ds, dt, emissivite_default=0.85
+                )
+            T_suivant.reshape(-1)[tranche.indices_modifies] = T_plat[tranche.indices_modifies]
+
+        self._executer(finaliser)
@@ -0,0 +1,198 @@
+"""
+Noyau SANS ALLOCATION (tampons préalloués, échange des grilles).
+
+Le pas NumPy de référence alloue à chaque itération: les temporaires du
+laplacien, les copies masquées, le dT_rayonnement plein, les vecteurs de
+surfaces de chaque zone, puis recopie toute la grille T dans T_suivant.
+
+Ici tout est alloué UNE FOIS:
+- Champ de coefficients α·dt/ds² (0 hors solides intérieurs: l'air, les
+  limites fixes et le bord sont recopiés tels quels)
+- Laplacien calculé dans un tampon avec out=, sur des tranches CONTIGUËS
+  de la grille aplatie (voisin = décalage de ±1, ±N_z, ±N_y·N_z): sur des
+  vues 3D à pas, les ufuncs allouent des tampons d'itération
+- Surfaces de convection: tables plates du modèle et tampons de travail
+- Les deux grilles de température sont échangées au lieu d'être recopiées
+
+Mêmes opérations, dans le même ordre, que la référence: le résultat est
+identique bit à bit (toutes les zones ensemble, comme la référence).
+"""
+
+import numpy as np
+
+
+class NoyauTampons:
+    """Pas explicite complet sur tampons préalloués (écrit T_new depuis T)."""
+
+    def __init__(self, modele, ds, dt, logger, emissivite=0.85):
+        """
+        Args:
+            modele: ModeleMaison préparé (Alpha, RhoCp, zones, surfaces)
+            ds: Discrétisation spatiale (m)
+            dt: Pas de temps (s)
+            logger: Logger instance
+            emissivite: Émissivité des surfaces (rayonnement)
+        """
+        self.logger = logger
+        self.modele = modele
+        self.ds = ds
+        self.h = modele.params.h_convection
+        self.emissivite = emissivite
+        forme = modele.Materiau.shape
+        N_x, N_y, N_z = forme
+        pas_x, pas_y = N_y * N_z, N_z
+
+        interieur = np.zeros(forme, dtype=bool)
+        interieur[1:-1, 1:-1, 1:-1] = (modele.Alpha > 0)[1:-1, 1:-1, 1:-1]
+        self.indices = np.flatnonzero(interieur).astype(np.intp)
+
+        # Plage plate calculée: tout sauf le premier et le dernier plan x
+        self._plage = slice(pas_x, modele.Materiau.size - pas_x)
+        # Ordre des voisins = ordre des termes du laplacien de référence
+        self._decalages = (pas_y, -pas_y, pas_x, -pas_x, 1, -1)
+
+        # Coefficient α·dt/ds² sur la plage, 0 hors solides intérieurs
+        self._alpha = modele.Alpha.reshape(-1)[self._plage].copy()
+        self._masque = interieur.reshape(-1)[self._plage].astype(self._alpha.dtype)
+        self.coeff = np.empty_like(self._alpha)
+        self.dt = None
+        self._lap = np.empty_like(self._alpha)
+        self._tmp = np.empty_like(self._alpha)
+
+        # Tables plates des surfaces (les mêmes que la référence) et tampons de travail
+        RhoCp = modele.RhoCp.reshape(-1)
+        dtype = self._alpha.dtype  # Type des températures (float32 possible)
+        self.tables = modele.tables_surfaces()
+        self.zones = modele.etat_zones()  # Tableaux des zones (T, capacités), ordre des tables
+        nb_entrees = self.tables["indices"].size
+        self._T_entrees = np.empty(nb_entrees, dtype=dtype)
+        self._produits = np.empty(nb_entrees)
+        self._T_air_entrees = np.empty(nb_entrees)
+        self._dT_entrees = np.empty(nb_entrees)
+        self._ha_dt = np.empty(nb_entrees)
+        self._tampons_rangs = [(np.empty(entrees.size), None if rang == 0 else np.empty(entrees.size, dtype=dtype))
+                               for rang, (entrees, _) in enumerate(self.tables["rangs"])]
+        # Zones: capacités, coefficients implicites et températures d'air
+        nb_zones = len(self.zones.ids)
+        self._actives = (self.zones.capacites > 0) & (self.tables["aires_zones"] > 0)
+        self._k = np.zeros(nb_zones)
+        self._un_plus_k = np.ones(nb_zones)
+        self._T_air = np.empty(nb_zones)
+        self._T_air_new = np.empty(nb_zones)
+        self._T_surf_moy = np.zeros(nb_zones)
+        self._ecarts = np.empty(nb_zones)
+
+        self.surfaces = self.tables["surfaces"]
+        capacites = RhoCp[self.surfaces] * ds ** 3
+        self._capacites_surfaces = np.where(capacites != 0, capacites, 1.0)
+        self._masque_surfaces = (capacites != 0).astype(np.float64)
+        self._T_surfaces = np.empty(self.surfaces.size, dtype=dtype)
+        self._dT_surfaces = np.empty(self.surfaces.size, dtype=dtype)
+        # Surfaces hors intérieur (bord de grille): pas écrites par la conduction
+        self.surfaces_bord = np.setdiff1d(self.surfaces, self.indices).astype(np.intp)
+        self._T_bord = np.empty(self.surfaces_bord.size, dtype=dtype)
+        self.mettre_a_jour_dt(dt)
+
+        self._vues = {}
+
+        self.logger.info(f"Noyau sans allocation: {self.indices.size} voxels actifs, "
+                         f"{self.surfaces.size} surfaces, {len(self.zones.ids)} zones")
+
+    def mettre_a_jour_dt(self, dt):
+        """Recalcule le champ α·dt/ds² et les h·dt·a des surfaces (en place)."""
+        self.dt = dt
+        np.multiply(self._alpha, dt, out=self.coeff)
+        self.coeff /= self.ds ** 2
+        self.coeff *= self._masque
+        np.multiply(self.h * dt, self.tables["aires"], out=self._ha_dt)
+        np.divide(self.h * self.tables["aires_zones"] * dt, self.zones.capacites, out=self._k, where=self._actives)
+        np.add(1.0, self._k, out=self._un_plus_k)
+
+    def _vues_grille(self, T):
+        """Vues (plate, voisins du laplacien, centre) d'une grille, créées une fois."""
+        vues = self._vues.get(id(T))
+        if vues is None or vues[0] is not T:
+            T_plat = T.reshape(-1)
+            debut, fin = self._plage.start, self._plage.stop
+            vues = (T, T_plat, tuple(T_plat[debut + d:fin + d] for d in self._decalages),
+                    T_plat[self._plage])
+            if len(self._vues) >= 2:
+                self._vues.clear()
+            self._vues[id(T)] = vues
+        return vues
+
+    def pas(self, T, T_new, rayonnement, nb_iter_max=2, tolerance=0.01):
+        """
+        Calcule T(t+dt) dans T_new (grilles 3D) et met à jour les zones.
+
+        Seuls l'intérieur et les surfaces sont écrits: les autres entrées
+        (limites, bord) doivent déjà être identiques dans T et T_new.
+        """
+        dt = self.dt
+        _, T_plat, voisins, T_centre = self._vues_grille(T)
+        _, T_new_plat, _, T_new_centre = self._vues_grille(T_new)
+
+        # 1. Conduction: T_new = T + coeff·lap (même ordre des termes)
+        lap, tmp = self._lap, self._tmp
+        np.add(voisins[0], voisins[1], out=lap)
+        for voisin in voisins[2:]:
+            lap += voisin
+        np.multiply(T_centre, 6, out=tmp)
+        lap -= tmp
+        lap *= self.coeff
+        np.add(T_centre, lap, out=T_new_centre)
+        np.take(T_plat, self.surfaces_bord, out=self._T_bord, mode='clip')
+        T_new_plat.put(self.surfaces_bord, self._T_bord)
+
+        # 2. Convection semi-implicite, toutes les zones ensemble (comme la référence)
+        tables = self.tables
+        if self.zones.ids and tables["indices"].size:
+            T_air, T_air_new, T_surf_moy = self._T_air, self._T_air_new, self._T_surf_moy
+            np.copyto(T_air, self.zones.T)
+            T_s, T_e, dT_e = self._T_surfaces, self._T_entrees, self._dT_entrees
+            for _ in range(nb_iter_max):
+                np.take(T_new_plat, self.surfaces, out=T_s, mode='clip')
+                np.take(T_s, tables["position"], out=T_e, mode='clip')
+                np.multiply(tables["aires"], T_e, out=self._produits)
+                somme = np.bincount(tables["zone"], self._produits, minlength=T_air.size)
+                # T_air_new = (T_air + k·T_surf_moy)/(1 + k) (k = 0 hors zones actives)
+                np.divide(somme, tables["aires_zones"], out=T_surf_moy, where=self._actives)
+                np.multiply(self._k, T_surf_moy, out=T_air_new)
+                T_air_new += T_air
+                T_air_new /= self._un_plus_k
+                np.subtract(T_air_new, T_air, out=self._ecarts)
+                dT_max = float(np.max(np.abs(self._ecarts, out=self._ecarts)))
+                np.copyto(T_air, T_air_new)
+
+                # dT = h·dt·a·(T_surf - T_air)/(ρ·cp·V), cumulé par voxel
+                np.take(T_air, tables["zone"], out=self._T_air_entrees, mode='clip')
+                np.subtract(T_e, self._T_air_entrees, out=dT_e)
+                np.multiply(self._ha_dt, dT_e, out=dT_e)
+                dT_e *= tables["inv_capacites"]
+                for (entrees, positions), (dT_rang, T_rang) in zip(tables["rangs"], self._tampons_rangs):
+                    np.take(dT_e, entrees, out=dT_rang, mode='clip')
+                    if T_rang is None:  # Rang 0: tous les voxels, dans l'ordre
+                        T_s -= dT_rang
+                    else:
+                        np.take(T_s, positions, out=T_rang, mode='clip')
+                        T_rang -= dT_rang
+                        T_s.put(positions, T_rang)
+                T_new_plat.put(self.surfaces, T_s)
+                if dT_max < tolerance:
+                    break
+            np.copyto(self.zones.T, T_air)
+
+        # 3. Rayonnement des surfaces vers le ciel
+        if rayonnement.enable_external:
+            T_s, dT = self._T_surfaces, self._dT_surfaces
+            np.take(T_new_plat, self.surfaces, out=T_s, mode='clip')
+            np.add(T_s, 273.15, out=dT)
+            np.power(dT, 4, out=dT)
+            dT -= rayonnement.T_sky_K ** 4
+            dT *= self.emissivite * rayonnement.SIGMA * (self.ds * self.ds)
+            np.negative(dT, out=dT)
+            dT *= dt
+            dT /= self._capacites_surfaces
+            dT *= self._masque_surfaces
+            T_s += dT
+            T_new_plat.put(self.surfaces, T_s)
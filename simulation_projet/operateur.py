@@ -0,0 +1,148 @@
+"""
+Module OPÉRATEUR THERMIQUE (matrice creuse conduction + convection).
+
+Assemble le système semi-discret (méthode des lignes) du modèle voxel:
+
+  C·dx/dt = -K·x + b
+
+où:
+  x = [T des voxels solides ; T des zones d'air]
+  C = capacités thermiques (J/K): ρ·cp·ds³ pour les solides, C_air pour les zones
+  K = matrice de conductances (W/K), creuse
+  b = apports des températures imposées (W): limites fixes, voxels d'air
+
+Discrétisation identique au schéma explicite de Simulation:
+- Conduction: seuls les solides intérieurs conduisent, avec la
+  conductance de la cellule G = λ·ds (forme "α de la cellule" du FTCS).
+  Les voisins non solides (LIMITE_FIXE, voxels d'air) sont des
+  températures imposées, lues dans la grille T.
+- Convection: chaque voxel de surface échange h·ds² avec le nœud d'air
+  de sa zone (couplage symétrique). Une zone de capacité nulle est une
+  température imposée.
+"""
+
+import numpy as np
+import scipy.sparse as sp
+
+
+class OperateurThermique:
+    """Matrice K, capacités C et second membre b du modèle voxel."""
+
+    def __init__(self, modele, T, logger):
+        """
+        Args:
+            modele: ModeleMaison (Alpha, Lambda, RhoCp, zones, surfaces)
+            T: Champ de température (3D array) fournissant les valeurs imposées
+            logger: Logger instance
+        """
+        self.logger = logger
+        self.modele = modele
+        params = modele.params
+        ds = params.ds
+        h = params.h_convection
+        self.forme = T.shape
+
+        Alpha = modele.Alpha
+        masque_solide = (Alpha > 0)
+
+        # --- Numérotation des inconnues ---
+        self.indices_solides = np.flatnonzero(masque_solide).astype(np.intp)
+        self.n_solides = self.indices_solides.size
+
+        self.ids_zones = [id_zone for id_zone, zone in modele.zones_air.items()
+                          if zone.capacite_thermique_J_K > 0]
+        self.n_zones = len(self.ids_zones)
+        self.n = self.n_solides + self.n_zones
+
+        numero = np.full(T.size, -1, dtype=np.intp)
+        numero[self.indices_solides] = np.arange(self.n_solides)
+
+        # --- Capacités (J/K) ---
+        C_solides = modele.RhoCp.reshape(-1)[self.indices_solides] * ds ** 3
+        self.zones = modele.etat_zones()
+        self.rangs_zones = np.array([self.zones.ids.index(i) for i in self.ids_zones], dtype=np.intp)
+        self.C = np.concatenate([C_solides, self.zones.capacites[self.rangs_zones]])
+
+        lignes, colonnes, valeurs = [], [], []
+        self.b = np.zeros(self.n, dtype=np.float64)
+        T_plat = T.reshape(-1)
+
+        # --- Conduction (solides intérieurs uniquement, comme le FTCS) ---
+        interieur = np.zeros(self.forme, dtype=bool)
+        interieur[1:-1, 1:-1, 1:-1] = masque_solide[1:-1, 1:-1, 1:-1]
+        actifs = np.flatnonzero(interieur).astype(np.intp)
+        G_axes = [modele.Lambda_axe(axe).reshape(-1)[actifs] * ds for axe in range(3)]
+        i_actifs = numero[actifs]
+
+        N_x, N_y, N_z = self.forme
+        for s, decalage in enumerate((N_y * N_z, -N_y * N_z, N_z, -N_z, 1, -1)):
+            G = G_axes[s // 2]
+            voisins = actifs + decalage
+            j = numero[voisins]
+            inconnu = (j >= 0)
+
+            lignes.append(i_actifs)
+            colonnes.append(i_actifs)
+            valeurs.append(G)
+
+            lignes.append(i_actifs[inconnu])
+            colonnes.append(j[inconnu])
+            valeurs.append(-G[inconnu])
+
+            # Voisin imposé (limite fixe ou voxel d'air): passe au second membre
+            np.add.at(self.b, i_actifs[~inconnu], G[~inconnu] * T_plat[voisins[~inconnu]])
+
+        # --- Convection (surfaces <-> nœuds d'air) ---
+        g = h * ds ** 2
+        self.indices_surfaces = {}
+        for id_zone, indices_tuple in modele.surfaces_convection_idx.items():
+            if indices_tuple[0].size == 0 or id_zone not in modele.zones_air:
+                continue
+            i_surf = numero[np.ravel_multi_index(indices_tuple, self.forme)]
+            self.indices_surfaces[id_zone] = i_surf
+            g_vec = np.full(i_surf.size, g)
+
+            lignes.append(i_surf)
+            colonnes.append(i_surf)
+            valeurs.append(g_vec)
+
+            if id_zone in self.ids_zones:
+                k = self.n_solides + self.ids_zones.index(id_zone)
+                k_vec = np.full(i_surf.size, k)
+                lignes += [i_surf, k_vec, k_vec]
+                colonnes += [k_vec, i_surf, k_vec]
+                valeurs += [-g_vec, -g_vec, g_vec]
+            else:
+                # Zone sans capacité: température d'air imposée
+                np.add.at(self.b, i_surf, g * modele.zones_air[id_zone].T)
+
+        self.K = sp.csr_matrix(
+            (np.concatenate(valeurs), (np.concatenate(lignes), np.concatenate(colonnes))),
+            shape=(self.n, self.n)
+        )
+        self.K.sum_duplicates()
+
+        # Voxels de surface (uniques) soumis au rayonnement
+        if self.indices_surfaces:
+            self.surfaces_rayonnement = np.unique(np.concatenate(list(self.indices_surfaces.values())))
+        else:
+            self.surfaces_rayonnement = np.empty(0, dtype=np.intp)
+
+        self.logger.info(f"Opérateur thermique: {self.n_solides} solides + {self.n_zones} zones, "
+                         f"{self.K.nnz} coefficients non nuls.")
+
+    def extraire_etat(self, T):
+        """Vecteur x = [T solides ; T zones] à partir de la grille et des zones."""
+        x = np.empty(self.n, dtype=np.float64)
+        x[:self.n_solides] = T.reshape(-1)[self.indices_solides]
+        x[self.n_solides:] = self.zones.T[self.rangs_zones]
+        return x
+
+    def injecter_etat(self, x, T):
+        """Écrit x dans la grille T (solides) et dans les zones d'air."""
+        T.reshape(-1)[self.indices_solides] = x[:self.n_solides]
+        self.zones.T[self.rangs_zones] = x[self.n_solides:]
+
+    def derivee(self, x):
+        """dx/dt = C⁻¹·(b - K·x) (sans rayonnement)."""
+        return np.divide(self.b - self.K @ x, self.C, out=np.zeros(self.n), where=self.C != 0)
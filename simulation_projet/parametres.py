@@ -1,10 +1,42 @@
 # Fichier généré automatiquement par dispatcher_le_projet.py
 
 from logger import LoggerSimulation
+import numpy as np
+
+
+def coordonnees_axe(L_m, ds_max, raffinements=()):
+    """
+    Coordonnées (m) des points d'un axe non uniforme: pas ds_max par
+    défaut, pas plus fin sur les intervalles de raffinement (ex: l'épaisseur
+    d'un mur). Les bornes des intervalles sont des points de la grille.
+
+    Args:
+        L_m: Longueur de l'axe (m), coordonnées de 0 à L_m
+        ds_max: Pas grossier (m), ex: intérieur des pièces, sol profond
+        raffinements: Liste de (debut_m, fin_m, ds_fin_m)
+
+    Returns:
+        np.ndarray croissant, 0 et L_m inclus
+    """
+    bornes = sorted({0.0, float(L_m)} | {float(b) for d, f, _ in raffinements for b in (d, f)
+                                         if 0.0 <= b <= L_m})
+    points = [0.0]
+    for debut, fin in zip(bornes[:-1], bornes[1:]):
+        pas = min([ds_max] + [ds for d, f, ds in raffinements if d <= debut and fin <= f])
+        nb = max(1, int(np.ceil((fin - debut) / pas - 1e-9)))
+        points.extend(np.linspace(debut, fin, nb + 1)[1:])
+    return np.array(points)
 
 
 class ParametresSimulation:
-    """Stocke les paramètres de la simulation (grille, temps)."""
+    """Stocke les paramètres de la simulation (grille, temps).
+
+    Grille rectiligne: uniforme (pas ds sur les trois axes) ou non uniforme
+    (`coords_m`: coordonnées des points de chaque axe, voir coordonnees_axe).
+    Chaque point représente le volume de contrôle compris entre les milieux
+    des intervalles voisins (largeurs_m); sur grille uniforme tous les
+    volumes valent ds³. ds est alors le plus petit pas (CFL, affichage).
+    """
 
     def __init__(self, logger,
                  dims_m=(1.0, 1.0, 1.0),
@@ -13,9 +45,21 @@ class ParametresSimulation:
                  T_exterieur_init=0.0,
                  # --- NOUVEAU: Température du Sol ---
                  T_sol_init=10.0,
-                 h_convection=8.0):
+                 h_convection=8.0,
+                 coords_m=None):
         self.logger = logger
 
+        # Grille non uniforme: coordonnées des points par axe, origine en 0 (None: uniforme)
+        self.coords_m = None
+        if coords_m is not None:
+            self.coords_m = tuple(np.asarray(c, dtype=np.float64) - c[0] for c in coords_m)
+            if len(self.coords_m) != 3 or any(c.ndim != 1 or c.size < 2 or np.any(np.diff(c) <= 0)
+                                              for c in self.coords_m):
+                logger.error("coords_m: trois tableaux strictement croissants d'au moins 2 points attendus.")
+                raise ValueError("Coordonnées de grille invalides.")
+            dims_m = tuple(float(c[-1] - c[0]) for c in self.coords_m)
+            ds = float(min(np.diff(c).min() for c in self.coords_m))
+
         # Dimensions physiques (mètres)
         self.L_x, self.L_y, self.L_z = dims_m
 
@@ -25,9 +69,12 @@ class ParametresSimulation:
 
         # Nombre de points de grille (N = L/ds + 1)
         # +1 car N_x points définissent N_x-1 cellules
-        self.N_x = int(round(self.L_x / self.ds)) + 1
-        self.N_y = int(round(self.L_y / self.ds)) + 1
-        self.N_z = int(round(self.L_z / self.ds)) + 1
+        if self.coords_m is None:
+            self.N_x = int(round(self.L_x / self.ds)) + 1
+            self.N_y = int(round(self.L_y / self.ds)) + 1
+            self.N_z = int(round(self.L_z / self.ds)) + 1
+        else:
+            self.N_x, self.N_y, self.N_z = (c.size for c in self.coords_m)
 
         # Températures initiales
         self.T_interieur_init = T_interieur_init
@@ -42,3 +89,62 @@ class ParametresSimulation:
             f"Paramètres créés. Grille: {self.N_x}x{self.N_y}x{self.N_z} ({self.N_x * self.N_y * self.N_z} points)")
         self.logger.debug(f"Dimensions: {self.L_x}m x {self.L_y}m x {self.L_z}m")
         self.logger.debug(f"Discrétisation: ds={self.ds}m, dt={self.dt}s")
+        if self.coords_m is not None:
+            self.logger.info(f"Grille non uniforme: pas de {self.ds * 1000:.1f} mm à "
+                             f"{max(np.diff(c).max() for c in self.coords_m):.3f} m")
+
+    @property
+    def uniforme(self):
+        """True si la grille a le même pas ds sur les trois axes."""
+        return getattr(self, "coords_m", None) is None
+
+    def _taille(self, axe):
+        return (self.N_x, self.N_y, self.N_z)[axe]
+
+    def coordonnees_m(self, axe):
+        """Coordonnées (m) des points de l'axe (0: x, 1: y, 2: z)."""
+        if self.uniforme:
+            return np.arange(self._taille(axe)) * self.ds
+        return self.coords_m[axe]
+
+    def pas_m(self, axe):
+        """Distances (m) entre points voisins de l'axe (N-1 valeurs)."""
+        if self.uniforme:
+            return np.full(self._taille(axe) - 1, self.ds)
+        return np.diff(self.coords_m[axe])
+
+    def largeurs_m(self, axe):
+        """
+        Largeur (m) du volume de contrôle de chaque point de l'axe: demi-somme
+        des pas voisins (pas voisin unique aux extrémités).
+        """
+        if self.uniforme:
+            return np.full(self._taille(axe), self.ds)
+        pas = np.diff(self.coords_m[axe])
+        return np.concatenate([pas[:1], 0.5 * (pas[:-1] + pas[1:]), pas[-1:]])
+
+    def faces_m(self, axe):
+        """Positions (m) des N+1 faces des volumes de contrôle de l'axe (largeurs_m = écarts)."""
+        if self.uniforme:
+            return (np.arange(self._taille(axe) + 1) - 0.5) * self.ds
+        c = self.coords_m[axe]
+        pas = np.diff(c)
+        return np.concatenate([c[:1] - 0.5 * pas[0], 0.5 * (c[:-1] + c[1:]), c[-1:] + 0.5 * pas[-1]])
+
+    def indice(self, axe, coord_m):
+        """Indice du point de l'axe le plus proche d'une coordonnée (m)."""
+        if self.uniforme:
+            return int(round(coord_m / self.ds))
+        return int(np.argmin(np.abs(self.coords_m[axe] - coord_m)))
+
+    def volume_bloc_m3(self, x1, x2, y1, y2, z1, z2):
+        """Volume (m³) du bloc de voxels [x1:x2, y1:y2, z1:z2]."""
+        if self.uniforme:
+            return (x2 - x1) * (y2 - y1) * (z2 - z1) * (self.ds ** 3)
+        return (self.largeurs_m(0)[x1:x2].sum() * self.largeurs_m(1)[y1:y2].sum()
+                * self.largeurs_m(2)[z1:z2].sum())
+
+    def volumes_m3(self):
+        """Grille 3D des volumes de contrôle (m³)."""
+        w = [self.largeurs_m(axe) for axe in range(3)]
+        return w[0][:, None, None] * w[1][None, :, None] * w[2][None, None, :]
@@ -0,0 +1,267 @@
+"""
+Parois MULTICOUCHES 1D (éléments de paroi hors grille).
+
+Une paroi plane (mur, dalle, plafond) entre deux régions est représentée
+par une bande 1D de différences finies au lieu de voxels: chaque couche
+(matériau de MATERIAUX, épaisseur) est découpée en mailles de ds_max au
+plus. Chaque extrémité est couplée à:
+- "zone": le nœud d'air d'une zone (convection h)
+- "fixe": une température imposée (extérieur, h de surface)
+- "voxels": des voxels solides de la grille (conduction à travers la
+  demi-maille de la paroi et le demi-voxel)
+
+Schéma: Euler implicite sur les bandes ET les nœuds d'air couplés. Les
+bandes forment un système tridiagonal unique (scipy.linalg.solve_banded);
+l'air ajoute une ligne par zone (système bordé), résolue par superposition:
+  T = T0 + W·T_air,  A·T0 = second membre,  A·W = colonnes de couplage B
+(W calculé une fois par dt), puis un petit système zones × zones donne
+T_air. Les voxels sont vus à leur température de début de pas et
+reçoivent ensuite la somme des flux échangés avec toutes les parois qui
+les touchent (seul couplage explicite, vérifié par voxel: ΣG·dt/C < 1). L'énergie est conservée exactement; les couches fines
+(BA13...) ne limitent pas dt.
+"""
+
+import numpy as np
+from scipy.linalg import solve_banded
+
+from model_data import MATERIAUX
+
+TYPES_EXTREMITE = ("zone", "fixe", "voxels")
+
+
+class ParoiMulticouche:
+    """Paroi plane multicouche: géométrie, couplages et températures des mailles."""
+
+    def __init__(self, nom, couches, aire_m2, cote_a, cote_b, logger, ds_max=0.01, T_init=20.0):
+        """
+        Args:
+            nom: Nom de la paroi
+            couches: Liste de (nom_materiau, epaisseur_m), du côté a au côté b
+            aire_m2: Aire de la paroi (m²)
+            cote_a, cote_b: Extrémités, ex: {"type": "zone", "id_zone": -1, "h": 8.0},
+                            {"type": "fixe", "T": 0.0, "h": 25.0} ou
+                            {"type": "voxels", "indices": (i, j, k)}
+            logger: Logger instance
+            ds_max: Épaisseur maximale d'une maille (m)
+            T_init: Température initiale des mailles (°C)
+        """
+        self.nom = nom
+        self.logger = logger
+        self.couches = [(str(materiau), float(e)) for materiau, e in couches]
+        self.aire_m2 = float(aire_m2)
+        self.ds_max = float(ds_max)
+        self.cotes = (self._verifier_extremite(cote_a), self._verifier_extremite(cote_b))
+
+        if not self.couches or self.aire_m2 <= 0 or self.ds_max <= 0:
+            self.logger.error(f"Paroi '{nom}': couches, aire et ds_max doivent être non vides et > 0.")
+            raise ValueError("Paroi multicouche invalide.")
+
+        epaisseurs, conductivites, capacites = [], [], []
+        for materiau, e in self.couches:
+            props = MATERIAUX.get(materiau)
+            if props is None or props["type"] != "SOLIDE" or e <= 0:
+                self.logger.error(f"Paroi '{nom}': couche ({materiau}, {e} m) invalide (matériau SOLIDE, e > 0).")
+                raise ValueError("Couche de paroi invalide.")
+            nb = max(1, int(np.ceil(e / self.ds_max - 1e-9)))
+            epaisseurs += [e / nb] * nb
+            conductivites += [props["lambda"]] * nb
+            capacites += [props["rho"] * props["cp"]] * nb
+        self.dx = np.array(epaisseurs)
+        self.lam = np.array(conductivites)
+        self.rho_cp = np.array(capacites)
+        self.T = np.full(self.dx.size, float(T_init))
+
+        self.logger.info(f"Paroi '{nom}': {len(self.couches)} couches, {self.dx.size} mailles, "
+                         f"{self.aire_m2:.2f} m², U = {self.coefficient_U():.3f} W/m².K")
+
+    def _verifier_extremite(self, cote):
+        cote = dict(cote)
+        if cote.get("type") not in TYPES_EXTREMITE:
+            self.logger.error(f"Extrémité de paroi {cote}: type attendu parmi {TYPES_EXTREMITE}.")
+            raise ValueError("Extrémité de paroi invalide.")
+        if cote["type"] == "voxels":
+            cote["indices"] = tuple(np.asarray(idx, dtype=np.intp) for idx in cote["indices"])
+            if cote["indices"][0].size == 0:
+                self.logger.error(f"Paroi '{self.nom}': aucune voxel de couplage.")
+                raise ValueError("Extrémité de paroi sans voxel.")
+        elif float(cote.get("h", 0.0)) <= 0:
+            self.logger.error(f"Extrémité de paroi {cote}: coefficient h > 0 requis.")
+            raise ValueError("Extrémité de paroi invalide.")
+        return cote
+
+    def coefficient_U(self):
+        """Coefficient de transmission surfacique (W/m².K), résistances de surface comprises."""
+        R = float(np.sum(self.dx / self.lam))
+        R += sum(1.0 / cote["h"] for cote in self.cotes if cote["type"] != "voxels")
+        return 1.0 / R
+
+    def energie_J(self):
+        """Énergie stockée (J, référence 0°C)."""
+        return float(np.sum(self.rho_cp * self.dx * self.T)) * self.aire_m2
+
+
+class EnsembleParois:
+    """Avance toutes les parois d'un modèle (un système tridiagonal unique)."""
+
+    def __init__(self, parois, modele, dt, logger):
+        """
+        Args:
+            parois: Liste de ParoiMulticouche (modele.parois)
+            modele: ModeleMaison préparé (zones, RhoCp, Lambda, volumes des voxels)
+            dt: Pas de temps (s)
+            logger: Logger instance
+        """
+        self.parois = parois
+        self.logger = logger
+        self.zones_air = modele.zones_air
+        self.zones = modele.etat_zones()
+        self.debuts = np.cumsum([0] + [p.dx.size for p in parois])
+        n = int(self.debuts[-1])
+
+        aires = np.concatenate([np.full(p.dx.size, p.aire_m2) for p in parois])
+        dx = np.concatenate([p.dx for p in parois])
+        lam = np.concatenate([p.lam for p in parois])
+        self.capacites = np.concatenate([p.rho_cp for p in parois]) * dx * aires  # J/K
+
+        # Conductances entre mailles voisines d'une même paroi (0 entre parois)
+        self.G_interne = aires[:-1] / (0.5 * dx[:-1] / lam[:-1] + 0.5 * dx[1:] / lam[1:])
+        self.G_interne[self.debuts[1:-1] - 1] = 0.0
+
+        # Extrémités: maille de bord, conductance totale, couplage
+        volumes = modele.params.volumes_m3() if not modele.params.uniforme else None
+        RhoCp, Lambda = modele.RhoCp, modele.Lambda
+        self.extremites = []
+        for p, debut in zip(parois, self.debuts[:-1]):
+            for nom_cote, cote, locale in zip("ab", p.cotes, (0, p.dx.size - 1)):
+                maille = debut + locale
+                demi_maille = 0.5 * dx[maille] / lam[maille]
+                ext = {"paroi": p, "cote": cote, "nom_cote": nom_cote, "maille": int(maille), "locale": locale}
+                if cote["type"] == "voxels":
+                    idx = cote["indices"]
+                    if np.any(modele.Alpha[idx] <= 0):
+                        self.logger.error(f"Paroi '{p.nom}': les voxels de couplage doivent être solides.")
+                        raise ValueError("Couplage paroi-voxels: voxels solides uniquement.")
+                    V = modele.params.ds ** 3 if volumes is None else volumes[idx]
+                    demi_voxel = 0.5 * np.cbrt(V) / Lambda[idx]
+                    ext["G"] = (p.aire_m2 / idx[0].size) / (demi_maille + demi_voxel)
+                    ext["C"] = RhoCp[idx] * V
+                    ext["indices"] = idx
+                else:
+                    ext["G"] = p.aire_m2 / (demi_maille + 1.0 / cote["h"])
+                    if cote["type"] == "zone" and cote["id_zone"] not in self.zones_air:
+                        self.logger.error(f"Paroi '{p.nom}': zone {cote['id_zone']} inexistante.")
+                        raise ValueError("Zone d'air de la paroi inexistante.")
+                self.extremites.append(ext)
+
+        self.G_bord = np.zeros(n)
+        for ext in self.extremites:
+            self.G_bord[ext["maille"]] += np.sum(ext["G"])
+
+        # Voxels couplés (une entrée par voxel, même s'il touche plusieurs parois)
+        voxels = [ext for ext in self.extremites if ext["cote"]["type"] == "voxels"]
+        forme = modele.Materiau.shape
+        plats = [np.ravel_multi_index(ext["indices"], forme) for ext in voxels]
+        uniques, rangs = np.unique(np.concatenate([np.empty(0, dtype=np.intp)] + plats), return_inverse=True)
+        debut = 0
+        for ext, plat in zip(voxels, plats):
+            ext["G"] = np.broadcast_to(ext["G"], plat.shape).astype(np.float64)
+            ext["rangs"] = rangs[debut:debut + plat.size]
+            debut += plat.size
+        self.voxels = np.unravel_index(uniques, forme)
+        self.capacites_voxels = np.zeros(uniques.size)
+        self.G_voxels = np.zeros(uniques.size)
+        for ext in voxels:
+            self.capacites_voxels[ext["rangs"]] = ext["C"]
+            np.add.at(self.G_voxels, ext["rangs"], ext["G"])
+        self._T = np.empty(n)
+        self.dt = None
+        self.mettre_a_jour_dt(dt)
+
+        self.logger.info(f"Parois multicouches: {len(parois)} parois, {n} mailles 1D "
+                         f"({sum(p.aire_m2 for p in parois):.1f} m²)")
+
+    def mettre_a_jour_dt(self, dt):
+        """Assemble le système (C/dt + ΣG) pour le pas dt, les réponses W aux zones, et vérifie les voxels."""
+        self.dt = dt
+        diag = self.capacites / dt + self.G_bord
+        diag[:-1] += self.G_interne
+        diag[1:] += self.G_interne
+        self._ab = np.zeros((3, diag.size))
+        self._ab[0, 1:] = -self.G_interne
+        self._ab[1] = diag
+        self._ab[2, :-1] = -self.G_interne
+
+        # Zones couplées: colonnes B (G sur les mailles de bord), réponses W = A⁻¹·B
+        self.ids_zones = sorted({ext["cote"]["id_zone"] for ext in self.extremites
+                                 if ext["cote"]["type"] == "zone"})
+        self._B = np.zeros((diag.size, len(self.ids_zones)))
+        for ext in self.extremites:
+            if ext["cote"]["type"] == "zone":
+                self._B[ext["maille"], self.ids_zones.index(ext["cote"]["id_zone"])] += ext["G"]
+        self._W = solve_banded((1, 1), self._ab, self._B, check_finite=False)
+        self.rangs_zones = np.array([self.zones.ids.index(id_zone) for id_zone in self.ids_zones], dtype=np.intp)
+        C_air = self.zones.capacites[self.rangs_zones]
+        if np.any(C_air <= 0):
+            self.logger.error("Parois couplées à une zone d'air de capacité nulle (preparer_simulation?).")
+            raise ValueError("Zone d'air de la paroi sans capacité thermique.")
+        self._C_air_dt = C_air / dt
+        self._M = np.diag(self._C_air_dt + self._B.sum(axis=0)) - self._B.T @ self._W
+
+        # Couplage explicite aux voxels: le flux d'un pas (toutes parois cumulées) ne doit pas dépasser l'écart
+        if np.any(self.G_voxels * dt > self.capacites_voxels):
+            noms = sorted({ext["paroi"].nom for ext in self.extremites if ext["cote"]["type"] == "voxels"})
+            self.logger.error(f"Parois {noms}: couplage aux voxels instable pour dt={dt}s.")
+            raise ValueError("Couplage paroi-voxels instable (réduire dt).")
+
+    def pas(self, T_grille, copies=()):
+        """
+        Avance les parois et l'air des zones couplées d'un pas dt, puis
+        applique les flux aux voxels de T_grille (et des grilles copies).
+        """
+        dt = self.dt
+        for p, debut in zip(self.parois, self.debuts[:-1]):
+            self._T[debut:debut + p.dx.size] = p.T
+
+        # Second membre: C/dt·T + G·T (limites fixes, voxels au début du pas)
+        rhs = self.capacites / dt * self._T
+        T_voxels = T_grille[self.voxels].astype(np.float64)
+        for ext in self.extremites:
+            cote = ext["cote"]
+            if cote["type"] == "fixe":
+                rhs[ext["maille"]] += ext["G"] * cote["T"]
+            elif cote["type"] == "voxels":
+                rhs[ext["maille"]] += np.sum(ext["G"] * T_voxels[ext["rangs"]])
+        T_new = solve_banded((1, 1), self._ab, rhs, check_finite=False)
+
+        # Air des zones (implicite): M·T_air = C/dt·T_air(t) + Bᵀ·T0
+        if self.ids_zones:
+            T_air = np.linalg.solve(self._M, self._C_air_dt * self.zones.T[self.rangs_zones] + self._B.T @ T_new)
+            T_new += self._W @ T_air
+            self.zones.T[self.rangs_zones] = T_air
+
+        for p, debut in zip(self.parois, self.debuts[:-1]):
+            p.T[:] = T_new[debut:debut + p.dx.size]
+
+        # Énergie cédée à chaque voxel (J), cumulée sur les parois, appliquée à toutes les grilles
+        if self.G_voxels.size:
+            energie_J = np.zeros(self.G_voxels.size)
+            for ext in self.extremites:
+                if ext["cote"]["type"] == "voxels":
+                    rangs = ext["rangs"]
+                    np.add.at(energie_J, rangs, ext["G"] * (T_new[ext["maille"]] - T_voxels[rangs]) * dt)
+            T_voxels += energie_J / self.capacites_voxels
+            for grille in (T_grille,) + tuple(copies):
+                grille[self.voxels] = T_voxels
+
+    def energie_J(self):
+        """Énergie stockée dans toutes les parois (J)."""
+        return sum(p.energie_J() for p in self.parois)
+
+    def flux_fixes_W(self):
+        """Puissance cédée à chaque extrémité "fixe" (W), état courant: {(nom_paroi, 'a'|'b'): W}."""
+        return {(ext["paroi"].nom, ext["nom_cote"]): ext["G"] * (ext["paroi"].T[ext["locale"]] - ext["cote"]["T"])
+                for ext in self.extremites if ext["cote"]["type"] == "fixe"}
+
+    def pertes_W(self):
+        """Puissance totale cédée aux extrémités "fixe" (W)."""
+        return sum(self.flux_fixes_W().values())
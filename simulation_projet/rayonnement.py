@@ -177,6 +177,42 @@ class ModeleRayonnement:
 
         return dT_rayonnement
 
+    def calculer_dT_surfaces(self, T_surfaces, RhoCp_surfaces, ds, dt, emissivite_default=0.85,
+                             aires_m2=None, volumes_m3=None):
+        """
+        Variante compacte de appliquer_rayonnement_surfaces_externes:
+        travaille directement sur les vecteurs des voxels de surface
+        (pas de tableau 3D plein).
+
+        Args:
+            T_surfaces: Températures des surfaces (°C, 1D array)
+            RhoCp_surfaces: Capacités volumiques des surfaces (1D array)
+            ds: Discrétisation spatiale (m)
+            dt: Pas de temps (s)
+            emissivite_default: Émissivité par défaut si inconnue
+            aires_m2, volumes_m3: Aire et volume de chaque voxel (grille non
+                                  uniforme); ds² et ds³ si None
+
+        Returns:
+            ΔT correction (1D array, même taille que T_surfaces)
+        """
+        if not self.enable_external:
+            return np.zeros_like(T_surfaces)
+
+        T_surfaces_K = T_surfaces + 273.15
+        A_face = ds * ds if aires_m2 is None else aires_m2
+        Q_rad_vec = emissivite_default * self.SIGMA * A_face * (
+            T_surfaces_K**4 - self.T_sky_K**4
+        )
+
+        C_voxel = RhoCp_surfaces * (ds**3 if volumes_m3 is None else volumes_m3)
+        return np.divide(
+            -Q_rad_vec * dt,
+            C_voxel,
+            out=np.zeros_like(Q_rad_vec),
+            where=C_voxel != 0
+        )
+
     def set_temperature_sky(self, T_sky_C):
         """Définir température du ciel (°C)."""
         self.T_sky_K = T_sky_C + 273.15
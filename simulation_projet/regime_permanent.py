@@ -0,0 +1,129 @@
+"""
+Module RÉGIME PERMANENT (résolution directe de l'équilibre).
+
+Au lieu de faire tourner lancer_simulation jusqu'à ce que les pertes ne
+bougent plus, on résout directement l'équilibre de OperateurThermique:
+
+  K·x + q_rad(x) = b
+
+- Sans rayonnement: un seul système linéaire creux.
+- Avec rayonnement: itérations de Newton sur la linéarisation
+  q(x) ≈ q(x_k) + 4·ε·σ·A·T_k³·(x - x_k) (converge en 3-5 itérations).
+
+Les inconnues sans aucun couplage (ex: solide en bord de domaine, ni
+conducteur ni surface) gardent leur température courante.
+"""
+
+import numpy as np
+import scipy.sparse as sp
+import scipy.sparse.linalg as spla
+
+from multigrille import MultigrilleGeometrique
+
+
+class SolveurRegimePermanent:
+    """Résout l'état d'équilibre conduction + convection (+ rayonnement)."""
+
+    SOLVEURS = ("bicgstab", "multigrille", "direct")
+
+    def __init__(self, operateur, rayonnement, ds, logger, solveur="bicgstab",
+                 tolerance=1e-10, iterations_max=5000, emissivite=0.85):
+        """
+        Args:
+            operateur: OperateurThermique (K, b)
+            rayonnement: ModeleRayonnement (pris en compte si enable_external)
+            ds: Discrétisation spatiale (m)
+            logger: Logger instance
+            solveur: "bicgstab" (itératif, préconditionneur Jacobi),
+                     "multigrille" (BiCGSTAB préconditionné par un cycle en V:
+                     nombre d'itérations quasi indépendant de ds) ou
+                     "direct" (factorisation LU, petits modèles uniquement)
+            tolerance: Tolérance relative du solveur linéaire
+            iterations_max: Nombre max d'itérations du solveur linéaire
+            emissivite: Émissivité des surfaces
+        """
+        if solveur not in self.SOLVEURS:
+            raise ValueError(f"Solveur '{solveur}' inconnu. Choix: {self.SOLVEURS}")
+        self.op = operateur
+        self.rayonnement = rayonnement
+        self.logger = logger
+        self.solveur = solveur
+        self.tolerance = tolerance
+        self.iterations_max = iterations_max
+        self.coeff_rad = emissivite * rayonnement.SIGMA * ds * ds
+
+        # Lignes vides (inconnue isolée): on fige sa valeur
+        self.lignes_vides = (self.op.K.diagonal() == 0)
+        self.K = (self.op.K + sp.diags(self.lignes_vides.astype(np.float64))).tocsr()
+        self.iterations_lineaires = 0
+
+        # Hiérarchie construite une fois sur K: le rayonnement n'ajoute qu'une
+        # petite diagonale, le préconditionneur reste valable pour Newton
+        self._M_multigrille = None
+        if solveur == "multigrille":
+            self._M_multigrille = MultigrilleGeometrique.depuis_operateur(
+                self.op, self.K, logger).preconditionneur()
+
+    def _resoudre_lineaire(self, A, b, x0):
+        """Résout A·x = b avec le solveur choisi."""
+        if self.solveur == "direct":
+            return spla.spsolve(A.tocsc(), b)
+
+        M = self._M_multigrille
+        if M is None:
+            diag_inv = 1.0 / A.diagonal()
+            M = spla.LinearOperator(A.shape, matvec=lambda v: diag_inv * v)
+        nb_iter = [0]
+
+        def compter(_):
+            nb_iter[0] += 1
+
+        x, info = spla.bicgstab(A, b, x0=x0, rtol=self.tolerance, maxiter=self.iterations_max,
+                                M=M, callback=compter)
+        self.iterations_lineaires += nb_iter[0]
+        if info != 0:
+            self.logger.warn(f"Régime permanent: solveur linéaire non convergé (info={info}).")
+        return x
+
+    def resoudre(self, x0, tolerance_K=1e-6, iterations_newton_max=20):
+        """
+        Calcule l'état d'équilibre.
+
+        Args:
+            x0: État initial (sert de valeur figée pour les lignes vides et d'estimation)
+            tolerance_K: Critère d'arrêt de Newton sur max|Δx| (K)
+            iterations_newton_max: Nombre max d'itérations de Newton
+
+        Returns:
+            (x, q_rad_W): état d'équilibre et puissance rayonnée totale (W)
+        """
+        b = self.op.b.copy()
+        b[self.lignes_vides] = x0[self.lignes_vides]
+        surf = self.op.surfaces_rayonnement
+
+        if not self.rayonnement.enable_external or surf.size == 0:
+            return self._resoudre_lineaire(self.K, b, x0), 0.0
+
+        x = x0.copy()
+        for iteration in range(iterations_newton_max):
+            T_K = x[surf] + 273.15
+            q = self.coeff_rad * (T_K ** 4 - self.rayonnement.T_sky_K ** 4)
+            dq = 4.0 * self.coeff_rad * T_K ** 3
+
+            diag_rad = np.zeros(self.op.n)
+            diag_rad[surf] = dq
+            second_membre = b.copy()
+            second_membre[surf] += -q + dq * x[surf]
+
+            x_new = self._resoudre_lineaire(self.K + sp.diags(diag_rad), second_membre, x)
+            delta = np.max(np.abs(x_new - x))
+            x = x_new
+            self.logger.debug(f"Régime permanent: Newton {iteration + 1}, max|Δx|={delta:.2e} K")
+            if delta < tolerance_K:
+                break
+        else:
+            self.logger.warn(f"Régime permanent: Newton non convergé (max|Δx|={delta:.2e} K).")
+
+        T_K = x[surf] + 273.15
+        q_rad_W = float(np.sum(self.coeff_rad * (T_K ** 4 - self.rayonnement.T_sky_K ** 4)))
+        return x, q_rad_W
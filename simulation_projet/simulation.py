@@ -5,84 +5,117 @@ from modele import ModeleMaison
 from parametres import ParametresSimulation
 from stockage import StockageResultats
 from rayonnement import ModeleRayonnement
+from noyau_creux import NoyauConductionCreux
+from noyau_multi_pas import NoyauConductionMultiPas
+from noyau_numba import NoyauNumba, NUMBA_DISPONIBLE
+from noyau_parallele import MoteurParallele
+from noyau_tampons import NoyauTampons
+from paroi_multicouche import EnsembleParois
+from sol_semi_infini import SolSemiInfini
+from symetrie import PlansSymetrie
+from operateur import OperateurThermique
+from solveur_implicite import SolveurImplicite
+from regime_permanent import SolveurRegimePermanent
+from bilan_energie import Bilan, ComptableEnergie
 import numpy as np
 import time
 
 
-class Bilan:
-    """Classe pour tracker le bilan d'énergie de la simulation."""
-
-    def __init__(self):
-        self.energie_initiale = 0.0
-        self.energies = []  # List of (temps, energie_totale, erreur_prc)
-
-    def calculer_energie_totale(self, T, RhoCp, zones_air):
-        """
-        Calcule l'énergie thermique totale du système:
-        E = sum(ρ·cp·V·T) pour solides + sum(ρ·cp·V·T) pour air
-        """
-        ds3 = RhoCp[0, 0, 0] if RhoCp[0, 0, 0] > 0 else 1.0  # Hack pour ds^3
-
-        # Énergie des solides (J)
-        masque_solide = (RhoCp > 0)
-        E_solides = np.sum(RhoCp[masque_solide] * T[masque_solide])
-
-        # Énergie des zones d'air (J)
-        E_air = 0.0
-        for zone in zones_air.values():
-            E_air += zone.capacite_thermique_J_K * zone.T
-
-        return E_solides + E_air
-
-    def enregistrer(self, temps_s, T, RhoCp, zones_air):
-        """Enregistre l'état d'énergie."""
-        E = self.calculer_energie_totale(T, RhoCp, zones_air)
-
-        if not self.energies:  # Premier appel
-            self.energie_initiale = E
-
-        erreur_prc = 100.0 * abs(E - self.energie_initiale) / max(abs(self.energie_initiale), 1.0)
-        self.energies.append((temps_s, E, erreur_prc))
-
-        return erreur_prc
-
-    def rapport_final(self, logger):
-        """Affiche un rapport de conservation d'énergie."""
-        if not self.energies:
-            return
-
-        temps_final, E_final, err_final = self.energies[-1]
-        temps_init, E_init, err_init = self.energies[0]
-
-        err_max = max([e[2] for e in self.energies])
-
-        logger.info("=" * 60)
-        logger.info("BILAN D'ÉNERGIE (VALIDATION NUMÉRIQUE)")
-        logger.info("=" * 60)
-        logger.info(f"Énergie initiale: {E_init:.2e} J")
-        logger.info(f"Énergie finale:   {E_final:.2e} J")
-        logger.info(f"Erreur absolue: {E_final - E_init:.2e} J")
-        logger.info(f"Erreur relative finale: {err_final:.4f}%")
-        logger.info(f"Erreur relative max: {err_max:.4f}%")
-        if err_max < 0.1:
-            logger.info("✓ EXCELLENT: Conservation d'énergie < 0.1%")
-        elif err_max < 1.0:
-            logger.info("✓ BON: Conservation d'énergie < 1%")
-        else:
-            logger.warn(f"⚠ ALERTE: Erreur > 1%, vérifier stabilité numérique")
-        logger.info("=" * 60)
-
-
 class Simulation:
     """Contient le moteur de calcul et la boucle temporelle.
 
     AMÉLIORATIONS (v2):
     - Couplage semi-implicite conduction-convection
-    - Conservation d'énergie tracée
-    - Pas de temps adaptatif (optionnel)
+    - Conservation d'énergie tracée (bilan_energie): énergie suivie par les
+      flux du pas, recomptée tous les `cadence_bilan` pas; historique borné
+    - Pertes vers les limites fixes sur une liste de faces figée (une lecture
+      par pas), réparties par orientation et matériau (pertes_detaillees_W)
+    - Pas de temps adaptatif (optionnel, `pas_adaptatif=True`): dt borné par
+      dt_min/dt_max (et la CFL en explicite), contrôlé par tolerance_pas_K.
+      En implicite, chaque nouveau dt refait le préconditionneur:
+      `preconditionneur="jacobi"` évite une factorisation ILU par pas
+    - Précision (`precision="float32"`): températures et coefficients du
+      stencil en float32 (moitié du trafic mémoire); bilans d'énergie,
+      sommes de surfaces et températures d'air restent en float64.
+      Moteurs explicites "numpy", "creux", "tampons" et "parallele"
+    - Recadrage (optionnel, `recadrer=True`): calcul sur la seule boîte
+      englobante des voxels non fixes + une couche de limites fixes
+      (ModeleMaison.recadrer). self.T est alors la grille recadrée;
+      grille_complete() la replace dans la grille complète (stockage)
+    - Grille non uniforme (ParametresSimulation(coords_m=...)): laplacien à
+      pas variable, aires d'échange et volumes de contrôle par voxel.
+      Moteur "numpy", schéma explicite, float64
+    - Parois multicouches 1D (modele.parois, ModeleMaison.ajouter_paroi):
+      avancées après chaque pas (EnsembleParois, implicite), couplées à
+      l'air des zones, aux limites et aux voxels. Pas fixe uniquement
+    - Sol semi-infini (optionnel, `sol=True` ou dict d'options de
+      SolSemiInfini): la limite fixe sous la couche de sol explicite
+      (matériaux de sol, TERRE par défaut) est pilotée par des colonnes 1D
+      de sol profond, dont l'énergie entre au bilan. Schéma explicite,
+      grille uniforme, pas fixe
+    - Symétrie (optionnel, `symetrie=True` pour la détection automatique ou
+      tuple d'axes déclarés): calcul sur la moitié (quart, huitième) du
+      modèle, plans adiabatiques (PlansSymetrie). grille_complete() et le
+      stockage reconstruisent le champ complet par miroir. Schéma
+      explicite, pas fixe
+
+    Moteurs de conduction (paramètre `moteur`):
+    - "numpy": laplacien sur toute la grille + masques (référence)
+    - "creux": uniquement les voxels solides actifs (indices pré-calculés),
+      résultat identique bit à bit à la référence
+    - "multi_pas": pas de temps local par voxel (sous-pas dt/2^k pour les
+      matériaux diffusifs), forme flux conservative; dt global libre de la CFL
+    - "numba": pas complet fusionné et compilé (optionnel, nécessite numba),
+      tampons de température échangés au lieu d'être recopiés
+    - "parallele": tranches en x sur un pool de `nb_threads` threads,
+      résultat indépendant du nombre de threads; pool libéré en fin de
+      lancer_simulation (ou par fermer() si les pas sont appelés à la main)
+    - "tampons": pas complet sans allocation (tampons préalloués, out=,
+      grilles échangées), identique bit à bit à la référence
+
+    Schémas temporels (paramètre `schema`):
+    - "explicite": FTCS + convection semi-implicite (limité par la CFL)
+    - "euler_implicite" / "crank_nicolson": conduction + convection dans un
+      seul système linéaire creux, inconditionnellement stable (dt libre).
+      `preconditionneur`: "ilu" (défaut), "jacobi" (sans coût de
+      factorisation, quelques itérations de plus) ou "multigrille"
     """
 
-    def __init__(self, modele, chemin_sortie="resultats_sim", enable_rayonnement=True):
+    MOTEURS = ("numpy", "creux", "multi_pas", "numba", "parallele", "tampons")
+    SCHEMAS = ("explicite", "euler_implicite", "crank_nicolson")
+    PRECISIONS = ("float64", "float32")
+    ORIENTATIONS = ("x-", "x+", "y-", "y+", "z-", "z+")  # Normale sortante des faces de pertes
+
+    def __init__(self, modele, chemin_sortie="resultats_sim", enable_rayonnement=True,
+                 moteur="numpy", schema="explicite", preconditionneur="ilu",
+                 pas_adaptatif=False, tolerance_pas_K=0.05, dt_min=1.0, dt_max=3600.0,
+                 nb_threads=None, recadrer=False, precision="float64", sol=None, symetrie=None,
+                 cadence_bilan=100):
+        self.modele_complet = modele
+        modeles = [modele]  # Modèles lus pendant l'initialisation (caches de propriétés libérés à la fin)
+        self.boite = None
+        if recadrer:
+            modele, self.boite = modele.recadrer()
+            modeles.append(modele)
+        self.symetrie = None
+        if symetrie:
+            if schema != "explicite" or pas_adaptatif:
+                modele.logger.error(f"Symétrie non disponible (schéma {schema}, pas adaptatif={pas_adaptatif}).")
+                raise ValueError("Symétrie: schéma explicite, pas fixe uniquement.")
+            plans = PlansSymetrie(modele, modele.logger, axes=None if symetrie is True else symetrie)
+            if plans.etapes:
+                self.symetrie = plans
+                modele = plans.modele_reduit
+                modeles.append(modele)
+        if precision not in self.PRECISIONS:
+            raise ValueError(f"Précision '{precision}' inconnue. Choix: {self.PRECISIONS}")
+        if precision == "float32":
+            if schema != "explicite" or moteur not in ("numpy", "creux", "tampons", "parallele"):
+                modele.logger.error(f"Précision float32 non disponible (schéma {schema}, moteur {moteur}).")
+                raise ValueError("float32: schéma explicite et moteur numpy/creux/tampons/parallele uniquement.")
+            modele = modele.en_precision(np.float32)
+            modeles.append(modele)
+        self.precision = precision
         self.modele = modele
         self.params = modele.params  # Récupère les params depuis le modèle
         self.logger = modele.logger  # Récupère le logger depuis le modèle
@@ -92,25 +125,209 @@ class Simulation:
 
         self.T = np.copy(self.modele.T)
         self.T_suivant = np.copy(self.T)
+        self.dt = self.params.dt  # Pas courant (varie si pas_adaptatif)
 
         self.masque_fixe = (self.modele.Alpha <= 0)
         self.masque_solide = (self.modele.Alpha > 0)
+        # Diffusivité des voxels solides intérieurs (moteur numpy: pas de relecture de la grille Alpha)
+        self._alpha_interieur = self.modele.Alpha[1:-1, 1:-1, 1:-1][self.masque_solide[1:-1, 1:-1, 1:-1]]
+
+        if schema not in self.SCHEMAS:
+            raise ValueError(f"Schéma '{schema}' inconnu. Choix: {self.SCHEMAS}")
+        self.schema = schema
+
+        self._geometrie = None  # Grille non uniforme: coefficients, aires, volumes
+        self._faces_pertes = None  # Faces vers les limites fixes (_preparer_faces_pertes)
+        self._volumes_bilan = self.params.ds ** 3  # Volume de contrôle (grille si non uniforme)
+        if not self.params.uniforme:
+            if schema != "explicite" or moteur != "numpy" or precision != "float64" or pas_adaptatif:
+                self.logger.error(f"Grille non uniforme non disponible (schéma {schema}, moteur {moteur}, "
+                                  f"{precision}, pas adaptatif={pas_adaptatif}).")
+                raise ValueError("Grille non uniforme: moteur numpy, schéma explicite, float64, pas fixe.")
+            self._geometrie = self._preparer_grille_non_uniforme()
+            self._volumes_bilan = self._geometrie["volumes"]
+
+        # Tables plates des surfaces de convection (aires et capacités propres à chaque entrée)
+        self._surfaces = self.modele.tables_surfaces()
+        if self.symetrie is not None:
+            poids = np.broadcast_to(self.symetrie.poids_voxels(), self.T.shape)
+            self._volumes_bilan = poids * self._volumes_bilan
+            if self.symetrie.plans_centres:
+                if moteur not in ("numpy", "creux", "multi_pas"):
+                    self.logger.error(f"Plan de symétrie au centre d'une couche de voxels: moteur {moteur} "
+                                      f"non disponible.")
+                    raise ValueError("Plan de symétrie au centre des voxels: moteur numpy, creux ou multi_pas.")
+                # La couche du milieu compte pour moitié (aire et capacité: dT par voxel inchangé)
+                tables = self._surfaces
+                poids_entrees = np.ascontiguousarray(poids).reshape(-1)[tables["indices"]]
+                aires = tables["aires"] * poids_entrees
+                self._surfaces = dict(tables, aires=aires, inv_capacites=tables["inv_capacites"] / poids_entrees,
+                                      aires_zones=np.bincount(tables["zone"], aires,
+                                                              minlength=len(tables["ids_zones"])))
+
+        # État des zones d'air en tableaux (ordre des tables), conductances de convection h·A
+        self.zones = self.modele.etat_zones()
+        self.zones.hA[:] = self.params.h_convection * self._surfaces["aires_zones"]
 
         if np.any(self.masque_solide):
             alpha_max = np.max(self.modele.Alpha[self.masque_solide])
             ds2 = self.params.ds ** 2
             facteur_cfl = (alpha_max * self.params.dt) / ds2
+            if self._geometrie is not None:
+                # CFL locale: α·dt·Σ_axes 2/(h⁻·h⁺) <= 1, ramenée à la convention α·dt/ds² <= 1/6
+                interieur = self.masque_solide[1:-1, 1:-1, 1:-1]
+                facteur_cfl = float(np.max(
+                    (self.modele.Alpha[1:-1, 1:-1, 1:-1] * self.params.dt * self._geometrie["somme"] / 6.0)[interieur],
+                    initial=0.0))
 
             self.logger.info(f"Alpha max (solides): {alpha_max:0.2e}")
             self.logger.info(f"Facteur de stabilité (CFL): {facteur_cfl:.4f}")
-            if facteur_cfl > (1 / 6):
+            if schema != "explicite":
+                self.logger.info(f"Schéma {schema}: inconditionnellement stable, pas de limite CFL.")
+            elif moteur == "multi_pas":
+                self.logger.info("Moteur multi-pas: CFL respectée localement par sous-pas.")
+            elif facteur_cfl > (1 / 6):
                 self.logger.error(f"Instabilité détectée! CFL ({facteur_cfl:.4f}) > 0.166.")
                 raise ValueError("Simulation instable (CFL).")
         else:
             self.logger.warn("Aucun matériau solide trouvé. Impossible de vérifier la stabilité.")
 
+        if moteur not in self.MOTEURS:
+            raise ValueError(f"Moteur '{moteur}' inconnu. Choix: {self.MOTEURS}")
+        self.moteur = moteur
+        self.noyau = None
+        if moteur == "creux":
+            self.noyau = NoyauConductionCreux(
+                self.modele.Alpha, self.masque_solide, self.params.ds, self.params.dt, self.logger
+            )
+        elif moteur == "multi_pas":
+            self.noyau = NoyauConductionMultiPas(
+                self.modele.Alpha, [self.modele.Lambda_axe(a) for a in range(3)],
+                self.modele.RhoCp, self.masque_solide, self.params.ds, self.params.dt, self.logger
+            )
+        elif moteur == "numba":
+            if not NUMBA_DISPONIBLE:
+                self.logger.error("Moteur 'numba' demandé mais numba n'est pas installé.")
+                raise ValueError("Moteur 'numba' indisponible (pip install numba).")
+            self.noyau = NoyauNumba(self.modele, self.params.ds, self.params.dt, self.logger)
+        elif moteur == "parallele":
+            self.noyau = MoteurParallele(self.modele, self.params.ds, self.params.dt, self.logger,
+                                         nb_threads=nb_threads)
+        elif moteur == "tampons":
+            self.noyau = NoyauTampons(self.modele, self.params.ds, self.params.dt, self.logger)
+        # Voxels de surface (convection, rayonnement) et leur ρ·cp
+        indices_surfaces = [np.ravel_multi_index(idx, self.T.shape)
+                            for idx in self.modele.surfaces_convection_idx.values()]
+        self._indices_surfaces = np.unique(
+            np.concatenate([np.empty(0, dtype=np.intp)] + indices_surfaces)
+        ).astype(np.intp)
+        self._RhoCp_surfaces = self.modele.RhoCp.reshape(-1)[self._indices_surfaces]
+        if self.noyau is not None:
+            # Voxels modifiés pendant un pas: solides actifs + surfaces (convection, rayonnement)
+            self._indices_modifies = np.union1d(self.noyau.indices, self._indices_surfaces)
+        self.logger.info(f"Moteur de conduction: {moteur} ({precision})")
+
+        self.parois = None
+        if getattr(self.modele, "parois", None):
+            if pas_adaptatif:
+                self.logger.error("Parois multicouches: pas adaptatif non disponible.")
+                raise ValueError("Parois multicouches: pas de temps fixe uniquement.")
+            self.parois = EnsembleParois(self.modele.parois, self.modele, self.params.dt, self.logger)
+
+        self.sol = None
+        if sol:
+            if schema != "explicite" or pas_adaptatif:
+                self.logger.error(f"Sol semi-infini non disponible (schéma {schema}, pas adaptatif={pas_adaptatif}).")
+                raise ValueError("Sol semi-infini: schéma explicite, pas fixe uniquement.")
+            options_sol = sol if isinstance(sol, dict) else {}
+            self.sol = SolSemiInfini(self.modele, self.params.dt, self.logger, **options_sol)
+
+        self.operateur = None
+        self.solveur = None
+        if schema != "explicite":
+            if moteur != "numpy":
+                self.logger.warn(f"Moteur '{moteur}' ignoré: le schéma {schema} a son propre solveur.")
+            self.operateur = OperateurThermique(self.modele, self.T, self.logger)
+            self.solveur = SolveurImplicite(self.operateur, schema, self.rayonnement,
+                                            self.params.ds, self.logger,
+                                            preconditionneur=preconditionneur)
+
+        # --- Pas de temps adaptatif ---
+        self.pas_adaptatif = pas_adaptatif
+        self.tolerance_pas_K = tolerance_pas_K
+        self.dt_min = dt_min
+        self.dt_max = dt_max
+        if pas_adaptatif:
+            if schema == "explicite" and moteur != "multi_pas" and np.any(self.masque_solide):
+                # L'explicite reste limité par la CFL (alpha·dt/ds² <= 1/6) et par la
+                # constante de temps air <-> parois (convection découplée des solides).
+                # À mi-limite les modes raides sont amortis sans osciller.
+                dt_cfl = self.params.ds ** 2 / (6.0 * np.max(self.modele.Alpha[self.masque_solide]))
+                self.dt_max = min(dt_max, 0.5 * dt_cfl)
+                for id_zone, zone in self.modele.zones_air.items():
+                    nb_surfaces = self.modele.surfaces_convection_idx[id_zone][0].size
+                    if zone.capacite_thermique_J_K > 0 and nb_surfaces > 0:
+                        g_total = self.params.h_convection * self.params.ds ** 2 * nb_surfaces
+                        self.dt_max = min(self.dt_max, 0.5 * zone.capacite_thermique_J_K / g_total)
+            if self.dt_min > self.dt_max:
+                self.logger.error(f"Pas adaptatif: dt_min ({dt_min}s) > dt_max ({self.dt_max:.2f}s).")
+                raise ValueError("Bornes du pas adaptatif incohérentes.")
+            if self.operateur is None:
+                # Sert uniquement à l'estimation d'erreur (dx/dt)
+                self.operateur = OperateurThermique(self.modele, self.T, self.logger)
+            self.logger.info(f"Pas adaptatif: tolérance {tolerance_pas_K} K, "
+                             f"dt ∈ [{self.dt_min}, {self.dt_max:.1f}] s")
+
+        # Bilan d'énergie: suivi par les flux (FTCS uniforme à pas fixe), sinon recomptage à chaque pas
+        indices_surfaces = [self._surfaces["surfaces"]]
+        if self.parois is not None:
+            indices_surfaces += [np.ravel_multi_index(ext["indices"], self.T.shape)
+                                 for ext in self.parois.extremites if "indices" in ext]
+        self.comptable = ComptableEnergie(
+            self.modele, self._volumes_bilan, self.params.ds, self.bilan, self.logger,
+            incremental=(schema == "explicite" and moteur != "multi_pas" and self._geometrie is None
+                         and not pas_adaptatif),
+            cadence=cadence_bilan, indices_surfaces=np.concatenate(indices_surfaces))
+
+        # Tableaux compacts extraits: les grilles de propriétés ne restent pas en mémoire pendant le calcul
+        for modele_lu in modeles:
+            modele_lu.liberer_proprietes()
+
         self.logger.info("Simulation initialisée (v2: semi-implicite + bilan énergie + rayonnement).")
 
+    def _preparer_grille_non_uniforme(self):
+        """
+        Grandeurs géométriques d'une grille non uniforme (calculées une fois):
+        - coeffs: par axe, (1/(h⁺·w), 1/(h⁻·w)) sur les points intérieurs
+          (h: pas vers le voisin, w: largeur du volume de contrôle)
+        - surfaces: indices plats, aires, volumes et ρ·cp de l'union des surfaces
+        - volumes: grille des volumes de contrôle (bilan d'énergie)
+        """
+        p = self.params
+        coeffs = []
+        somme = 0.0
+        for axe in range(3):
+            pas, largeurs = p.pas_m(axe), p.largeurs_m(axe)
+            forme = [1, 1, 1]
+            forme[axe] = pas.size - 1
+            c_plus = (1.0 / (pas[1:] * largeurs[1:-1])).reshape(forme)
+            c_moins = (1.0 / (pas[:-1] * largeurs[1:-1])).reshape(forme)
+            coeffs.append((c_plus, c_moins))
+            somme = somme + c_plus + c_moins
+
+        volumes = p.volumes_m3()
+
+        indices = np.unique(np.concatenate([np.empty(0, dtype=np.intp)] + [
+            np.ravel_multi_index(idx, volumes.shape) for idx in self.modele.surfaces_convection_idx.values()
+        ])).astype(np.intp)
+        indices_tuple = np.unravel_index(indices, volumes.shape)
+        surfaces = (indices, self.modele.aires_surfaces(indices_tuple), volumes[indices_tuple],
+                    self.modele.RhoCp[indices_tuple])
+
+        self.logger.info(f"Grille non uniforme: volumes de {volumes.min() * 1e6:.1f} cm³ "
+                         f"à {volumes.max() * 1e3:.1f} dm³")
+        return {"coeffs": coeffs, "somme": somme, "surfaces": surfaces, "volumes": volumes}
+
     def lancer_simulation(self, duree_s, intervalle_stockage_s=600):
         """Lance la boucle de simulation principale avec couplage semi-implicite.
 
@@ -125,46 +342,55 @@ class Simulation:
         dt = self.params.dt
 
         self.logger.info(f"Lancement de la simulation pour {duree_s}s...")
-        self.logger.info(f"Schéma: Semi-implicite FTCS + Newton convection")
+        if self.solveur is None:
+            self.logger.info(f"Schéma: Semi-implicite FTCS + Newton convection")
+        else:
+            self.logger.info(f"Schéma: {self.schema} (système creux conduction + convection), dt={dt}s")
 
-        # Enregistrement bilan initial
-        self.bilan.enregistrer(temps_simule_s, self.T, self.modele.RhoCp, self.modele.zones_air)
+        # Enregistrement bilan initial (recomptage complet)
+        self.bilan.ajouter(temps_simule_s, self.comptable.recompter(self.T, self.zones, self.parois, self.sol),
+                           pertes_W=self._calculer_pertes_W())
 
         # Stockage de l'état initial
         self.stocker_etape_simulation(temps_simule_s)
         prochain_stockage_s += intervalle_stockage_s
 
-        while temps_simule_s <= duree_s:
-
-            # T_suivant contient T(t)
-            # self.T va contenir T(t+dt) après conduction
-            # Puis convection résout couplage à (t+dt)
-            # Puis rayonnement ajoute effet radiativité
+        try:
+            if self.pas_adaptatif:
+                self._boucle_pas_adaptatif(duree_s, intervalle_stockage_s)
+            else:
+                while temps_simule_s <= duree_s:
 
-            self._etape_conduction()
-            self._etape_convection_implicite()
-            self._etape_rayonnement()
+                    # T_suivant contient T(t)
+                    # self.T va contenir T(t+dt) après conduction
+                    # Puis convection résout couplage à (t+dt)
+                    # Puis rayonnement ajoute effet radiativité
 
-            # Appliquer les conditions limites (écraser T(t+dt))
-            self.T[self.masque_fixe] = self.T_suivant[self.masque_fixe]
+                    self._pas_de_temps()
+                    temps_simule_s += dt
 
-            # Mettre à jour l'état T(t) -> T(t+dt)
-            np.copyto(self.T_suivant, self.T)
-            temps_simule_s += dt
+                    # Enregistrer bilan d'énergie
+                    err_prc = self.bilan.ajouter(temps_simule_s,
+                                                 self.comptable.apres_pas(self.T, self.zones, self.parois, self.sol),
+                                                 pertes_W=self._calculer_pertes_W())
 
-            # Enregistrer bilan d'énergie
-            err_prc = self.bilan.enregistrer(temps_simule_s, self.T, self.modele.RhoCp, self.modele.zones_air)
+                    # Gérer le stockage
+                    if temps_simule_s >= prochain_stockage_s:
+                        self.stocker_etape_simulation(temps_simule_s)
+                        prochain_stockage_s += intervalle_stockage_s
 
-            # Gérer le stockage
-            if temps_simule_s >= prochain_stockage_s:
-                self.stocker_etape_simulation(temps_simule_s)
-                prochain_stockage_s += intervalle_stockage_s
-
-        # Stockage final
-        if (temps_simule_s - dt) < (prochain_stockage_s - intervalle_stockage_s):
-            self.stocker_etape_simulation(temps_simule_s)
+                # Stockage final
+                if (temps_simule_s - dt) < (prochain_stockage_s - intervalle_stockage_s):
+                    self.stocker_etape_simulation(temps_simule_s)
+        finally:
+            self.fermer()  # Threads du moteur parallèle
 
         self.logger.info("Simulation terminée.")
+        if self.symetrie is not None:
+            self.symetrie.synchroniser_zones()  # Zones du modèle complet (jumelles comprises)
+        if self.solveur is not None and self.solveur.nb_pas > 0:
+            self.logger.info(f"Solveur implicite: {self.solveur.iterations_total / self.solveur.nb_pas:.1f} "
+                             f"itérations/pas en moyenne.")
 
         temps_air_final = {zone.nom: zone.T for zone in self.modele.zones_air.values()}
         self.logger.info(f"--- Température Finale de l'Air: {temps_air_final} ---")
@@ -172,23 +398,253 @@ class Simulation:
         # Afficher bilan d'énergie
         self.bilan.rapport_final(self.logger)
 
+    def _boucle_pas_adaptatif(self, duree_s, intervalle_stockage_s):
+        """Boucle temporelle à pas adaptatif (estimation d'erreur emboîtée).
+
+        L'erreur locale est l'écart entre le pas d'Euler effectué et la
+        méthode des trapèzes, sans résolution supplémentaire:
+          err ≈ dt/2 · max|f(x(t+dt)) - f(x(t))|,  f = dx/dt (OperateurThermique)
+        Pas rejeté si err > tolerance_pas_K; dt suivant = dt·0.9·√(tol/err),
+        borné à [0.2, 2]·dt et à [dt_min, dt_max]. Les instants de stockage
+        et la fin de la simulation sont atteints exactement.
+        """
+        op = self.operateur
+        epsilon_s = 1e-9 * max(duree_s, 1.0)
+        temps_s = 0.0
+        prochain_stockage_s = intervalle_stockage_s
+        dt_propose = min(max(self.dt, self.dt_min), self.dt_max)
+        nb_acceptes, nb_rejetes = 0, 0
+        dt_min_utilise, dt_max_utilise = np.inf, 0.0
+
+        x = op.extraire_etat(self.T)
+        f = op.derivee(x)
+
+        while temps_s < duree_s - epsilon_s:
+            # Ne jamais sauter un instant de stockage
+            dt = min(dt_propose, prochain_stockage_s - temps_s, duree_s - temps_s)
+            tronque = dt < dt_propose
+            self._changer_dt(dt)
+            self._pas_de_temps()
+
+            x_new = op.extraire_etat(self.T)
+            f_new = op.derivee(x_new)
+            erreur_K = 0.5 * dt * float(np.max(np.abs(f_new - f), initial=0.0))
+            facteur = min(2.0, max(0.2, 0.9 * np.sqrt(self.tolerance_pas_K / max(erreur_K, 1e-12))))
+
+            if erreur_K > self.tolerance_pas_K and dt > self.dt_min:
+                # Pas rejeté: retour à l'état x(t)
+                op.injecter_etat(x, self.T)
+                self.T_suivant.reshape(-1)[op.indices_solides] = x[:op.n_solides]
+                nb_rejetes += 1
+                dt_propose = max(self.dt_min, dt * facteur)
+                self.logger.debug(f"t={temps_s:.0f}s: pas de {dt:.1f}s rejeté (err={erreur_K:.3f}K)")
+                continue
+
+            temps_s += dt
+            nb_acceptes += 1
+            dt_min_utilise = min(dt_min_utilise, dt)
+            dt_max_utilise = max(dt_max_utilise, dt)
+            x, f = x_new, f_new
+            if not tronque:
+                dt_propose = min(self.dt_max, max(self.dt_min, dt * facteur))
+
+            self.bilan.ajouter(temps_s, self.comptable.apres_pas(self.T, self.zones, self.parois, self.sol),
+                               pertes_W=self._calculer_pertes_W())
+
+            if temps_s >= prochain_stockage_s - epsilon_s:
+                self.stocker_etape_simulation(temps_s)
+                prochain_stockage_s += intervalle_stockage_s
+            elif temps_s >= duree_s - epsilon_s:
+                self.stocker_etape_simulation(temps_s)
+
+        self.nb_pas_acceptes = nb_acceptes
+        self.nb_pas_rejetes = nb_rejetes
+        self.logger.info(f"Pas adaptatif: {nb_acceptes} pas acceptés, {nb_rejetes} rejetés, "
+                         f"dt ∈ [{dt_min_utilise:.1f}, {dt_max_utilise:.1f}] s")
+
+    def _changer_dt(self, dt):
+        """Change le pas de temps courant (noyau creux recalculé si besoin)."""
+        if dt == self.dt:
+            return
+        self.dt = dt
+        if self.noyau is not None:
+            self.noyau.mettre_a_jour_dt(dt)
+        if self.parois is not None:
+            self.parois.mettre_a_jour_dt(dt)
+        if self.sol is not None:
+            self.sol.mettre_a_jour_dt(dt)
+
+    def resoudre_regime_permanent(self, solveur="bicgstab"):
+        """Calcule directement l'état d'équilibre (conduction + convection + rayonnement).
+
+        Équivalent à faire tourner lancer_simulation jusqu'à stabilisation de
+        _calculer_pertes_W, mais en une seule résolution creuse.
+
+        Args:
+            solveur: "bicgstab" (défaut), "multigrille" (grands modèles, ds fin)
+                     ou "direct" (petits modèles)
+
+        Returns:
+            dict: temperatures_air ({nom_zone: T}), pertes_W (vers les limites fixes),
+                  rayonnement_W (vers le ciel), iterations_lineaires
+        """
+        if self._geometrie is not None:
+            self.logger.error("Régime permanent non disponible sur grille non uniforme.")
+            raise ValueError("Régime permanent: grille uniforme uniquement.")
+        if self.parois is not None:
+            self.logger.error("Régime permanent non disponible avec des parois multicouches.")
+            raise ValueError("Régime permanent: parois multicouches non prises en compte.")
+        if self.sol is not None:
+            self.logger.error("Régime permanent non disponible avec le sol semi-infini.")
+            raise ValueError("Régime permanent: sol semi-infini non pris en compte.")
+        if self.symetrie is not None:
+            self.logger.error("Régime permanent non disponible avec les plans de symétrie.")
+            raise ValueError("Régime permanent: plans de symétrie non pris en compte.")
+        self.logger.info(f"Résolution du régime permanent (solveur: {solveur})...")
+        debut = time.time()
+
+        op = self.operateur
+        if op is None:
+            op = OperateurThermique(self.modele, self.T, self.logger)
+
+        resolveur = SolveurRegimePermanent(op, self.rayonnement, self.params.ds, self.logger,
+                                           solveur=solveur)
+        x, rayonnement_W = resolveur.resoudre(op.extraire_etat(self.T))
+
+        op.injecter_etat(x, self.T)
+        self.T_suivant.reshape(-1)[op.indices_solides] = x[:op.n_solides]
+
+        pertes_W = float(self._calculer_pertes_W())
+        temperatures_air = {zone.nom: zone.T for zone in self.modele.zones_air.values()}
+
+        self.logger.info(f"Régime permanent atteint en {time.time() - debut:.2f}s "
+                         f"({resolveur.iterations_lineaires} itérations linéaires).")
+        self.logger.info(f"--- Température de l'Air (équilibre): {temperatures_air} ---")
+        self.logger.info(f"Pertes vers les limites fixes: {pertes_W:.2f} W, "
+                         f"rayonnement vers le ciel: {rayonnement_W:.2f} W")
+
+        return {
+            "temperatures_air": temperatures_air,
+            "pertes_W": pertes_W,
+            "rayonnement_W": rayonnement_W,
+            "iterations_lineaires": resolveur.iterations_lineaires
+        }
+
+    def _pas_de_temps(self):
+        """Avance l'état d'un pas dt (sol profond, grille, plans de symétrie, parois multicouches)."""
+        if self.sol is not None:
+            # Fantômes du pas imposés dans les deux grilles (limites fixes lues dans l'une ou l'autre)
+            self.sol.pas(self.T, copies=(self.T_suivant,))
+        self.comptable.avant_pas(self.T, self.dt)  # Flux du bilan sur T(t), fantômes du sol compris
+        self._avancer_grille()
+        if self.symetrie is not None:
+            # Couches fantômes des plans: T(t+dt) du dernier voxel gardé, dans les deux grilles
+            self.symetrie.imposer_plans((self.T, self.T_suivant))
+        if self.parois is not None:
+            # T et T_suivant contiennent T(t+dt) aux voxels couplés: on écrit dans les deux
+            self.parois.pas(self.T, copies=(self.T_suivant,))
+
+    def _avancer_grille(self):
+        """Avance la grille d'un pas dt (conduction, convection, rayonnement, limites)."""
+        if self.solveur is not None:
+            self._pas_implicite()
+            return
+
+        if self.moteur == "numba":
+            # Écrit T(t+dt) dans l'autre tampon puis échange (aucune copie)
+            self.noyau.pas(self.T.reshape(-1), self.T_suivant.reshape(-1), self.rayonnement)
+            self.T, self.T_suivant = self.T_suivant, self.T
+            return
+
+        if self.moteur == "tampons":
+            self.noyau.pas(self.T, self.T_suivant, self.rayonnement)
+            self.T, self.T_suivant = self.T_suivant, self.T
+            return
+
+        if self.moteur == "parallele":
+            self.noyau.pas(self.T, self.T_suivant, self.dt, self.params.h_convection, self.rayonnement)
+            return
+
+        self._etape_conduction()
+        self._etape_convection_implicite()
+        self._etape_rayonnement()
+
+        if self.noyau is not None:
+            # Seuls les voxels actifs et les surfaces ont changé:
+            # les limites fixes sont intactes, on ne recopie que ces entrées.
+            T_plat = self.T.reshape(-1)
+            self.T_suivant.reshape(-1)[self._indices_modifies] = T_plat[self._indices_modifies]
+            return
+
+        # Appliquer les conditions limites (écraser T(t+dt))
+        self.T[self.masque_fixe] = self.T_suivant[self.masque_fixe]
+
+        # Mettre à jour l'état T(t) -> T(t+dt)
+        np.copyto(self.T_suivant, self.T)
+
+    def _pas_implicite(self):
+        """Pas implicite: un seul système linéaire pour solides + air."""
+        op = self.operateur
+        x = op.extraire_etat(self.T)
+        x = self.solveur.pas(x, self.dt)
+        op.injecter_etat(x, self.T)
+        # Les limites fixes ne bougent pas: seuls les solides sont recopiés
+        self.T_suivant.reshape(-1)[op.indices_solides] = x[:op.n_solides]
+
     def stocker_etape_simulation(self, temps_s):
         """Helper pour stocker l'état actuel."""
         pertes = self._calculer_pertes_W()
         temps_air_str = ", ".join([f"T_air_{z.nom}={z.T:.2f}°C" for z in self.modele.zones_air.values()])
         self.logger.debug(f"t={temps_s:.0f}s, {temps_air_str}, Pertes={pertes:.2f}W")
-        self.stockage.stocker_etape(temps_s, self.T, self.modele.zones_air)
+        zones = self.zones
+        if self.symetrie is not None:
+            self.symetrie.synchroniser_zones()
+            zones = self.symetrie.modele_complet.etat_zones()
+        self.stockage.stocker_etape(temps_s, self.grille_complete(), zones)
+
+    def fermer(self):
+        """Libère les ressources du moteur (pool de threads du moteur parallèle)."""
+        if hasattr(self.noyau, "fermer"):
+            self.noyau.fermer()
+
+    def grille_complete(self):
+        """Champ de température sur la grille complète du modèle (annule symétrie et recadrage)."""
+        T = self.T if self.symetrie is None else self.symetrie.grille_complete(self.T)
+        if self.boite is None:
+            return T
+        T_complet = np.copy(self.modele_complet.T)
+        T_complet[self.boite] = T
+        return T_complet
 
     def _etape_conduction(self):
         """Calcule un pas de temps (dt) de CONDUCTION."""
 
+        if self.noyau is not None:
+            self.noyau.avancer(self.T_suivant, self.T)
+            return
+
         T = self.T_suivant  # Lecture de T(t)
         T_new = self.T  # Écriture dans T(t+dt)
-        A = self.modele.Alpha
+        A = self._alpha_interieur  # Alpha des solides intérieurs (ordre de masque_interieur)
         ds2 = self.params.ds ** 2
-        dt = self.params.dt
+        dt = self.dt
         M = self.masque_solide
 
+        if self._geometrie is not None:
+            # Pas variable: Σ_axes [(T⁺ - T)/h⁺ - (T - T⁻)/h⁻] / w
+            (cx_p, cx_m), (cy_p, cy_m), (cz_p, cz_m) = self._geometrie["coeffs"]
+            T_c = T[1:-1, 1:-1, 1:-1]
+            laplacien_T = (
+                    cx_p * (T[2:, 1:-1, 1:-1] - T_c) + cx_m * (T[:-2, 1:-1, 1:-1] - T_c) +
+                    cy_p * (T[1:-1, 2:, 1:-1] - T_c) + cy_m * (T[1:-1, :-2, 1:-1] - T_c) +
+                    cz_p * (T[1:-1, 1:-1, 2:] - T_c) + cz_m * (T[1:-1, 1:-1, :-2] - T_c)
+            )
+            masque_interieur = M[1:-1, 1:-1, 1:-1]
+            T_new[1:-1, 1:-1, 1:-1][masque_interieur] = \
+                T_c[masque_interieur] + (A * dt) * \
+                laplacien_T[masque_interieur]
+            return
+
         laplacien_T = (
                 T[1:-1, 2:, 1:-1] + T[1:-1, :-2, 1:-1] +
                 T[2:, 1:-1, 1:-1] + T[:-2, 1:-1, 1:-1] +
@@ -200,7 +656,7 @@ class Simulation:
 
         T_new[1:-1, 1:-1, 1:-1][masque_interieur] = \
             T[1:-1, 1:-1, 1:-1][masque_interieur] + \
-            (A[1:-1, 1:-1, 1:-1][masque_interieur] * dt / ds2) * \
+            (A * dt / ds2) * \
             laplacien_T[masque_interieur]
 
     def _etape_convection_implicite(self):
@@ -211,83 +667,64 @@ class Simulation:
         - Convection couple solides et air de façon implicite pour t+dt
 
         Pour chaque zone air, on résout:
-          h·A_total·(T_solide - T_air) = C_air·dT_air/dt + h·A_surfaces·T_air
-        Via itération Newton ou simple point-fixe.
+          T_air(t+dt)·(1 + h·A·dt/C_air) = T_air(t) + h·A·dt/C_air · T_surf_moy
+        (T_surf_moy: moyenne des surfaces pondérée par les aires), puis chaque
+        surface échange h·a·(T_surf - T_air(t+dt))·dt. Point fixe sur 2
+        itérations au plus.
+
+        Toutes les zones sont traitées ensemble sur les tables plates de
+        ModeleMaison.tables_surfaces: réductions par zone (bincount), une
+        lecture et une écriture des surfaces par itération. Un voxel au
+        contact de deux zones cumule les deux échanges.
         """
+        self.convection_semi_implicite(self.T.reshape(-1), self._surfaces, self.zones,
+                                       self.params.h_convection, self.dt, self.logger)
 
-        T_solides_mid = self.T  # T après conduction (T intermédiaire, pas final)
-        T_solides_fin = self.T  # On va mettre à jour in-place
-        T_solides_t = self.T_suivant  # T(t) pour lectures
+    @staticmethod
+    def convection_semi_implicite(T_plat, tables, zones, h, dt, logger):
+        """
+        Pas de convection semi-implicite de _etape_convection_implicite, sur
+        un tableau plat de températures (voxels ou cellules) et des tables au
+        format ModeleMaison.tables_surfaces; partagé avec SimulationBlocs.
+        T_plat et zones.T sont mis à jour en place.
+        """
+        if tables["indices"].size == 0:
+            return
 
-        h = self.params.h_convection
-        dt = self.params.dt
-        surface_cellule = self.params.ds ** 2
-        ds3 = self.params.ds ** 3
+        T_air = zones.T.copy()
+        A_zones = tables["aires_zones"]
+        actives = (zones.capacites > 0) & (A_zones > 0)
+        k = np.divide(zones.hA * dt, zones.capacites, out=np.zeros_like(T_air), where=actives)
 
         # Itération: jusqu'à convergence du couplage
         nb_iter_max = 2  # 1 itération souvent suffisant pour h petit
         tolerance = 0.01  # Tolérance en K
 
         for iter_coupl in range(nb_iter_max):
-            dT_max = 0.0
-
-            for id_zone, zone in self.modele.zones_air.items():
-
-                T_air_ancien = zone.T
-                indices_tuple = self.modele.surfaces_convection_idx[id_zone]
-
-                if indices_tuple[0].size == 0:
-                    continue
-
-                # T surfaces actuelles (itération courante)
-                T_surfaces_vec = T_solides_fin[indices_tuple]
-                A_total = surface_cellule * indices_tuple[0].size
-
-                # --- Flux convectif moyen ---
-                # Q = h * A * (T_surf - T_air)
-                # Équilibre air: C_air * dT_air = Q * dt
-                # Résultat: T_air(t+dt) = T_air(t) + h*A*dt/(C_air) * (T_surf_moy - T_air(t+dt))
-
-                # Résoudre implicitement: T_air_new = f(T_air_new)
-                # Itération: T_air_new = T_air_old + h*A_tot*dt/C * (T_surf_moy - T_air_new)
-                # Rearrangé: T_air_new * (1 + h*A*dt/C) = T_air_old + h*A*dt/C * T_surf_moy
-
-                if zone.capacite_thermique_J_K > 0:
-                    coeff_implicit = 1.0 + (h * A_total * dt) / zone.capacite_thermique_J_K
-                    T_surf_moy = np.mean(T_surfaces_vec)
-                    T_air_new = (T_air_ancien + (h * A_total * dt / zone.capacite_thermique_J_K) * T_surf_moy) / coeff_implicit
-                else:
-                    T_air_new = T_air_ancien
-
-                dT_air = T_air_new - T_air_ancien
-                dT_max = max(dT_max, abs(dT_air))
-
-                # --- Mettre à jour l'air ---
-                zone.T = T_air_new
-
-                # --- Mettre à jour les solides (implicite aussi) ---
-                # Chaque surface échange: Q = h*A*(T_surf - T_air_new)
-                # dT_surf = -Q*dt / (ρ*cp*V)
-                delta_T_surf_vec = T_surfaces_vec - T_air_new
-                flux_W_vec = h * surface_cellule * delta_T_surf_vec
-                energie_J_vec = flux_W_vec * dt
-                capacite_J_K_vec = self.modele.RhoCp[indices_tuple] * ds3
-
-                delta_T_conv_vec = np.divide(
-                    energie_J_vec,
-                    capacite_J_K_vec,
-                    out=np.zeros_like(energie_J_vec),
-                    where=capacite_J_K_vec != 0
-                )
-
-                T_solides_fin[indices_tuple] -= delta_T_conv_vec
+            T_surfaces = T_plat[tables["surfaces"]]
+            T_entrees = T_surfaces[tables["position"]]
+
+            # --- Air: moyenne des surfaces pondérée par les aires, résolution implicite ---
+            somme = np.bincount(tables["zone"], tables["aires"] * T_entrees, minlength=T_air.size)
+            T_surf_moy = np.divide(somme, A_zones, out=np.zeros_like(somme), where=actives)
+            T_air_new = np.where(actives, (T_air + k * T_surf_moy) / (1.0 + k), T_air)
+            dT_max = float(np.max(np.abs(T_air_new - T_air)))
+            T_air = T_air_new
+
+            # --- Solides: dT = h·a·(T_surf - T_air(t+dt))·dt/(ρ·cp·V), cumulé par voxel ---
+            dT_entrees = (h * dt) * tables["aires"] * (T_entrees - T_air[tables["zone"]]) * tables["inv_capacites"]
+            for entrees, positions in tables["rangs"]:
+                T_surfaces[positions] -= dT_entrees[entrees]
+            T_plat[tables["surfaces"]] = T_surfaces
 
             # Vérifier convergence
             if dT_max < tolerance:
                 if iter_coupl > 0:
-                    self.logger.debug(f"Convection implicite: convergence en {iter_coupl+1} itérations (dT_max={dT_max:.4f}K)")
+                    logger.debug(f"Convection implicite: convergence en {iter_coupl+1} itérations (dT_max={dT_max:.4f}K)")
                 break
 
+        zones.T[:] = T_air
+
     def _etape_rayonnement(self):
         """Calcule l'effet du RAYONNEMENT THERMIQUE (Stefan-Boltzmann).
 
@@ -303,52 +740,165 @@ class Simulation:
 
         T = self.T
         ds = self.params.ds
-        dt = self.params.dt
+        dt = self.dt
+
+        if self._geometrie is not None:
+            # Grille non uniforme: aire et volume propres à chaque surface
+            indices, aires, volumes, RhoCp_surfaces = self._geometrie["surfaces"]
+            T_plat = T.reshape(-1)
+            T_surfaces = T_plat[indices]
+            T_plat[indices] = T_surfaces + self.rayonnement.calculer_dT_surfaces(
+                T_surfaces, RhoCp_surfaces, ds, dt, emissivite_default=0.85,
+                aires_m2=aires, volumes_m3=volumes
+            )
+            return
 
-        # Appliquer rayonnement aux surfaces externes
-        dT_rayonnement = self.rayonnement.appliquer_rayonnement_surfaces_externes(
-            T, self.modele.Lambda, self.modele.RhoCp,
-            self.modele.surfaces_convection_idx,
-            ds, dt, emissivite_default=0.85
+        # Uniquement les voxels de surface (même calcul que appliquer_rayonnement_surfaces_externes,
+        # sans grilles Lambda/RhoCp ni tableau plein)
+        T_plat = T.reshape(-1)
+        T_surfaces = T_plat[self._indices_surfaces]
+        T_plat[self._indices_surfaces] = T_surfaces + self.rayonnement.calculer_dT_surfaces(
+            T_surfaces, self._RhoCp_surfaces, ds, dt, emissivite_default=0.85
         )
 
-        # Ajouter correction de rayonnement
-        self.T += dT_rayonnement
-
-    def _calculer_pertes_W(self):
-        """Calcule les pertes de puissance (W) vers les 'LIMITE_FIXE'."""
-
+    def _preparer_faces_pertes(self):
+        """
+        Faces entre un voxel non fixe et une limite fixe (calculées une fois):
+        - paires: (2, n) indices plats (voxel, limite fixe)
+        - conductances: λ·aire/h de chaque face (W/K), poids de symétrie compris
+        - orientations: rang dans ORIENTATIONS (normale sortante du voxel)
+        - materiaux: rang dans noms_materiaux (matériau du voxel)
+        Les fantômes du sol semi-infini n'en font pas partie: ce flux reste
+        dans le bilan (colonnes), la perte est celle du fond des colonnes.
+        """
         T = self.T
-        L = self.modele.Lambda
         ds = self.params.ds
+        forme = T.shape
 
         masque_fixe = (self.modele.Alpha == 0)  # LIMITE_FIXE
+        if self.sol is not None:
+            masque_fixe[self.sol.indices_fantomes] = False
         masque_non_fixe = (self.modele.Alpha != 0)
+        noms = [entree["nom"] for entree in self.modele.table_materiaux]
+        noms_materiaux, codes = np.unique(noms, return_inverse=True)
+        codes = codes.reshape(-1)[self.modele.Materiau]
+
+        uniforme = self._geometrie is None
+        surface_cellule = ds * ds if uniforme else 1.0
+        largeurs = None if uniforme else [self.params.largeurs_m(axe) for axe in range(3)]
+
+        paires, conductances, orientations, materiaux = [], [], [], []
+        for axe in range(3):
+            L = self.modele.Lambda_axe(axe)
+            n = forme[axe]
+            bas = tuple(slice(0, n - 1) if a == axe else slice(None) for a in range(3))
+            haut = tuple(slice(1, n) if a == axe else slice(None) for a in range(3))
+            if uniforme:
+                pas, aire = ds, 1.0
+            else:
+                forme_axe = [1, 1, 1]
+                forme_axe[axe] = n - 1
+                pas = self.params.pas_m(axe).reshape(forme_axe)
+                aire = 1.0
+                for autre in range(3):
+                    if autre != axe:
+                        forme_axe = [1, 1, 1]
+                        forme_axe[autre] = forme[autre]
+                        aire = aire * largeurs[autre].reshape(forme_axe)
+            if self.symetrie is not None:
+                aire = aire * self.symetrie.poids_faces(axe)
+            coeff = np.broadcast_to(aire / pas * surface_cellule, masque_fixe[bas].shape)
+
+            # Voxel côté bas (normale +axe) puis côté haut (normale -axe)
+            for cote, oppose, decalage, orientation in ((bas, haut, 0, 2 * axe + 1), (haut, bas, 1, 2 * axe)):
+                masque = masque_non_fixe[cote] & masque_fixe[oppose]
+                G = L[cote][masque] * coeff[masque]
+                position = np.nonzero(masque)
+                cellule = list(position)
+                voisin = list(position)
+                cellule[axe] = position[axe] + decalage
+                voisin[axe] = position[axe] + 1 - decalage
+                garder = G != 0  # Faces de la couche fantôme d'un plan de symétrie
+                paires.append(np.stack([np.ravel_multi_index(cellule, forme),
+                                        np.ravel_multi_index(voisin, forme)])[:, garder])
+                conductances.append(G[garder])
+                orientations.append(np.full(np.count_nonzero(garder), orientation))
+                materiaux.append(codes[tuple(cellule)][garder])
+
+        faces = {
+            "paires": np.concatenate(paires, axis=1).astype(np.intp),
+            "conductances": np.concatenate(conductances),
+            "orientations": np.concatenate(orientations).astype(np.intp),
+            "materiaux": np.concatenate(materiaux).astype(np.intp),
+            "noms_materiaux": [str(nom) for nom in noms_materiaux],
+        }
+        self.logger.debug(f"Pertes: {faces['conductances'].size} faces vers les limites fixes")
+        self.modele.liberer_proprietes()
+        return faces
+
+    def _flux_pertes_W(self):
+        """Flux (W) de chaque face vers les limites fixes, état courant (une lecture groupée)."""
+        if self._faces_pertes is None:
+            self._faces_pertes = self._preparer_faces_pertes()
+        faces = self._faces_pertes
+        T_paires = self.T.reshape(-1)[faces["paires"]]
+        return faces, T_paires[0] - T_paires[1]
 
-        surface_cellule = ds * ds
-
-        # Flux en X
-        flux_x1 = (L[:, :-1, :] * (T[:, :-1, :] - T[:, 1:, :]) / ds) * (
-                    masque_non_fixe[:, :-1, :] & masque_fixe[:, 1:, :])
-        flux_x2 = (L[:, 1:, :] * (T[:, 1:, :] - T[:, :-1, :]) / ds) * (
-                    masque_non_fixe[:, 1:, :] & masque_fixe[:, :-1, :])
+    def _calculer_pertes_W(self):
+        """Calcule les pertes de puissance (W) vers les 'LIMITE_FIXE'.
 
-        # Flux en Y
-        flux_y1 = (L[:-1, :, :] * (T[:-1, :, :] - T[1:, :, :]) / ds) * (
-                    masque_non_fixe[:-1, :, :] & masque_fixe[1:, :, :])
-        flux_y2 = (L[1:, :, :] * (T[1:, :, :] - T[:-1, :, :]) / ds) * (
-                    masque_non_fixe[1:, :, :] & masque_fixe[:-1, :, :])
+        Flux de Fourier λ·ΔT/h à travers chaque face entre un voxel non fixe
+        et une limite fixe, multiplié par l'aire de la face (ds² en grille
+        uniforme, produit des largeurs des deux autres axes sinon). Avec des
+        plans de symétrie: pertes du bâtiment complet. Avec un sol
+        semi-infini: flux cédé au fond des colonnes (pas vers les fantômes).
 
-        # Flux en Z
-        flux_z1 = (L[:, :, :-1] * (T[:, :, :-1] - T[:, :, 1:]) / ds) * (
-                    masque_non_fixe[:, :, :-1] & masque_fixe[:, :, 1:])
-        flux_z2 = (L[:, :, 1:] * (T[:, :, 1:] - T[:, :, :-1]) / ds) * (
-                    masque_non_fixe[:, :, 1:] & masque_fixe[:, :, :-1])
+        Les faces et leurs conductances sont figées pour le calcul
+        (_preparer_faces_pertes): une lecture groupée et un produit scalaire.
+        """
+        faces, ecarts = self._flux_pertes_W()
+        pertes_W = float(np.dot(faces["conductances"], ecarts))
+        if self.parois is not None:
+            pertes_W += self.parois.pertes_W()
+        if self.sol is not None:
+            pertes_W += self.sol.flux_profond_W()
+        if self.symetrie is not None:
+            pertes_W *= self.symetrie.facteur  # Pertes du bâtiment complet
 
-        somme_flux_x = np.sum(flux_x1) + np.sum(flux_x2)
-        somme_flux_y = np.sum(flux_y1) + np.sum(flux_y2)
-        somme_flux_z = np.sum(flux_z1) + np.sum(flux_z2)
+        return pertes_W
 
-        pertes_W = (somme_flux_x + somme_flux_y + somme_flux_z) * surface_cellule
+    def pertes_detaillees_W(self):
+        """
+        Pertes vers les limites fixes (W) réparties par orientation de face
+        et par matériau du voxel, bâtiment complet.
 
-        return pertes_W
+        Returns:
+            dict: total_W, par_orientation ({"x-": W, ...}), par_materiau
+                  ({nom: W}), parois_W (parois multicouches) et sol_W (fond
+                  des colonnes du sol semi-infini), hors répartition
+        """
+        faces, ecarts = self._flux_pertes_W()
+        flux = faces["conductances"] * ecarts
+        par_orientation = np.bincount(faces["orientations"], flux, minlength=len(self.ORIENTATIONS))
+        par_materiau = np.bincount(faces["materiaux"], flux, minlength=len(faces["noms_materiaux"]))
+        presents = np.bincount(faces["materiaux"], minlength=len(faces["noms_materiaux"])) > 0
+        parois_W = self.parois.pertes_W() if self.parois is not None else 0.0
+        sol_W = self.sol.flux_profond_W() if self.sol is not None else 0.0
+        if self.symetrie is not None:
+            # Une face d'orientation -axe a pour miroir une face +axe
+            for etape in self.symetrie.etapes:
+                paire = par_orientation[2 * etape["axe"]:2 * etape["axe"] + 2]
+                paire[:] = paire.sum()
+                autres = [o for o in range(len(self.ORIENTATIONS)) if o // 2 != etape["axe"]]
+                par_orientation[autres] *= 2
+            par_materiau *= self.symetrie.facteur
+            parois_W *= self.symetrie.facteur
+            sol_W *= self.symetrie.facteur
+        return {
+            "total_W": float(par_orientation.sum()) + parois_W + sol_W,
+            "par_orientation": dict(zip(self.ORIENTATIONS, par_orientation.tolist())),
+            "par_materiau": {nom: W for nom, W, present in zip(faces["noms_materiaux"], par_materiau.tolist(), presents)
+                             if present},
+            "parois_W": parois_W,
+            "sol_W": sol_W,
+        }
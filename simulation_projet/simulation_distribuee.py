@@ -0,0 +1,395 @@
+"""
+Module SIMULATION DISTRIBUÉE (décomposition de domaine multi-processus).
+
+Pour les modèles très fins (ds = 2-3 cm), les tableaux T/Alpha/RhoCp
+d'un bâtiment entier ne tiennent plus confortablement dans un seul
+processus. Ici la grille est découpée en blocs de plans x; chaque
+processus ne possède que son bloc (+ un plan de halo de chaque côté).
+
+À chaque pas (schéma explicite, comme Simulation avec moteur="creux"):
+1. Conduction sur les voxels du bloc
+2. Convection: sommes partielles des surfaces par zone écrites en
+   mémoire partagée, barrière, réduction (dans l'ordre des rangs, donc
+   identique dans tous les processus) puis mise à jour de l'air et des
+   surfaces du bloc
+3. Rayonnement des surfaces du bloc
+4. Échange des halos: chaque processus publie ses deux plans de bord en
+   mémoire partagée, barrière, puis lit les plans de ses voisins
+
+Les sous-domaines sont construits dans les processus eux-mêmes, à partir
+de la grille d'indices de matériaux et des températures initiales placées
+en mémoire partagée (libérée dès que tous les blocs sont copiés): le
+processus principal ne duplique pas les propriétés du modèle.
+
+Les instantanés sont envoyés au processus principal qui réassemble la
+grille complète et l'écrit avec StockageResultats.
+
+Barrières et file de résultats ont un délai (delai_attente_s): si un
+processus meurt ou se bloque, la barrière est rompue, les autres
+processus s'arrêtent et lancer_simulation lève RuntimeError.
+
+Machine Linux unique, processus locaux uniquement.
+"""
+
+import multiprocessing as mp
+from multiprocessing import shared_memory
+import queue
+import threading
+import time
+
+import numpy as np
+
+from logger import LoggerSimulation
+from noyau_creux import NoyauConductionCreux
+from rayonnement import ModeleRayonnement
+from stockage import StockageResultats
+
+
+class SousDomaine:
+    """Bloc de plans x [x_debut, x_fin) d'un processus, avec ses halos."""
+
+    def __init__(self, Materiau, T, alpha, rho_cp, surfaces_zones, rang, x_debut, x_fin):
+        """
+        Args:
+            Materiau, T: Grilles complètes (indices de matériaux, températures)
+            alpha, rho_cp: Propriétés par entrée de la table des matériaux
+            surfaces_zones: Indices (i, j, k) des surfaces de convection, par zone
+            rang, x_debut, x_fin: Rang du processus et plans x possédés
+        """
+        N_x = Materiau.shape[0]
+        self.rang = rang
+        self.x_debut, self.x_fin = x_debut, x_fin
+        x_local_debut = max(x_debut - 1, 0)
+        x_local_fin = min(x_fin + 1, N_x)
+        self.halo_gauche = x_debut > 0
+        self.halo_droit = x_fin < N_x
+        # Plans possédés dans le bloc local
+        self.premier = x_debut - x_local_debut
+        self.dernier = self.premier + (x_fin - x_debut) - 1
+
+        bloc = slice(x_local_debut, x_local_fin)
+        materiau = Materiau[bloc]
+        self.Alpha = alpha[materiau]
+        self.RhoCp = rho_cp[materiau]
+        self.T = T[bloc].copy()
+        forme = self.T.shape
+
+        # Surfaces possédées, par zone (indices plats locaux)
+        self.surfaces_zone = []
+        for i, j, k in surfaces_zones:
+            possede = (i >= x_debut) & (i < x_fin)
+            self.surfaces_zone.append(
+                np.ravel_multi_index((i[possede] - x_local_debut, j[possede], k[possede]), forme).astype(np.intp)
+            )
+
+    def bloc_possede(self, T):
+        """Plans possédés (sans halo) d'un tableau local."""
+        return T[self.premier:self.dernier + 1]
+
+
+def _processus_sous_domaine(rang, x_debut, x_fin, surfaces_zones, config, noms_memoire, barriere,
+                            file_resultats):
+    """Processus d'un sous-domaine: signale toute erreur au processus principal et rompt la barrière."""
+    try:
+        _boucle_sous_domaine(rang, x_debut, x_fin, surfaces_zones, config, noms_memoire, barriere,
+                             file_resultats)
+    except threading.BrokenBarrierError:
+        file_resultats.put(("erreur", rang, "barrière rompue (processus voisin arrêté ou bloqué)"))
+    except Exception as erreur:
+        barriere.abort()
+        file_resultats.put(("erreur", rang, repr(erreur)))
+        raise
+
+
+def _boucle_sous_domaine(rang, x_debut, x_fin, surfaces_zones, config, noms_memoire, barriere, file_resultats):
+    """Boucle temporelle d'un processus (un sous-domaine)."""
+    logger = LoggerSimulation(config["niveau_log"])
+    ds, dt, h = config["ds"], config["dt"], config["h"]
+    nb_processus = config["nb_processus"]
+    n_zones = len(config["C_air"])
+
+    # Bloc local copié depuis les grilles partagées, puis détachement
+    forme = config["forme"]
+    memoire_grilles = shared_memory.SharedMemory(name=noms_memoire["grilles"])
+    T_global = np.ndarray(forme, dtype=np.float64, buffer=memoire_grilles.buf)
+    Materiau = np.ndarray(forme, dtype=np.uint8, buffer=memoire_grilles.buf, offset=T_global.nbytes)
+    domaine = SousDomaine(Materiau, T_global, config["alpha"], config["rho_cp"], surfaces_zones,
+                          rang, x_debut, x_fin)
+    del T_global, Materiau
+    memoire_grilles.close()
+
+    memoire_sommes = shared_memory.SharedMemory(name=noms_memoire["sommes"])
+    memoire_plans = shared_memory.SharedMemory(name=noms_memoire["plans"])
+    sommes = np.ndarray((2, nb_processus, n_zones), dtype=np.float64, buffer=memoire_sommes.buf)
+    plans = np.ndarray((nb_processus, 2) + domaine.T.shape[1:], dtype=np.float64, buffer=memoire_plans.buf)
+
+    rayonnement = ModeleRayonnement(logger, enable_external=config["rayonnement"])
+    masque = np.zeros(domaine.T.shape, dtype=bool)
+    masque[domaine.premier:domaine.dernier + 1] = (domaine.Alpha > 0)[domaine.premier:domaine.dernier + 1]
+    noyau = NoyauConductionCreux(domaine.Alpha, masque, ds, dt, logger, journaliser=False)
+
+    RhoCp_plat = domaine.RhoCp.reshape(-1)
+    capacites_zone = [RhoCp_plat[s] * ds ** 3 for s in domaine.surfaces_zone]
+    surfaces = np.unique(np.concatenate([np.empty(0, dtype=np.intp)] + domaine.surfaces_zone))
+    RhoCp_surfaces = RhoCp_plat[surfaces]
+    indices_modifies = np.union1d(noyau.indices, surfaces).astype(np.intp)
+
+    T = domaine.T
+    T_suivant = T.copy()
+    T_plat = T.reshape(-1)
+    T_air = np.array(config["T_air"], dtype=np.float64)
+    C_air = np.array(config["C_air"], dtype=np.float64)
+    nb_surfaces = np.array(config["nb_surfaces"], dtype=np.float64)
+    A_total = ds ** 2 * nb_surfaces
+    actives = C_air > 0
+    k = np.divide(h * A_total * dt, C_air, out=np.zeros_like(C_air), where=actives)
+
+    def pas():
+        noyau.avancer(T_suivant, T)
+
+        # Convection semi-implicite, réduction des sommes entre processus
+        for iteration in range(2):
+            sommes[iteration, rang] = [np.sum(T_plat[s]) for s in domaine.surfaces_zone]
+            barriere.wait()
+            sommes_zones = sommes[iteration].sum(axis=0)
+
+            T_air_new = np.where(actives, (T_air + k * (sommes_zones / nb_surfaces)) / (1.0 + k), T_air)
+            dT_max = float(np.max(np.abs(T_air_new - T_air), initial=0.0))
+            T_air[:] = T_air_new
+
+            # Toutes les zones lues avant d'écrire (comme Simulation)
+            variations = []
+            for z, (s, capacites) in enumerate(zip(domaine.surfaces_zone, capacites_zone)):
+                energie_J = h * ds ** 2 * (T_plat[s] - T_air[z]) * dt
+                variations.append(np.divide(energie_J, capacites, out=np.zeros_like(energie_J),
+                                            where=capacites != 0))
+            for s, dT in zip(domaine.surfaces_zone, variations):
+                T_plat[s] -= dT
+            if dT_max < 0.01:
+                break
+
+        if rayonnement.enable_external and surfaces.size:
+            T_surfaces = T_plat[surfaces]
+            T_plat[surfaces] = T_surfaces + rayonnement.calculer_dT_surfaces(
+                T_surfaces, RhoCp_surfaces, ds, dt, emissivite_default=0.85)
+        T_suivant.reshape(-1)[indices_modifies] = T_plat[indices_modifies]
+
+        # Échange des halos
+        plans[rang, 0] = T[domaine.premier]
+        plans[rang, 1] = T[domaine.dernier]
+        barriere.wait()
+        if domaine.halo_gauche:
+            T[0] = T_suivant[0] = plans[rang - 1, 1]
+        if domaine.halo_droit:
+            T[-1] = T_suivant[-1] = plans[rang + 1, 0]
+        barriere.wait()  # Plans et sommes réutilisables au pas suivant
+
+    def envoyer(index, temps_s):
+        file_resultats.put(("etape", index, temps_s, rang, domaine.bloc_possede(T).copy(), T_air.copy()))
+
+    # Même boucle (et mêmes instants de stockage) que Simulation.lancer_simulation
+    duree_s, intervalle_s = config["duree_s"], config["intervalle_stockage_s"]
+    temps_s = 0.0
+    nb_etapes = 0
+    envoyer(nb_etapes, temps_s)
+    nb_etapes += 1
+    prochain_stockage_s = intervalle_s
+    while temps_s <= duree_s:
+        pas()
+        temps_s += dt
+        if temps_s >= prochain_stockage_s:
+            envoyer(nb_etapes, temps_s)
+            nb_etapes += 1
+            prochain_stockage_s += intervalle_s
+    if (temps_s - dt) < (prochain_stockage_s - intervalle_s):
+        envoyer(nb_etapes, temps_s)
+
+    file_resultats.put(("fin", rang, domaine.bloc_possede(T).copy(), T_air.copy()))
+    memoire_sommes.close()
+    memoire_plans.close()
+
+
+class SimulationDistribuee:
+    """Lance le schéma explicite sur nb_processus sous-domaines (plans x)."""
+
+    def __init__(self, modele, nb_processus=2, chemin_sortie="resultats_sim", enable_rayonnement=True,
+                 delai_attente_s=120.0):
+        """
+        Args:
+            modele: ModeleMaison préparé (preparer_simulation)
+            nb_processus: Nombre de processus (sous-domaines en x)
+            chemin_sortie: Dossier des résultats (StockageResultats)
+            enable_rayonnement: Rayonnement externe actif
+            delai_attente_s: Attente maximale d'une barrière ou d'un message
+                             avant de déclarer un processus bloqué
+        """
+        self.modele = modele
+        self.params = modele.params
+        self.logger = modele.logger
+        self.enable_rayonnement = enable_rayonnement
+        self.stockage = StockageResultats(chemin_sortie, self.logger)
+        self.T = np.copy(modele.T)
+
+        N_x = self.T.shape[0]
+        if not 1 <= nb_processus <= N_x:
+            self.logger.error(f"nb_processus={nb_processus} invalide (1 à {N_x}).")
+            raise ValueError("Nombre de processus invalide.")
+        self.nb_processus = nb_processus
+        if delai_attente_s <= 0:
+            self.logger.error(f"delai_attente_s={delai_attente_s} invalide (> 0).")
+            raise ValueError("Délai d'attente invalide.")
+        self.delai_attente_s = delai_attente_s
+        if not self.params.uniforme:
+            self.logger.error("Simulation distribuée: grille uniforme uniquement.")
+            raise ValueError("Grille non uniforme: utiliser Simulation(moteur='numpy').")
+        if getattr(modele, "parois", None):
+            self.logger.error("Simulation distribuée: parois multicouches non gérées.")
+            raise ValueError("Parois multicouches: utiliser Simulation.")
+
+        # CFL sur les matériaux présents (sans dériver la grille Alpha)
+        self.alpha = modele.table_propriete("alpha", modele.dtype_alpha)
+        self.rho_cp = modele.table_propriete("rho_cp")
+        presents = np.bincount(modele.Materiau.reshape(-1), minlength=len(self.alpha)) > 0
+        alpha_solides = self.alpha[presents & (self.alpha > 0)]
+        if alpha_solides.size:
+            facteur_cfl = np.max(alpha_solides) * self.params.dt / self.params.ds ** 2
+            if facteur_cfl > (1 / 6):
+                self.logger.error(f"Instabilité détectée! CFL ({facteur_cfl:.4f}) > 0.166.")
+                raise ValueError("Simulation instable (CFL).")
+
+        self.ids_zones = [id_zone for id_zone in modele.zones_air
+                          if modele.surfaces_convection_idx[id_zone][0].size > 0]
+        self.zones = modele.etat_zones()
+        self.rangs_zones = np.array([self.zones.ids.index(id_zone) for id_zone in self.ids_zones], dtype=np.intp)
+        # Seules les bornes des blocs restent ici: chaque processus construit son SousDomaine
+        bornes = np.linspace(0, N_x, nb_processus + 1).round().astype(int)
+        self.blocs = [(int(bornes[rang]), int(bornes[rang + 1])) for rang in range(nb_processus)]
+        self.logger.info(f"Simulation distribuée: {nb_processus} processus, blocs en x {self.blocs}")
+
+    def _surfaces_rang(self, x_debut, x_fin):
+        """Surfaces de convection (i, j, k) situées dans les plans [x_debut, x_fin), par zone."""
+        surfaces = []
+        for id_zone in self.ids_zones:
+            i, j, k = self.modele.surfaces_convection_idx[id_zone]
+            possede = (i >= x_debut) & (i < x_fin)
+            surfaces.append((i[possede], j[possede], k[possede]))
+        return surfaces
+
+    def _assembler(self, blocs):
+        """Réassemble la grille complète à partir des blocs possédés."""
+        for (x_debut, x_fin), bloc in zip(self.blocs, blocs):
+            self.T[x_debut:x_fin] = bloc
+        return self.T
+
+    def _verifier_processus(self, processus, fins, dernier_message):
+        """Lève RuntimeError si un processus est mort sans terminer, ou si plus rien n'arrive."""
+        for rang, p in enumerate(processus):
+            if p.exitcode is not None and p.exitcode != 0 and rang not in fins:
+                self.logger.error(f"Processus {rang} arrêté (code {p.exitcode}).")
+                raise RuntimeError(f"Simulation distribuée: processus {rang} arrêté (code {p.exitcode}).")
+        if time.time() - dernier_message > self.delai_attente_s:
+            self.logger.error(f"Aucun résultat depuis {self.delai_attente_s:.0f}s: processus bloqués.")
+            raise RuntimeError("Simulation distribuée: processus bloqués.")
+
+    def _maj_zones(self, T_air):
+        self.zones.T[self.rangs_zones] = T_air
+
+    def lancer_simulation(self, duree_s, intervalle_stockage_s=600):
+        """Lance les processus et écrit les instantanés réassemblés."""
+        debut = time.time()
+        n_zones = len(self.ids_zones)
+        config = {
+            "ds": self.params.ds, "dt": self.params.dt, "h": self.params.h_convection,
+            "nb_processus": self.nb_processus, "rayonnement": self.enable_rayonnement,
+            "niveau_log": "WARN", "forme": self.T.shape,
+            "alpha": self.alpha, "rho_cp": self.rho_cp,
+            "T_air": self.zones.T[self.rangs_zones].tolist(),
+            "C_air": self.zones.capacites[self.rangs_zones].tolist(),
+            "nb_surfaces": [int(self.modele.surfaces_convection_idx[i][0].size) for i in self.ids_zones],
+            "duree_s": duree_s, "intervalle_stockage_s": intervalle_stockage_s,
+        }
+
+        # Températures initiales puis indices de matériaux, lus une fois par chaque processus
+        memoire_grilles = shared_memory.SharedMemory(create=True, size=self.T.nbytes + self.modele.Materiau.nbytes)
+        grille_T = np.ndarray(self.T.shape, dtype=np.float64, buffer=memoire_grilles.buf)
+        grille_T[:] = self.T
+        grille_materiau = np.ndarray(self.T.shape, dtype=np.uint8, buffer=memoire_grilles.buf, offset=self.T.nbytes)
+        grille_materiau[:] = self.modele.Materiau
+        del grille_T, grille_materiau
+        grilles_liberees = False
+
+        taille_plans = self.nb_processus * 2 * self.T.shape[1] * self.T.shape[2] * 8
+        memoire_sommes = shared_memory.SharedMemory(create=True, size=max(2 * self.nb_processus * n_zones * 8, 8))
+        memoire_plans = shared_memory.SharedMemory(create=True, size=taille_plans)
+        noms = {"grilles": memoire_grilles.name, "sommes": memoire_sommes.name, "plans": memoire_plans.name}
+
+        contexte = mp.get_context()
+        barriere = contexte.Barrier(self.nb_processus, timeout=self.delai_attente_s)
+        file_resultats = contexte.Queue()
+        processus = [contexte.Process(target=_processus_sous_domaine,
+                                      args=(rang, x_debut, x_fin, self._surfaces_rang(x_debut, x_fin),
+                                            config, noms, barriere, file_resultats))
+                     for rang, (x_debut, x_fin) in enumerate(self.blocs)]
+        try:
+            for p in processus:
+                p.start()
+
+            etapes = {}
+            prochaine_etape = 0
+            fins = {}
+            dernier_message = time.time()
+            while len(fins) < self.nb_processus:
+                try:
+                    message = file_resultats.get(timeout=1.0)
+                except queue.Empty:
+                    self._verifier_processus(processus, fins, dernier_message)
+                    continue
+                dernier_message = time.time()
+                if message[0] == "erreur":
+                    _, rang, detail = message
+                    self.logger.error(f"Processus {rang}: {detail}")
+                    raise RuntimeError(f"Simulation distribuée: processus {rang} en erreur ({detail}).")
+                if message[0] == "fin":
+                    _, rang, bloc, T_air = message
+                    fins[rang] = (bloc, T_air)
+                    continue
+                _, index, temps_s, rang, bloc, T_air = message
+                etapes.setdefault(index, {})[rang] = (temps_s, bloc, T_air)
+                if index == 0 and len(etapes[0]) == self.nb_processus and not grilles_liberees:
+                    # Tous les blocs sont construits: les grilles partagées ne servent plus
+                    memoire_grilles.close()
+                    memoire_grilles.unlink()
+                    grilles_liberees = True
+                # Écrire les étapes complètes, dans l'ordre
+                while len(etapes.get(prochaine_etape, {})) == self.nb_processus:
+                    morceaux = etapes.pop(prochaine_etape)
+                    temps_etape = morceaux[0][0]
+                    self._maj_zones(morceaux[0][2])
+                    T = self._assembler([morceaux[r][1] for r in range(self.nb_processus)])
+                    self.stockage.stocker_etape(temps_etape, T.copy(), self.zones)
+                    prochaine_etape += 1
+
+            for p in processus:
+                p.join(self.delai_attente_s)
+        except BaseException:
+            barriere.abort()  # Débloque les processus restants
+            raise
+        finally:
+            for p in processus:
+                if p.is_alive():
+                    p.terminate()
+            if not grilles_liberees:
+                memoire_grilles.close()
+                memoire_grilles.unlink()
+            memoire_sommes.close()
+            memoire_sommes.unlink()
+            memoire_plans.close()
+            memoire_plans.unlink()
+
+        self._assembler([fins[r][0] for r in range(self.nb_processus)])
+        self._maj_zones(fins[0][1])
+
+        temperatures_air = {zone.nom: zone.T for zone in self.modele.zones_air.values()}
+        self.logger.info(f"Simulation distribuée terminée en {time.time() - debut:.2f}s.")
+        self.logger.info(f"--- Température Finale de l'Air: {temperatures_air} ---")
+        return temperatures_air
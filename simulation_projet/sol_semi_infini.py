@@ -0,0 +1,179 @@
+"""
+Sol SEMI-INFINI sous la grille (champ lointain réduit).
+
+Au lieu de voxeliser plusieurs mètres de TERRE, le modèle ne garde qu'une
+couche de sol explicite (30 à 50 cm) posée sur la couche de LIMITE_FIXE
+du bas de la grille. Les voxels fixes sous le sol (voxels d'un matériau
+de sol, TERRE par défaut: une dalle posée sur la limite reste une limite
+fixe) deviennent des voxels "fantômes" pilotés par des colonnes 1D:
+- les voxels de sol du bas sont regroupés en tuiles (taille_tuile_m);
+- chaque tuile a une colonne 1D (λ, ρ·cp moyens de ses voxels) dont les
+  mailles grossissent géométriquement jusqu'à profondeur_m, où la
+  température est imposée (T_profond: constante, T_sol_init par défaut,
+  ou série [(t_s, T), ...] interpolée);
+- à chaque pas, la température de chaque fantôme est choisie pour que le
+  stencil de conduction y fasse passer exactement le flux voxel <-> tête
+  de colonne; la colonne reçoit le flux opposé (énergie conservée).
+
+Le couplage est explicite (températures du début de pas), la colonne est
+implicite (un système tridiagonal pour toutes les tuiles). Le fantôme reste
+une combinaison convexe de T_voxel et T_colonne: la CFL de la grille n'est
+pas modifiée.
+"""
+
+import numpy as np
+from scipy.linalg import solve_banded
+
+from model_data import MATERIAUX
+
+
+class SolSemiInfini:
+    """Colonnes 1D de sol profond couplées aux voxels fantômes du bas de la grille."""
+
+    def __init__(self, modele, dt, logger, profondeur_m=10.0, taille_tuile_m=1.0, facteur=1.3, T_profond=None,
+                 materiaux_sol=("TERRE",)):
+        """
+        Args:
+            modele: ModeleMaison préparé, grille uniforme (celui de la simulation, recadré ou non)
+            dt: Pas de temps (s)
+            logger: Logger instance
+            profondeur_m: Profondeur de la température imposée, sous la couche explicite (m)
+            taille_tuile_m: Côté des tuiles regroupant les voxels sur une colonne (m)
+            facteur: Raison géométrique de l'épaisseur des mailles (première maille: ds)
+            T_profond: Température profonde (°C) ou série [(t_s, T), ...]; défaut T_sol_init
+            materiaux_sol: Noms des matériaux de sol couplés aux colonnes
+        """
+        self.logger = logger
+        params = modele.params
+        if not params.uniforme:
+            self.logger.error("Sol semi-infini: grille uniforme uniquement.")
+            raise ValueError("Sol semi-infini non disponible sur grille non uniforme.")
+        if profondeur_m <= params.ds or taille_tuile_m <= 0 or facteur < 1.0:
+            self.logger.error(f"Sol semi-infini: profondeur ({profondeur_m} m) > ds, tuile > 0, facteur >= 1 requis.")
+            raise ValueError("Paramètres du sol semi-infini invalides.")
+        ds = params.ds
+
+        if T_profond is None:
+            T_profond = params.T_sol_init
+        if np.ndim(T_profond) == 0:
+            self._serie = None
+            self._T_constante = float(T_profond)
+        else:
+            serie = np.asarray(T_profond, dtype=np.float64)
+            if serie.ndim != 2 or serie.shape[1] != 2 or np.any(np.diff(serie[:, 0]) <= 0):
+                self.logger.error("Sol semi-infini: série T_profond attendue [(t_s, T), ...], t croissant.")
+                raise ValueError("Série de température du sol invalide.")
+            self._serie = serie
+        self.temps_s = 0.0
+
+        inconnus = [nom for nom in materiaux_sol if MATERIAUX.get(nom, {}).get("type") != "SOLIDE"]
+        if inconnus:
+            self.logger.error(f"Sol semi-infini: matériaux de sol inconnus ou non solides {inconnus}.")
+            raise ValueError("Matériaux du sol semi-infini invalides.")
+
+        # Fantômes: LIMITE_FIXE sous un voxel de sol, avec uniquement des limites fixes en dessous
+        A = modele.Alpha
+        est_sol = np.isin([entree["nom"] for entree in modele.table_materiaux], materiaux_sol)[modele.Materiau]
+        fixe_dessous = np.cumprod(A == 0, axis=2).astype(bool)
+        fantomes = fixe_dessous[:, :, :-1] & est_sol[:, :, 1:]
+        del est_sol
+        i, j, k = np.nonzero(fantomes)
+        if i.size == 0:
+            self.logger.error(f"Sol semi-infini: aucun voxel de {', '.join(materiaux_sol)} posé sur la limite "
+                              f"fixe du bas de la grille.")
+            raise ValueError("Sol semi-infini: pas de couche de sol à coupler.")
+        self.indices_fantomes = (i, j, k)
+        self.indices_sol = (i, j, k + 1)
+
+        # Tuiles: carrés de taille_tuile_m à partir du coin des voxels couplés (invariant au recadrage)
+        n_tuile = max(1, int(round(taille_tuile_m / ds)))
+        cles = ((i - i.min()) // n_tuile) * (A.shape[1] // n_tuile + 1) + (j - j.min()) // n_tuile
+        _, self.tuile, nb_par_tuile = np.unique(cles, return_inverse=True, return_counts=True)
+        self.nb_tuiles = nb_par_tuile.size
+        lam_v = modele.Lambda_axe(2)[self.indices_sol].astype(np.float64)  # Flux vertical
+        lam_t = np.bincount(self.tuile, lam_v) / nb_par_tuile
+        rho_cp_t = np.bincount(self.tuile, modele.RhoCp[self.indices_sol].astype(np.float64)) / nb_par_tuile
+        aires = nb_par_tuile * ds ** 2
+
+        # Mailles des colonnes (communes à toutes les tuiles)
+        dx = [ds]
+        while sum(dx) + dx[-1] * facteur < profondeur_m:
+            dx.append(dx[-1] * facteur)
+        dx[-1] += profondeur_m - sum(dx)
+        self.dx = np.array(dx)
+        n = self.dx.size
+        self.nb_mailles = n
+
+        # Couplage voxel <-> tête de colonne (demi-voxel + demi-maille), borné par λ_v·ds:
+        # le fantôme T_v + r·(T_col - T_v), r = G/(λ_v·ds) <= 1, reste entre les deux
+        G_v = ds ** 2 / (0.5 * ds / lam_v + 0.5 * self.dx[0] / lam_t[self.tuile])
+        self.G_voxels = np.minimum(G_v, lam_v * ds)
+        self.r_fantomes = self.G_voxels / (lam_v * ds)
+        self.G_tete = np.bincount(self.tuile, self.G_voxels, minlength=self.nb_tuiles)
+
+        # Colonnes concaténées (tuile par tuile): capacités et conductances
+        dx_c = np.tile(self.dx, self.nb_tuiles)
+        lam_c = np.repeat(lam_t, n)
+        aires_c = np.repeat(aires, n)
+        self.capacites = np.repeat(rho_cp_t, n) * dx_c * aires_c  # J/K
+        self.G_interne = aires_c[:-1] / (0.5 * dx_c[:-1] / lam_c[:-1] + 0.5 * dx_c[1:] / lam_c[1:])
+        self.G_interne[n - 1::n] = 0.0
+        self.G_profond = aires * lam_t / (0.5 * self.dx[-1])
+        self.tetes = np.arange(self.nb_tuiles) * n
+        self.bases = self.tetes + n - 1
+
+        self.T = np.full(self.nb_tuiles * n, self.T_profond())
+        self.dt = None
+        self.mettre_a_jour_dt(dt)
+
+        self.logger.info(f"Sol semi-infini: {i.size} voxels couplés, {self.nb_tuiles} colonnes de {n} mailles "
+                         f"jusqu'à {profondeur_m} m")
+
+    def T_profond(self, temps_s=None):
+        """Température imposée en profondeur (°C) au temps donné (défaut: temps courant)."""
+        if self._serie is None:
+            return self._T_constante
+        t = self.temps_s if temps_s is None else temps_s
+        return float(np.interp(t, self._serie[:, 0], self._serie[:, 1]))
+
+    def mettre_a_jour_dt(self, dt):
+        """Assemble le système tridiagonal des colonnes et vérifie le couplage explicite."""
+        self.dt = dt
+        diag = self.capacites / dt
+        diag[:-1] += self.G_interne
+        diag[1:] += self.G_interne
+        diag[self.bases] += self.G_profond
+        self._ab = np.zeros((3, diag.size))
+        self._ab[0, 1:] = -self.G_interne
+        self._ab[1] = diag
+        self._ab[2, :-1] = -self.G_interne
+
+        # La tête de colonne reçoit le flux du début de pas: G·dt/C <= 1
+        if np.max(self.G_tete * dt / self.capacites[self.tetes]) > 1.0:
+            self.logger.error(f"Sol semi-infini: couplage explicite instable pour dt={dt}s.")
+            raise ValueError("Couplage sol-colonnes instable (réduire dt).")
+
+    def pas(self, T_grille, copies=()):
+        """
+        À appeler AVANT le pas de la grille: impose les fantômes de T_grille
+        (et des grilles copies) pour le pas, puis avance les colonnes.
+        """
+        T_sol = T_grille[self.indices_sol].astype(np.float64)
+        T_tete = self.T[self.tetes][self.tuile]
+        T_fantomes = T_sol + self.r_fantomes * (T_tete - T_sol)
+        for grille in (T_grille,) + tuple(copies):
+            grille[self.indices_fantomes] = T_fantomes
+
+        rhs = self.capacites / self.dt * self.T
+        rhs[self.tetes] += np.bincount(self.tuile, self.G_voxels * (T_sol - T_tete), minlength=self.nb_tuiles)
+        self.temps_s += self.dt
+        rhs[self.bases] += self.G_profond * self.T_profond()
+        self.T = solve_banded((1, 1), self._ab, rhs, check_finite=False)
+
+    def energie_J(self):
+        """Énergie stockée dans les colonnes (J, référence 0°C)."""
+        return float(np.sum(self.capacites * self.T))
+
+    def flux_profond_W(self):
+        """Puissance cédée à la température imposée en profondeur (W), état courant."""
+        return float(np.sum(self.G_profond * (self.T[self.bases] - self.T_profond())))
@@ -0,0 +1,140 @@
+"""
+Module SOLVEUR IMPLICITE (θ-schéma, inconditionnellement stable).
+
+Intègre le système C·dx/dt = -K·x + b de OperateurThermique:
+
+  (C/dt + θ·K)·x(t+dt) = (C/dt - (1-θ)·K)·x(t) + b
+
+- θ = 1   : Euler implicite (ordre 1, L-stable, aucune oscillation)
+- θ = 1/2 : Crank-Nicolson (ordre 2, peut osciller si dt >> constante
+            de temps des couches minces)
+
+Conduction ET convection (nœuds d'air) sont dans le même système
+linéaire: plus de contrainte CFL, dt de 5-15 min possible.
+
+Le rayonnement externe (Stefan-Boltzmann, non linéaire) est linéarisé
+autour de T(t) à chaque pas:
+  q(T) ≈ q(T_n) + 4·ε·σ·A·T_n³·(T - T_n)
+"""
+
+import numpy as np
+import scipy.sparse as sp
+import scipy.sparse.linalg as spla
+
+from multigrille import MultigrilleGeometrique
+
+
+class SolveurImplicite:
+    """Pas de temps implicite par solveur itératif préconditionné (BiCGSTAB)."""
+
+    SCHEMAS = {"euler_implicite": 1.0, "crank_nicolson": 0.5}
+    PRECONDITIONNEURS = ("jacobi", "ilu", "multigrille")
+
+    def __init__(self, operateur, schema, rayonnement, ds, logger,
+                 preconditionneur="ilu", tolerance=1e-10, iterations_max=500,
+                 emissivite=0.85):
+        """
+        Args:
+            operateur: OperateurThermique (K, C, b)
+            schema: "euler_implicite" ou "crank_nicolson"
+            rayonnement: ModeleRayonnement (linéarisé si enable_external)
+            ds: Discrétisation spatiale (m)
+            logger: Logger instance
+            preconditionneur: "ilu" (factorisation incomplète, défaut), "jacobi"
+                              (pas de factorisation: mise en place immédiate,
+                              quelques itérations de plus) ou "multigrille"
+                              (un cycle en V, grands modèles)
+            tolerance: Tolérance relative du solveur itératif
+            iterations_max: Nombre max d'itérations par pas
+            emissivite: Émissivité des surfaces
+        """
+        if schema not in self.SCHEMAS:
+            raise ValueError(f"Schéma implicite '{schema}' inconnu. Choix: {list(self.SCHEMAS)}")
+        if preconditionneur not in self.PRECONDITIONNEURS:
+            raise ValueError(f"Préconditionneur '{preconditionneur}' inconnu.")
+
+        self.op = operateur
+        self.theta = self.SCHEMAS[schema]
+        self.rayonnement = rayonnement
+        self.logger = logger
+        self.type_preconditionneur = preconditionneur
+        self.tolerance = tolerance
+        self.iterations_max = iterations_max
+
+        self.A_face = ds * ds
+        self.emissivite = emissivite
+
+        self.dt = None
+        self._A_base = None
+        self._M = None
+        self.iterations_total = 0
+        self.nb_pas = 0
+
+        self.logger.info(f"Solveur implicite: {schema} (θ={self.theta}), "
+                         f"BiCGSTAB + préconditionneur {preconditionneur}")
+
+    def _preparer(self, dt):
+        """(Re)construit la matrice C/dt + θK et son préconditionneur pour ce dt."""
+        self.dt = dt
+        self._A_base = (sp.diags(self.op.C / dt) + self.theta * self.op.K).tocsr()
+
+        if self.type_preconditionneur == "ilu":
+            try:
+                ilu = spla.spilu(self._A_base.tocsc(), drop_tol=1e-5, fill_factor=4)
+                self._M = spla.LinearOperator(self._A_base.shape, matvec=ilu.solve)
+                return
+            except (RuntimeError, MemoryError) as e:
+                self.logger.warn(f"ILU impossible ({e}), repli sur Jacobi.")
+
+        if self.type_preconditionneur == "multigrille":
+            self._M = MultigrilleGeometrique.depuis_operateur(
+                self.op, self._A_base, self.logger).preconditionneur()
+            return
+
+        diag_inv = 1.0 / self._A_base.diagonal()
+        self._M = spla.LinearOperator(self._A_base.shape, matvec=lambda v: diag_inv * v)
+
+    def _termes_rayonnement(self, x):
+        """Renvoie (q_n, dq/dT) du rayonnement externe sur les surfaces (W, W/K)."""
+        surf = self.op.surfaces_rayonnement
+        if not self.rayonnement.enable_external or surf.size == 0:
+            return None, None
+        T_K = x[surf] + 273.15
+        coeff = self.emissivite * self.rayonnement.SIGMA * self.A_face
+        q = coeff * (T_K ** 4 - self.rayonnement.T_sky_K ** 4)
+        dq = 4.0 * coeff * T_K ** 3
+        return q, dq
+
+    def pas(self, x, dt):
+        """Calcule x(t+dt) à partir de x(t)."""
+        if dt != self.dt:
+            self._preparer(dt)
+
+        C_dt = self.op.C / dt
+        second_membre = C_dt * x + self.op.b
+        if self.theta < 1.0:
+            second_membre -= (1.0 - self.theta) * (self.op.K @ x)
+
+        A = self._A_base
+        q, dq = self._termes_rayonnement(x)
+        if q is not None:
+            surf = self.op.surfaces_rayonnement
+            second_membre[surf] += -q + self.theta * dq * x[surf]
+            diag_rad = np.zeros(self.op.n)
+            diag_rad[surf] = self.theta * dq
+            A = A + sp.diags(diag_rad)
+
+        nb_iter = [0]
+
+        def compter(_):
+            nb_iter[0] += 1
+
+        x_new, info = spla.bicgstab(A, second_membre, x0=x, rtol=self.tolerance,
+                                    maxiter=self.iterations_max, M=self._M, callback=compter)
+        if info != 0:
+            self.logger.warn(f"Solveur implicite: non convergé (info={info}, "
+                             f"{nb_iter[0]} itérations).")
+
+        self.iterations_total += nb_iter[0]
+        self.nb_pas += 1
+        return x_new
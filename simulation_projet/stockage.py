@@ -25,14 +25,14 @@ class StockageResultats:
 
         self.logger.info(f"Stockage configuré pour écrire dans: {self.chemin_sortie}")
 
-    def stocker_etape(self, temps_s, matrice_T, zones_air):
-        """Sauvegarde l'état complet de la simulation à un instant t."""
+    def stocker_etape(self, temps_s, matrice_T, zones):
+        """Sauvegarde l'état complet de la simulation à un instant t (zones: EtatZones)."""
 
         nom_fichier = f"etape_{len(self.index_temps):05d}.pkl"
         chemin_complet = os.path.join(self.chemin_sortie, nom_fichier)
 
-        # Stocke les températures de l'air de toutes les zones
-        temps_air = {nom: zone.T for nom, zone in zones_air.items()}
+        # Stocke les températures de l'air de toutes les zones ({id: T})
+        temps_air = zones.temperatures()
 
         etat = {
             "temps_s": temps_s,
@@ -0,0 +1,231 @@
+"""
+Plans de SYMÉTRIE miroir: calcul sur une moitié (ou un quart, un huitième)
+du modèle.
+
+Un axe est un plan de symétrie si la grille des matériaux (zones d'air
+confondues), les températures initiales et les pas de la grille sont
+symétriques par rapport au milieu de la grille le long de cet axe. Chaque
+zone d'air doit être soit coupée en deux moitiés par le plan, soit
+entièrement d'un côté avec sa zone jumelle (même température, même
+capacité) de l'autre.
+
+Le modèle réduit garde la moitié basse de l'axe plus une couche fantôme
+(LIMITE_FIXE), recopiée après chaque pas du miroir du dernier voxel gardé:
+le stencil à 7 points y voit exactement le champ symétrique, quel que soit
+le moteur (flux nul à travers le plan).
+- N pair: plan entre deux voxels, fantôme = dernier voxel gardé.
+- N impair: plan au centre de la couche du milieu, gardée; fantôme = la
+  couche précédente. La couche du milieu compte pour moitié (poids 1/2)
+  dans les bilans: surfaces de convection, énergie, pertes.
+Les zones coupées par le plan ont leur volume, leur capacité et leur apport
+de puissance divisés par deux; les zones jumelles sont omises et reçoivent
+la température de leur jumelle. Le champ complet est reconstruit par miroir.
+"""
+
+import copy
+import numpy as np
+
+
+class PlansSymetrie:
+    """Réduction d'un modèle par ses plans de symétrie et reconstruction du champ complet."""
+
+    NOMS_AXES = ("x", "y", "z")
+
+    def __init__(self, modele, logger, axes=None):
+        """
+        Args:
+            modele: ModeleMaison préparé (recadré ou non)
+            logger: Logger instance
+            axes: Axes déclarés (0, 1, 2), vérifiés; None: détection automatique
+        """
+        self.logger = logger
+        self.modele_complet = modele
+        # Plans dans l'ordre de réduction: {axe, fantome, source, centre (ou None), jumelles}
+        self.etapes = []
+
+        if modele.parois:
+            if axes is not None:
+                self.logger.error("Symétrie: non disponible avec des parois multicouches.")
+                raise ValueError("Symétrie: parois multicouches non prises en compte.")
+            self.logger.info("Symétrie: parois multicouches présentes, calcul sur le modèle complet.")
+            axes_candidats = ()
+        else:
+            axes_candidats = (0, 1, 2) if axes is None else tuple(axes)
+
+        reduit = modele
+        for axe in axes_candidats:
+            if axe not in (0, 1, 2):
+                self.logger.error(f"Symétrie: axe {axe} invalide (0, 1 ou 2).")
+                raise ValueError("Axe de symétrie invalide.")
+            raison, jumelles = self._verifier_axe(reduit, axe)
+            if raison is not None:
+                if axes is not None:
+                    self.logger.error(f"Symétrie: plan {self.NOMS_AXES[axe]} non valide ({raison}).")
+                    raise ValueError(f"Le modèle n'est pas symétrique selon {self.NOMS_AXES[axe]}.")
+                self.logger.debug(f"Symétrie: pas de plan {self.NOMS_AXES[axe]} ({raison}).")
+                continue
+            reduit, etape = self._reduire(reduit, axe, jumelles)
+            self.etapes.append(etape)
+
+        self.modele_reduit = reduit
+        self.facteur = 2 ** len(self.etapes)
+        self.plans_centres = any(etape["centre"] is not None for etape in self.etapes)
+        # Zone réduite de chaque zone du modèle complet (jumelles: leur jumelle gardée)
+        ids_reduits = list(reduit.zones_air)
+        sources = []
+        for id_zone in modele.zones_air:
+            for etape in self.etapes:
+                id_zone = etape["jumelles"].get(id_zone, id_zone)
+            sources.append(ids_reduits.index(id_zone))
+        self._sources = np.array(sources, dtype=np.intp)
+        if self.etapes:
+            plans = ", ".join(self.NOMS_AXES[etape["axe"]] for etape in self.etapes)
+            self.logger.info(f"Symétrie: plans {plans}, grille {modele.Materiau.shape} -> {reduit.Materiau.shape} "
+                             f"(1/{self.facteur} du modèle)")
+
+    @staticmethod
+    def _codes_materiaux(modele):
+        """Code par entrée de la table: identique pour deux matériaux égaux, toutes zones d'air confondues."""
+        codes = {}
+        resultat = []
+        for entree in modele.table_materiaux:
+            if entree["type"] == "AIR":
+                cle = ("AIR",)
+            else:
+                cle = (entree["nom"], entree["type"], entree["alpha"], entree["lambda"], entree["rho_cp"])
+            resultat.append(codes.setdefault(cle, len(codes)))
+        return np.array(resultat)
+
+    def _verifier_axe(self, modele, axe):
+        """(raison du refus ou None, jumelles {id omis: id gardé}) pour un plan au milieu de l'axe."""
+        n = modele.Materiau.shape[axe]
+        if n < 3:
+            return "grille trop petite", None
+        if not modele.params.uniforme:
+            pas = np.diff(modele.params.coords_m[axe])
+            if not np.allclose(pas, pas[::-1], rtol=1e-12, atol=0.0):
+                return "pas de grille non symétriques", None
+
+        codes = self._codes_materiaux(modele)[modele.Materiau]
+        if not np.array_equal(codes, np.flip(codes, axe)):
+            return "matériaux", None
+        if not np.array_equal(modele.T, np.flip(modele.T, axe)):
+            return "températures initiales", None
+
+        # Correspondance des zones d'air par miroir
+        A = modele.Alpha
+        air = A < 0
+        paires = np.unique(np.stack([A[air], np.flip(A, axe)[air]], axis=1), axis=0)
+        if np.unique(paires[:, 0]).size != paires.shape[0]:
+            return "zone d'air en miroir de plusieurs zones", None
+        garde = [slice(None)] * 3
+        garde[axe] = slice(0, (n + 1) // 2)
+        A_garde = A[tuple(garde)]
+        zones_gardees = set(np.unique(A_garde[A_garde < 0]).tolist())
+        jumelles = {}
+        for a, b in paires.tolist():
+            if a == b:
+                continue
+            if (a in zones_gardees) == (b in zones_gardees):
+                return f"zones {a} et {b} à cheval sur le plan", None
+            if a in zones_gardees:
+                za, zb = modele.zones_air[a], modele.zones_air[b]
+                if (za.T != zb.T or za.puissance_apport_W != zb.puissance_apport_W
+                        or not np.isclose(za.capacite_thermique_J_K, zb.capacite_thermique_J_K)):
+                    return f"zones {za.nom} et {zb.nom} différentes", None
+                jumelles[b] = a
+        return None, jumelles
+
+    def _reduire(self, modele, axe, jumelles):
+        """Modèle réduit à la moitié basse de l'axe plus la couche fantôme, et description du plan."""
+        n = modele.Materiau.shape[axe]
+        fantome = (n + 1) // 2
+        etape = {"axe": axe, "fantome": fantome, "source": n - 1 - fantome,
+                 "centre": fantome - 1 if n % 2 else None, "jumelles": jumelles}
+        boite = [slice(0, taille) for taille in modele.Materiau.shape]
+        boite[axe] = slice(0, fantome + 1)
+        reduit = modele.extraire(tuple(boite))
+
+        couche = [slice(None)] * 3
+        couche[axe] = fantome
+        reduit.Materiau[tuple(couche)] = reduit.indice_materiau("LIMITE_FIXE")
+        reduit.invalider_proprietes()
+
+        # Zones propres au modèle réduit: coupées en deux ou gardées entières, jumelles omises
+        zones = {}
+        coupees = set(np.unique(reduit.Alpha[reduit.Alpha < 0]).tolist()) - set(jumelles.values())
+        for id_zone, zone in modele.zones_air.items():
+            if id_zone in jumelles:
+                continue
+            zones[id_zone] = copy.copy(zone)
+            if id_zone in coupees:
+                zones[id_zone].volume_m3 = zone.volume_m3 / 2.0
+                zones[id_zone].capacite_thermique_J_K = zone.capacite_thermique_J_K / 2.0
+                zones[id_zone].puissance_apport_W = zone.puissance_apport_W / 2.0
+        reduit.zones_air = zones
+        reduit.surfaces_convection_idx = {}
+        reduit._detecter_surfaces_convection()
+        return reduit, etape
+
+    def imposer_plans(self, grilles):
+        """Recopie le miroir du dernier voxel gardé de grilles[0] dans la couche fantôme, dans toutes les grilles."""
+        for etape in self.etapes:
+            fantome = [slice(None)] * 3
+            fantome[etape["axe"]] = etape["fantome"]
+            source = list(fantome)
+            source[etape["axe"]] = etape["source"]
+            valeurs = grilles[0][tuple(source)]
+            for grille in grilles:
+                grille[tuple(fantome)] = valeurs
+
+    def poids_voxels(self):
+        """Poids de chaque voxel réduit dans les bilans (1/2 par couche du milieu, 0 fantôme), diffusable."""
+        poids = np.ones((1, 1, 1))
+        forme_reduite = self.modele_reduit.Materiau.shape
+        for etape in self.etapes:
+            forme = [1, 1, 1]
+            forme[etape["axe"]] = forme_reduite[etape["axe"]]
+            facteurs = np.ones(forme_reduite[etape["axe"]])
+            if etape["centre"] is not None:
+                facteurs[etape["centre"]] = 0.5
+            facteurs[etape["fantome"]] = 0.0
+            poids = poids * facteurs.reshape(forme)
+        return poids
+
+    def poids_faces(self, axe):
+        """
+        Poids des faces entre voisins selon axe (forme diffusable, n-1 faces
+        sur axe): 1/2 dans une couche du milieu parallèle à la face, 0 pour
+        les faces de la couche fantôme.
+        """
+        poids = np.ones((1, 1, 1))
+        forme_reduite = self.modele_reduit.Materiau.shape
+        for etape in self.etapes:
+            a = etape["axe"]
+            forme = [1, 1, 1]
+            if a == axe:
+                forme[a] = forme_reduite[a] - 1
+                facteurs = np.ones(forme[a])
+                facteurs[etape["fantome"] - 1] = 0.0
+            else:
+                forme[a] = forme_reduite[a]
+                facteurs = np.ones(forme[a])
+                if etape["centre"] is not None:
+                    facteurs[etape["centre"]] = 0.5
+                facteurs[etape["fantome"]] = 0.0
+            poids = poids * facteurs.reshape(forme)
+        return poids
+
+    def grille_complete(self, T_reduit):
+        """Champ du modèle (avant réduction) reconstruit par miroir du champ réduit."""
+        T = T_reduit
+        for etape in reversed(self.etapes):
+            axe = etape["axe"]
+            gardes = np.take(T, np.arange(etape["fantome"]), axis=axe)
+            miroir = np.flip(np.take(gardes, np.arange(etape["source"] + 1), axis=axe), axe)
+            T = np.concatenate([gardes, miroir], axis=axe)
+        return T
+
+    def synchroniser_zones(self):
+        """Recopie les températures des zones réduites dans les zones du modèle complet."""
+        self.modele_complet.etat_zones().T[:] = self.modele_reduit.etat_zones().T[self._sources]
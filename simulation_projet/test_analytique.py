@@ -13,9 +13,11 @@ La simulation FTCS doit converger vers cette solution analytique.
 import numpy as np
 from scipy.special import erf
 from logger import LoggerSimulation
-from parametres import ParametresSimulation
+from parametres import ParametresSimulation, coordonnees_axe
 from modele import ModeleMaison
 from simulation import Simulation
+from model_data import MATERIAUX
+from paroi_multicouche import ParoiMulticouche, EnsembleParois
 import matplotlib.pyplot as plt
 
 
@@ -165,11 +167,7 @@ def test_equilibre_thermique():
     modele = ModeleMaison(params)
 
     # Peupler très minimalement (un seul voxel solide au centre)
-    from model_data import MATERIAUX
-    props_beton = MATERIAUX["BETON"]
-    modele.Alpha[2, 2, 2] = props_beton["alpha"]
-    modele.Lambda[2, 2, 2] = props_beton["lambda"]
-    modele.RhoCp[2, 2, 2] = props_beton["rho"] * props_beton["cp"]
+    modele.set_material_at(2, 2, 2, "BETON")
     modele.T[2, 2, 2] = 20.0
 
     logger.info("Modèle créé: 1 voxel béton, 0.1m cube")
@@ -189,6 +187,272 @@ def test_equilibre_thermique():
     return True
 
 
+def _simulation_cube(chemin_sortie, precision, T_centre, duree_s, dt, ds=0.05, L=1.0, bord_x_fixe=False):
+    """Cube de béton (T=20°C), plan x=0 éventuellement fixé à T=0°C, centre à T_centre."""
+    logger = LoggerSimulation(niveau="WARN")
+    params = ParametresSimulation(logger, dims_m=(L, L, L), ds=ds, dt=dt,
+                                  T_interieur_init=20.0, T_exterieur_init=0.0, T_sol_init=10.0)
+    modele = ModeleMaison(params)
+    modele.construire_volume_metres((0.0, 0.0, 0.0), (L, L, L), "BETON")
+    n = modele.T.shape[0]
+    modele.T[n // 2 - 2:n // 2 + 2, n // 2 - 2:n // 2 + 2, n // 2 - 2:n // 2 + 2] = T_centre
+    if bord_x_fixe:
+        modele.construire_volume_metres((0.0, 0.0, 0.0), (0.0, L, L), "LIMITE_FIXE", T_override_K=0.0)
+    modele.preparer_simulation()
+
+    sim = Simulation(modele, chemin_sortie=chemin_sortie, moteur="creux", precision=precision)
+    sim.lancer_simulation(duree_s=duree_s, intervalle_stockage_s=duree_s)
+    return sim, MATERIAUX["BETON"]["alpha"]
+
+
+def test_precision_float32(sortie):
+    """Mode float32: même précision que float64 face à l'analytique, bilan d'énergie < 0.1%."""
+    # 1. Demi-espace (plan x=0 à 0°C): profil le long de x comparé à erf
+    erreurs = {}
+    for precision in ("float64", "float32"):
+        sim, alpha = _simulation_cube(sortie(), precision, 20.0, duree_s=20000, dt=100.0, bord_x_fixe=True)
+        T = sim.T
+        assert T.dtype == np.dtype(precision)
+        x_vec = np.arange(T.shape[0]) * 0.05
+        t = 20100.0  # lancer_simulation fait un pas de plus que duree_s / dt
+        T_exacte = solution_analytique_1d(x_vec, t, 20.0, 0.0, alpha)
+        centre = T.shape[1] // 2
+        erreurs[precision] = np.sqrt(np.mean((T[:, centre, centre] - T_exacte) ** 2))
+    assert erreurs["float64"] < 0.1
+    assert abs(erreurs["float32"] - erreurs["float64"]) < 1e-3
+
+    # 2. Système fermé (point chaud loin des bords): énergie conservée
+    sim, _ = _simulation_cube(sortie(), "float32", 40.0, duree_s=6 * 3600, dt=600.0, ds=0.1, L=2.0)
+    assert sim.bilan.erreur_max_prc < 0.1
+
+
+def test_grille_non_uniforme(sortie):
+    """Grille non uniforme: fine près de la paroi froide, même précision face à erf, bilan < 0.1%."""
+    logger = LoggerSimulation(niveau="WARN")
+    alpha = MATERIAUX["BETON"]["alpha"]
+    t = 20000.0
+    erreurs, nb_voxels = {}, {}
+    for nom, x in (("uniforme", coordonnees_axe(1.0, 0.01)),
+                   ("non_uniforme", coordonnees_axe(1.0, 0.1, [(0.0, 0.5, 0.01)]))):
+        params = ParametresSimulation(logger, dt=20.0, T_interieur_init=20.0,
+                                      coords_m=(x, coordonnees_axe(1.0, 0.1), coordonnees_axe(1.0, 0.1)))
+        modele = ModeleMaison(params)
+        modele.construire_volume_metres((0.0, 0.0, 0.0), (1.0, 1.0, 1.0), "BETON")
+        modele.construire_volume_metres((0.0, 0.0, 0.0), (0.0, 1.0, 1.0), "LIMITE_FIXE", T_override_K=0.0)
+        modele.preparer_simulation()
+        sim = Simulation(modele, chemin_sortie=sortie())
+        for _ in range(int(t / params.dt)):
+            sim._pas_de_temps()
+        T_exacte = solution_analytique_1d(x, t, 20.0, 0.0, alpha)
+        erreurs[nom] = np.max(np.abs(sim.T[:, 5, 5] - T_exacte))
+        nb_voxels[nom] = sim.T.size
+    assert erreurs["uniforme"] < 0.1
+    assert abs(erreurs["non_uniforme"] - erreurs["uniforme"]) < 0.01
+    assert nb_voxels["non_uniforme"] < nb_voxels["uniforme"] / 1.5
+
+    # Système fermé: couche fine (13 mm) au milieu de mailles de 10 cm, énergie conservée
+    coords = coordonnees_axe(2.0, 0.1, [(0.9, 0.913, 0.0065)])
+    params = ParametresSimulation(logger, dt=10.0, coords_m=(coords, coordonnees_axe(2.0, 0.1), coords))
+    modele = ModeleMaison(params)
+    modele.construire_volume_metres((0.0, 0.0, 0.0), (2.0, 2.0, 2.0), "BETON")
+    modele.construire_volume_metres((0.9, 0.0, 0.0), (0.913, 2.0, 2.0), "PLACO")
+    modele.T[8:11, 8:12, 8:11] = 40.0
+    modele.preparer_simulation()
+    sim = Simulation(modele, chemin_sortie=sortie())
+    sim.lancer_simulation(duree_s=3600, intervalle_stockage_s=3600)
+    assert sim.bilan.erreur_max_prc < 0.1
+
+
+def test_aires_surfaces_non_uniformes():
+    """Grille non uniforme: aire d'échange = somme des faces au contact de l'air, chacune avec son aire."""
+    logger = LoggerSimulation(niveau="WARN")
+    x = np.array([0.0, 0.1, 0.15, 0.3, 0.5, 0.6])
+    y = np.array([0.0, 0.2, 0.3, 0.35, 0.5, 0.6])
+    params = ParametresSimulation(logger, coords_m=(x, y, coordonnees_axe(0.6, 0.1)))
+    modele = ModeleMaison(params)
+    modele.construire_volume_metres((0.0, 0.0, 0.0), (0.6, 0.6, 0.6), "BETON")
+    modele.construire_volume_metres((0.3, 0.35, 0.0), (0.6, 0.6, 0.6), "AIR")
+    modele.construire_volume_metres((0.5, 0.5, 0.0), (0.5, 0.5, 0.6), "BETON")  # Poteau dans l'air
+    poteau = (np.array([4]), np.array([4]), np.array([3]))
+    # Deux faces x (largeur y 12.5 cm) et deux faces y (largeur x 15 cm), hauteur 10 cm
+    assert np.allclose(modele.aires_surfaces(poteau), 2 * 0.125 * 0.1 + 2 * 0.15 * 0.1)
+
+
+def test_paroi_multicouche():
+    """Paroi 1D: flux permanent = U·A·ΔT (couche BA13 comprise), énergie conservée avec l'air et les voxels."""
+    logger = LoggerSimulation(niveau="WARN")
+    params = ParametresSimulation(logger, dims_m=(1.0, 1.0, 1.0), ds=0.1, dt=600.0)
+    modele = ModeleMaison(params)
+    modele.construire_volume_metres((0.2, 0.2, 0.2), (0.4, 0.8, 0.8), "AIR")
+    modele.construire_volume_metres((0.6, 0.2, 0.2), (0.8, 0.8, 0.8), "BETON")
+    modele.preparer_simulation()
+
+    # 1. Régime permanent entre deux températures imposées (implicite: dt = 600 s malgré le BA13)
+    couches = [("PLACO", 0.013), ("LAINE_VERRE", 0.1), ("PARPAING", 0.2)]
+    mur = ParoiMulticouche("mur", couches, 10.0, {"type": "fixe", "T": 20.0, "h": 8.0},
+                           {"type": "fixe", "T": 0.0, "h": 25.0}, logger)
+    parois = EnsembleParois([mur], modele, 600.0, logger)
+    for _ in range(3000):
+        parois.pas(modele.T)
+    R = 1 / 8.0 + 0.013 / 0.25 + 0.1 / 0.04 + 0.2 / 1.1 + 1 / 25.0
+    assert abs(parois.flux_fixes_W()[("mur", "b")] - 10.0 * 20.0 / R) < 1e-6
+
+    # 2. Paroi entre l'air (30°C) et le bloc de béton: énergie échangée sans perte
+    modele.zones_air[-1].T = 30.0
+    cloison = modele.ajouter_paroi("cloison", [("PLACO", 0.013), ("BETON", 0.1)], 2.0,
+                                   {"type": "zone", "id_zone": -1, "h": 8.0},
+                                   {"type": "voxels", "p1_m": (0.6, 0.2, 0.2), "p2_m": (0.6, 0.8, 0.8)})
+    parois = EnsembleParois([cloison], modele, 600.0, logger)
+    idx = cloison.cotes[1]["indices"]
+    C_voxels = modele.RhoCp[idx] * params.ds ** 3
+    C_air = modele.zones_air[-1].capacite_thermique_J_K
+
+    def energie():
+        return cloison.energie_J() + C_air * modele.zones_air[-1].T + np.sum(C_voxels * modele.T[idx])
+
+    E_0 = energie()
+    for _ in range(100):
+        parois.pas(modele.T)
+    assert abs(energie() - E_0) < 1e-9 * abs(E_0)
+    assert modele.zones_air[-1].T < 30.0 and np.all(modele.T[idx] > 20.0)
+
+    # 3. La même aire en deux parois sur les mêmes voxels: flux cumulés, résultat identique
+    resultats = []
+    for aires in ((4.0,), (2.0, 2.0)):
+        modele.T[idx] = 20.0
+        modele.zones_air[-1].T = 30.0
+        morceaux = [modele.ajouter_paroi(f"cloison_{n}", [("PLACO", 0.013), ("BETON", 0.1)], aire,
+                                         {"type": "zone", "id_zone": -1, "h": 8.0},
+                                         {"type": "voxels", "p1_m": (0.6, 0.2, 0.2), "p2_m": (0.6, 0.8, 0.8)})
+                    for n, aire in enumerate(aires)]
+        parois = EnsembleParois(morceaux, modele, 600.0, logger)
+        E_0 = sum(p.energie_J() for p in morceaux) + C_air * modele.zones_air[-1].T + np.sum(C_voxels * modele.T[idx])
+        for _ in range(100):
+            parois.pas(modele.T)
+        E = sum(p.energie_J() for p in morceaux) + C_air * modele.zones_air[-1].T + np.sum(C_voxels * modele.T[idx])
+        assert abs(E - E_0) < 1e-9 * abs(E_0)
+        resultats.append((modele.zones_air[-1].T, modele.T[idx].copy()))
+    assert abs(resultats[0][0] - resultats[1][0]) < 1e-9
+    assert np.allclose(resultats[0][1], resultats[1][1], rtol=0, atol=1e-9)
+
+
+def _colonne_sol(chemin_sortie, epaisseur_m, sol, L=6.4, jours=10):
+    """Sol (TERRE) d'épaisseur donnée sous une limite à 20°C, sur la limite fixe du bas à 10°C."""
+    logger = LoggerSimulation(niveau="WARN")
+    H = epaisseur_m + 0.6
+    params = ParametresSimulation(logger, dims_m=(L, L, H), ds=0.2, dt=3600.0,
+                                  T_interieur_init=10.0, T_exterieur_init=10.0, T_sol_init=10.0)
+    modele = ModeleMaison(params)
+    modele.construire_volume_metres((0.0, 0.0, 0.0), (L, L, H), "LIMITE_FIXE", T_override_K=10.0)
+    modele.construire_volume_metres((0.2, 0.2, 0.2), (L - 0.2, L - 0.2, epaisseur_m), "TERRE")
+    modele.construire_volume_metres((0.2, 0.2, epaisseur_m + 0.2), (L - 0.2, L - 0.2, H), "LIMITE_FIXE",
+                                    T_override_K=20.0)
+    modele.preparer_simulation()
+    sim = Simulation(modele, chemin_sortie=chemin_sortie, sol=sol)
+    for _ in range(24 * jours):
+        sim._pas_de_temps()
+    # Colonne centrale, deux voxels de sol sous la limite à 20°C
+    return sim.T[sim.T.shape[0] // 2, sim.T.shape[1] // 2, -5:-3]
+
+
+def test_sol_semi_infini(sortie):
+    """40 cm de sol + colonnes 1D jusqu'à 4 m = 4 m de sol voxelisé; la troncature seule est fausse."""
+    T_reference = _colonne_sol(sortie(), 4.0, None)
+    T_colonnes = _colonne_sol(sortie(), 0.4, {"profondeur_m": 3.6, "taille_tuile_m": 0.4})
+    T_tronque = _colonne_sol(sortie(), 0.4, None)
+    assert np.max(np.abs(T_colonnes - T_reference)) < 0.05
+    assert np.max(np.abs(T_tronque - T_reference)) > 2.0
+
+
+def test_fractions_volumiques():
+    """Fractions volumiques: résistance et capacité d'une paroi béton/polystyrène/béton exactes même à ds = 20 cm."""
+    logger = LoggerSimulation(niveau="WARN")
+    couches = [("BETON", 0.16), ("POLYSTYRENE", 0.08), ("BETON", 0.16)]
+    R_exact = sum(e / MATERIAUX[nom]["lambda"] for nom, e in couches)
+    C_exact = sum(e * MATERIAUX[nom]["rho"] * MATERIAUX[nom]["cp"] for nom, e in couches)
+    for ds in (0.05, 0.1, 0.2):
+        ecarts = []
+        for fractions in (False, True):
+            params = ParametresSimulation(logger, dims_m=(1.2, 0.6, 0.6), ds=ds)
+            modele = ModeleMaison(params)
+            modele.construire_volume_metres((0.0, 0.0, 0.0), (1.2, 0.6, 0.6), "LIMITE_FIXE")
+            modele.construire_volume_metres((0.3, 0.1, 0.1), (0.7, 0.5, 0.5), "BETON", fractions=fractions)
+            modele.construire_volume_metres((0.46, 0.1, 0.1), (0.54, 0.5, 0.5), "POLYSTYRENE", fractions=fractions)
+            # Ligne de voxels traversant la paroi (résistances en série, capacités sommées)
+            ligne = (slice(None), params.N_y // 2, params.N_z // 2)
+            solide = modele.Alpha[ligne] > 0
+            R = np.sum(ds / modele.Lambda_axe(0)[ligne][solide])
+            C = np.sum(ds * modele.RhoCp[ligne][solide])
+            ecarts.append(max(abs(R / R_exact - 1), abs(C / C_exact - 1)))
+        assert ecarts[1] < 1e-9 and ecarts[0] > 0.2
+
+
+def _flux_paroi_fractions(chemin_sortie, axe, melange):
+    """
+    Paroi béton 50 cm + 8 cm de polystyrène à cheval sur deux voxels (ds = 10 cm), entre
+    deux plans à 20°C et 0°C normaux à l'axe: couche normale au flux (axe 0) ou le long
+    du flux (axe 1). Bords du domaine (non calculés) au profil permanent exact, intérieur
+    parti de 10°C. Retourne le flux permanent simulé (multi_pas) / flux analytique.
+    """
+    logger = LoggerSimulation(niveau="WARN")
+    lam_b, lam_p = MATERIAUX["BETON"]["lambda"], MATERIAUX["POLYSTYRENE"]["lambda"]
+    ds = 0.1
+    dims = [0.8, 0.6, 0.6]
+    dims[axe] = 1.0
+
+    def boite(debut, fin):
+        p1, p2 = [0.0, 0.0, 0.0], list(dims)
+        p1[axe], p2[axe] = debut, fin
+        return tuple(p1), tuple(p2)
+
+    params = ParametresSimulation(logger, dims_m=tuple(dims), ds=ds, dt=3600.0)
+    modele = ModeleMaison(params)
+    modele.construire_volume_metres(*boite(0.0, 0.25), "LIMITE_FIXE", T_override_K=20.0)
+    modele.construire_volume_metres(*boite(0.75, 1.0), "LIMITE_FIXE", T_override_K=0.0)
+    modele.construire_volume_metres(*boite(0.25, 0.75), "BETON", fractions=True)
+    if axe == 0:
+        modele.construire_volume_metres((0.50, 0.0, 0.0), (0.58, 0.6, 0.6), "POLYSTYRENE",
+                                        fractions=True, melange=melange)
+        # Entre les centres des plans fixes (x = 0.2 et 0.8): 52 cm de béton + 8 cm de polystyrène
+        U = 1.0 / ((0.6 - 0.08) / lam_b + 0.08 / lam_p)
+        # Profil permanent: demi-voxels en série (voxels 3..7, fractions de polystyrène),
+        # face vers un plan fixe = un voxel entier du côté calculé
+        f = np.array([0.0, 0.0, 0.5, 0.3, 0.0])
+        r = np.repeat(((1 - f) / lam_b + f / lam_p) * ds / 2, 2)
+        r = np.concatenate([r[:1], r, r[-1:]])
+        profil = np.concatenate([[20.0] * 3, 20.0 - 20.0 * np.cumsum(r)[1::2] / r.sum(), [0.0] * 2])
+        flux_analytique = U * 20.0 * ds * ds  # Une colonne
+    else:
+        modele.construire_volume_metres((0.30, 0.25, 0.0), (0.38, 0.75, 0.6), "POLYSTYRENE",
+                                        fractions=True, melange=melange)
+        profil = np.clip(np.interp(np.arange(params.N_y) * ds, [0.2, 0.8], [20.0, 0.0]), 0.0, 20.0)
+        # Colonnes calculées x = 1..7 (x de 0.05 à 0.75): 62 cm de béton et 8 cm de polystyrène en parallèle
+        flux_analytique = 20.0 / 0.6 * (0.62 * lam_b + 0.08 * lam_p) * ds  # Une tranche z
+    modele.preparer_simulation()
+
+    sim = Simulation(modele, chemin_sortie=chemin_sortie, moteur="multi_pas")
+    for T in (sim.T, sim.T_suivant):
+        T[...] = profil.reshape([-1 if a == axe else 1 for a in range(3)])
+        T[1:-1, 1:-1, 1:-1][modele.Alpha[1:-1, 1:-1, 1:-1] > 0] = 10.0
+    for _ in range(2000):
+        sim._pas_de_temps()
+
+    # Faces entre le plan à 20°C et le premier voxel de béton
+    faces, ecarts = sim._flux_pertes_W()
+    cellules = np.unravel_index(faces["paires"][0], sim.T.shape)
+    entree = (cellules[axe] == 3) & (cellules[2] == 3)
+    entree &= (cellules[1] == 3) if axe == 0 else (cellules[0] > 0) & (cellules[0] < params.N_x - 1)
+    return -np.dot(faces["conductances"][entree], ecarts[entree]) / flux_analytique
+
+
+def test_fractions_flux_permanent(sortie):
+    """Couche sous-voxel: flux permanent simulé = U analytique, à travers la couche comme le long."""
+    assert abs(_flux_paroi_fractions(sortie(), 0, "oriente") - 1) < 1e-6
+    assert abs(_flux_paroi_fractions(sortie(), 1, "oriente") - 1) < 1e-6
+    # Mélange isotrope en série: juste à travers la couche, faux le long
+    assert abs(_flux_paroi_fractions(sortie(), 1, "serie") - 1) > 0.1
+
+
 if __name__ == "__main__":
     print("\n" + "=" * 70)
     print("SUITE DE TESTS ANALYTIQUES - SIMULATION THERMIQUE")
@@ -0,0 +1,703 @@
+"""
+Tests d'équivalence des moteurs de calcul.
+
+Chaque moteur optimisé est comparé au moteur NumPy de référence sur une
+petite maison (voir benchmark.construire_maison_benchmark).
+"""
+
+import copy
+import multiprocessing as mp
+import os
+import pickle
+import time
+import numpy as np
+import pytest
+from logger import LoggerSimulation
+from simulation import Simulation
+from bilan_energie import Bilan
+from benchmark import (construire_maison_benchmark, construire_maison_pieces, coords_maison_non_uniforme,
+                       mesurer_allocations)
+from maillage_blocs import GeometrieBoites, MaillageBlocs, SimulationBlocs
+from model_data import MATERIAUX
+from modele import ModeleMaison
+from noyau_multi_pas import NoyauConductionMultiPas
+from noyau_numba import NUMBA_DISPONIBLE
+from parametres import ParametresSimulation
+from simulation_distribuee import SimulationDistribuee, SousDomaine
+from sol_semi_infini import SolSemiInfini
+
+
+def _simuler(chemin_sortie, nb_pas, dims_m=(5.0, 6.0, 5.0), dt=10.0, **options):
+    """Construit la petite maison, avance nb_pas pas et renvoie (T, T_air)."""
+    logger = LoggerSimulation(niveau="WARN")
+    modele = construire_maison_benchmark(logger, dims_m=dims_m, dt=dt)
+    sim = Simulation(modele, chemin_sortie=chemin_sortie, **options)
+    for _ in range(nb_pas):
+        sim._pas_de_temps()
+    sim.fermer()
+    T_air = {id_zone: zone.T for id_zone, zone in modele.zones_air.items()}
+    return sim.grille_complete(), T_air
+
+
+def test_moteur_creux_identique(sortie):
+    """Le moteur creux doit reproduire la référence bit à bit."""
+    T_ref, air_ref = _simuler(sortie(), 30, moteur="numpy")
+    T_creux, air_creux = _simuler(sortie(), 30, moteur="creux")
+
+    assert np.array_equal(T_ref, T_creux)
+    assert air_ref == air_creux
+
+
+def test_recadrage(sortie):
+    """Calcul sur la boîte englobante: identique à la grille complète, stockage complet."""
+    T_ref, air_ref = _simuler(sortie(), 30, dims_m=(6.0, 6.0, 6.0), moteur="numpy")
+    for moteur in ("numpy", "creux"):
+        T_recadre, air_recadre = _simuler(sortie(), 30, dims_m=(6.0, 6.0, 6.0), moteur=moteur, recadrer=True)
+        assert np.array_equal(T_ref, T_recadre)
+        assert air_ref == air_recadre
+
+    logger = LoggerSimulation(niveau="WARN")
+    modele = construire_maison_benchmark(logger, dims_m=(6.0, 6.0, 6.0))
+    sim = Simulation(modele, chemin_sortie=sortie(), recadrer=True)
+    assert sim.T.size < modele.T.size
+    sim.lancer_simulation(60, intervalle_stockage_s=60)
+    assert sim.stockage.charger_etape(-1)["matrice_T"].shape == modele.T.shape
+
+
+def test_grille_materiaux(tmp_path):
+    """Grille d'indices + table: requêtes exactes, propriétés dérivées, sauvegarde légère."""
+    logger = LoggerSimulation(niveau="WARN")
+    modele = construire_maison_benchmark(logger, dims_m=(5.0, 6.0, 5.0))
+    assert modele.Materiau.dtype == np.uint8
+    # LAINE_VERRE et LAINE_BOIS ont le même lambda: seul l'indice les distingue sans ambiguïté
+    assert modele.materiau_en(13, 30, 20) == "LAINE_VERRE"
+    assert modele.materiau_en(30, 30, 42) == "LAINE_BOIS"
+    assert modele.Alpha[13, 30, 20] == MATERIAUX["LAINE_VERRE"]["alpha"]
+    assert modele.compter_materiaux()["AIR"] == np.count_nonzero(modele.Alpha < 0)
+    with pytest.raises(ValueError):
+        modele.Alpha[0, 0, 0] = 1.0  # Grilles dérivées en lecture seule
+
+    chemin = str(tmp_path / "modele.hsm")
+    modele.sauvegarder(chemin)
+    charge = type(modele).charger(chemin, logger)
+    assert np.array_equal(charge.Alpha, modele.Alpha)
+    assert np.array_equal(charge.RhoCp, modele.RhoCp)
+
+    # Ancien format (grilles de propriétés float64): converti au chargement
+    ancien = type(modele).__new__(type(modele))
+    etat = {cle: val for cle, val in modele.__dict__.items()
+            if cle not in ("Materiau", "table_materiaux", "_index_table", "dtype_alpha", "_cache")}
+    etat.update(Alpha=np.array(modele.Alpha), Lambda=np.array(modele.Lambda), RhoCp=np.array(modele.RhoCp))
+    ancien.__setstate__(etat)
+    assert np.array_equal(ancien.Alpha, modele.Alpha)
+    assert ancien.materiau_en(13, 30, 20) == "LAINE_VERRE"
+
+
+def test_proprietes_liberees(sortie):
+    """Les grilles Alpha/Lambda/RhoCp dérivées ne survivent pas à la préparation ni aux pas de temps."""
+    logger = LoggerSimulation(niveau="WARN")
+    for options in ({"moteur": "numpy"}, {"moteur": "creux"}, {"moteur": "tampons"},
+                    {"moteur": "parallele"}, {"symetrie": True}, {"recadrer": True},
+                    {"schema": "euler_implicite"}, {"sol": True}):
+        modele = construire_maison_benchmark(logger, dims_m=(5.0, 6.0, 5.0))
+        sim = Simulation(modele, chemin_sortie=sortie(), **options)
+        for _ in range(3):
+            sim._pas_de_temps()
+        sim._calculer_pertes_W()
+        sim.fermer()
+        for modele_lu in (modele, sim.modele):
+            restantes = set(modele_lu._cache) & set(ModeleMaison.CHAMPS_PROPRIETES)
+            assert not restantes, (options, restantes)
+
+
+def test_format_modele(tmp_path):
+    """Fichier .hsm: grilles projetées en mémoire, simulation identique, pickle refusé."""
+    logger = LoggerSimulation(niveau="WARN")
+    modele = construire_maison_benchmark(logger, dims_m=(5.0, 6.0, 5.0))
+    chemin = str(tmp_path / "modele.hsm")
+    modele.sauvegarder(chemin)
+    charge = ModeleMaison.charger(chemin, logger)
+    assert isinstance(charge.Materiau, np.memmap) and isinstance(charge.T, np.memmap)
+    assert charge.table_materiaux == modele.table_materiaux
+    for id_zone, indices in modele.surfaces_convection_idx.items():
+        assert all(np.array_equal(a, b) for a, b in zip(charge.surfaces_convection_idx[id_zone], indices))
+
+    # Copie sur écriture: éditer le modèle chargé ne modifie pas le fichier
+    charge.set_material_at(20, 20, 20, "BETON")
+    assert ModeleMaison.charger(chemin, logger).materiau_en(20, 20, 20) != "BETON"
+
+    sortie = str(tmp_path / "resultats")
+    sim_ref = Simulation(modele, chemin_sortie=sortie, moteur="tampons")
+    sim_charge = Simulation(ModeleMaison.charger(chemin, logger), chemin_sortie=sortie, moteur="tampons")
+    for _ in range(5):
+        sim_ref._pas_de_temps()
+        sim_charge._pas_de_temps()
+    assert np.array_equal(sim_ref.T, sim_charge.T)
+
+    # Pickle (peut exécuter du code) refusé par défaut, en-tête corrompu rejeté
+    chemin_pkl = str(tmp_path / "modele.pkl")
+    with open(chemin_pkl, "wb") as f:
+        pickle.dump({"modele": 1}, f)
+    assert ModeleMaison.charger(chemin_pkl, logger) is None
+    with open(chemin, "r+b") as f:
+        f.seek(20)
+        f.write(b"\xff\xff")
+    assert ModeleMaison.charger(chemin, logger) is None
+
+
+def test_grille_non_uniforme(sortie, tmp_path):
+    """Chemin non uniforme sur des coordonnées régulières = grille uniforme; sauvegarde, recadrage."""
+    logger = LoggerSimulation(niveau="WARN")
+    dims_m = (5.0, 6.0, 5.0)
+    coords_m = tuple(np.arange(int(round(L / 0.1)) + 1) * 0.1 for L in dims_m)
+    resultats = []
+    for coords in (None, coords_m):
+        modele = construire_maison_benchmark(logger, dims_m=dims_m, dt=10.0, coords_m=coords)
+        sim = Simulation(modele, chemin_sortie=sortie())
+        sim.lancer_simulation(duree_s=300, intervalle_stockage_s=300)
+        resultats.append((sim.T, modele.zones_air[-1].T, sim._calculer_pertes_W(), sim.bilan.energies[-1][2]))
+    (T_ref, air_ref, pertes_ref, bilan_ref), (T, air, pertes, bilan) = resultats
+    assert np.allclose(T, T_ref, rtol=0, atol=1e-9)
+    assert abs(air - air_ref) < 1e-9
+    assert abs(pertes - pertes_ref) < 1e-9 * abs(pertes_ref)
+
+    # Seul le moteur numpy explicite gère les pas variables
+    coords = coords_maison_non_uniforme(0.05, 0.25, dims_m)
+    modele = construire_maison_benchmark(logger, dims_m=dims_m, dt=5.0, coords_m=coords)
+    for options in ({"moteur": "creux"}, {"schema": "euler_implicite"}, {"precision": "float32"}):
+        with pytest.raises(ValueError):
+            Simulation(modele, chemin_sortie=sortie(), **options)
+
+    chemin = str(tmp_path / "modele.hsm")
+    modele.sauvegarder(chemin)
+    charge = ModeleMaison.charger(chemin, logger)
+    assert all(np.array_equal(a, b) for a, b in zip(charge.params.coords_m, coords))
+
+    T_complet = _simuler_grille(sortie(), modele, 10)
+    T_recadre = _simuler_grille(sortie(), modele, 10, recadrer=True)
+    assert np.array_equal(T_complet, T_recadre)
+
+
+def _simuler_grille(chemin_sortie, modele, nb_pas, **options):
+    sim = Simulation(modele, chemin_sortie=chemin_sortie, **options)
+    for _ in range(nb_pas):
+        sim._pas_de_temps()
+    for zone in modele.zones_air.values():
+        zone.T = modele.params.T_interieur_init
+    return sim.grille_complete()
+
+
+def _maison_avec_parois(logger):
+    """Petite maison + une baie vers l'extérieur et une cloison air -> parpaing."""
+    modele = construire_maison_benchmark(logger, dims_m=(5.0, 6.0, 5.0), dt=10.0)
+    modele.ajouter_paroi("baie", [("PVC", 0.004), ("POLYSTYRENE", 0.02), ("PVC", 0.004)], 3.0,
+                         {"type": "zone", "id_zone": -1, "h": 8.0}, {"type": "fixe", "T": 0.0, "h": 25.0})
+    modele.ajouter_paroi("cloison", [("PLACO", 0.013), ("LAINE_VERRE", 0.05)], 2.0,
+                         {"type": "zone", "id_zone": -1, "h": 8.0},
+                         {"type": "voxels", "p1_m": (1.0, 2.0, 1.5), "p2_m": (1.0, 4.0, 3.0)})
+    return modele
+
+
+def test_parois_multicouches(sortie, tmp_path):
+    """Parois 1D: mêmes résultats selon le moteur, après recadrage et rechargement .hsm."""
+    logger = LoggerSimulation(niveau="WARN")
+    resultats = []
+    for options in ({"moteur": "numpy"}, {"moteur": "tampons"}, {"moteur": "creux", "recadrer": True}):
+        modele = _maison_avec_parois(logger)
+        sim = Simulation(modele, chemin_sortie=sortie(), **options)
+        sim.lancer_simulation(duree_s=300, intervalle_stockage_s=300)
+        resultats.append((sim.grille_complete(), modele.zones_air[-1].T, modele.parois[1].T.copy()))
+    T_ref, air_ref, paroi_ref = resultats[0]
+    for T, air, paroi in resultats[1:]:
+        assert np.array_equal(T, T_ref)
+        assert air == air_ref and np.array_equal(paroi, paroi_ref)
+    assert air_ref < 20.0
+
+    modele = _maison_avec_parois(logger)
+    with pytest.raises(ValueError):
+        Simulation(modele, chemin_sortie=sortie(), pas_adaptatif=True)
+    chemin = str(tmp_path / "modele.hsm")
+    modele.sauvegarder(chemin)
+    charge = ModeleMaison.charger(chemin, logger)
+    for paroi, paroi_chargee in zip(modele.parois, charge.parois):
+        assert paroi.nom == paroi_chargee.nom and paroi.coefficient_U() == paroi_chargee.coefficient_U()
+        assert np.array_equal(paroi.T, paroi_chargee.T)
+    assert np.array_equal(modele.parois[1].cotes[1]["indices"], charge.parois[1].cotes[1]["indices"])
+
+
+def test_sol_semi_infini(sortie):
+    """Sol profond en colonnes 1D: mêmes résultats selon le moteur et après recadrage; série T_profond."""
+    options_sol = {"profondeur_m": 5.0, "T_profond": [(0.0, 10.0), (600.0, 12.0)]}
+    resultats = []
+    for options in ({"moteur": "numpy"}, {"moteur": "tampons"}, {"moteur": "creux", "recadrer": True}):
+        logger = LoggerSimulation(niveau="WARN")
+        modele = construire_maison_benchmark(logger, dims_m=(5.0, 6.0, 5.0), dt=10.0)
+        sim = Simulation(modele, chemin_sortie=sortie(), sol=options_sol, **options)
+        for _ in range(30):
+            sim._pas_de_temps()
+        resultats.append((sim.grille_complete(), modele.zones_air[-1].T, sim.sol.T))
+    T_ref, air_ref, colonnes_ref = resultats[0]
+    for T, air, colonnes in resultats[1:]:
+        assert np.array_equal(T, T_ref)
+        assert air == air_ref and np.array_equal(colonnes, colonnes_ref)
+    assert sim.sol.T_profond() == 11.0
+
+    # Énergie des colonnes au bilan; pertes = fond des colonnes, pas les faces vers les fantômes
+    sim.lancer_simulation(duree_s=60, intervalle_stockage_s=60)
+    E_grille = float(sim.comptable.capacites @ sim.T.reshape(-1)[sim.comptable.indices]) + sim.zones.energie_J()
+    assert abs(sim.bilan.energies[-1][1] - (E_grille + sim.sol.energie_J())) < 1e-9 * E_grille
+    paires = sim._faces_pertes["paires"][1]
+    assert not np.any(np.isin(paires, np.ravel_multi_index(sim.sol.indices_fantomes, sim.T.shape)))
+    assert sim.pertes_detaillees_W()["sol_W"] == sim.sol.flux_profond_W()
+
+    with pytest.raises(ValueError):
+        Simulation(modele, chemin_sortie=sortie(), sol=True, schema="euler_implicite")
+
+    # Seuls les voxels de sol (par matériau) sont couplés: une dalle posée sur la limite reste une limite
+    params = ParametresSimulation(logger, dims_m=(2.0, 1.0, 1.0), ds=0.1)
+    modele = ModeleMaison(params)
+    modele.construire_volume_metres((0.0, 0.0, 0.0), (2.0, 1.0, 1.0), "LIMITE_FIXE")
+    modele.construire_volume_metres((0.1, 0.1, 0.1), (0.9, 0.9, 0.5), "TERRE")
+    modele.construire_volume_metres((1.1, 0.1, 0.1), (1.9, 0.9, 0.5), "BETON")
+    modele.preparer_simulation()
+    sol = SolSemiInfini(modele, 10.0, logger)
+    assert sol.indices_sol[0].size == 81 and np.all(sol.indices_sol[0] < 10)
+    with pytest.raises(ValueError):
+        SolSemiInfini(modele, 10.0, logger, materiaux_sol=("INCONNU",))
+
+
+def _maison_jumelle(logger):
+    """Maison à nombre de voxels pair, coupée en x par une cloison: deux pièces jumelles (zones -1, -2)."""
+    modele = construire_maison_benchmark(logger, dims_m=(5.1, 6.1, 5.0), dt=10.0)
+    modele.construire_volume_metres((2.5, 1.6, 1.3), (2.6, 4.5, 3.6), "PLACO")
+    modele.preparer_simulation()  # La cloison sépare l'air en deux zones
+    return modele
+
+
+def test_symetrie(sortie):
+    """Plans de symétrie: champ complet, air et pertes identiques au calcul complet (plans au centre ou entre voxels)."""
+    logger = LoggerSimulation(niveau="WARN")
+    for construire, moteurs in ((lambda: construire_maison_benchmark(logger, dims_m=(5.0, 6.0, 5.0)),
+                                 ("numpy", "creux", "multi_pas")),
+                                (lambda: _maison_jumelle(logger), ("tampons",))):
+        for moteur in moteurs:
+            resultats = []
+            for symetrie in (None, True):
+                modele = construire()
+                sim = Simulation(modele, chemin_sortie=sortie(), moteur=moteur, symetrie=symetrie)
+                sim.lancer_simulation(duree_s=300, intervalle_stockage_s=300)
+                air = {id_zone: zone.T for id_zone, zone in modele.zones_air.items()}
+                resultats.append((sim.stockage.charger_etape(-1)["matrice_T"], air, sim._calculer_pertes_W(), sim))
+            (T_ref, air_ref, pertes_ref, _), (T, air, pertes, sim) = resultats
+            assert [etape["axe"] for etape in sim.symetrie.etapes] == [0, 1]
+            assert sim.T.size < 0.3 * T.size
+            assert np.allclose(T, T_ref, rtol=0.0, atol=1e-10)
+            assert air.keys() == air_ref.keys()
+            assert all(abs(air[i] - air_ref[i]) < 1e-10 for i in air)
+            assert abs(pertes - pertes_ref) < 1e-8 * abs(pertes_ref)
+
+    modele = construire_maison_benchmark(logger, dims_m=(5.0, 6.0, 5.0))
+    with pytest.raises(ValueError):
+        Simulation(modele, chemin_sortie=sortie(), symetrie=(2,))  # Sol en bas, toit en haut
+    with pytest.raises(ValueError):
+        Simulation(modele, chemin_sortie=sortie(), symetrie=True, schema="euler_implicite")
+    with pytest.raises(ValueError):
+        Simulation(modele, chemin_sortie=sortie(), symetrie=True, moteur="tampons")  # Plans au centre
+
+
+def test_convection_multizones(sortie):
+    """Toutes les zones ensemble: cloisons d'un voxel au contact de deux zones, moteurs identiques."""
+    logger = LoggerSimulation(niveau="WARN")
+    resultats = {}
+    for moteur in ("numpy", "creux", "tampons", "parallele"):
+        modele = construire_maison_pieces(logger, nb_pieces=(3, 2))
+        tables = modele.tables_surfaces()
+        assert len(tables["rangs"]) == 2  # Voxels de cloison: deux entrées
+        sim = Simulation(modele, chemin_sortie=sortie(), moteur=moteur)
+        for _ in range(20):
+            sim._pas_de_temps()
+        resultats[moteur] = (sim.T.copy(), [zone.T for zone in modele.zones_air.values()])
+    T_ref, air_ref = resultats["numpy"]
+    for moteur in ("creux", "tampons"):
+        assert np.array_equal(resultats[moteur][0], T_ref) and resultats[moteur][1] == air_ref
+    assert np.max(np.abs(resultats["parallele"][0] - T_ref)) < 1e-9
+
+    # Échanges sans rayonnement: énergie (solides + air) conservée par la convection seule
+    modele = construire_maison_pieces(logger, nb_pieces=(3, 2))
+    sim = Simulation(modele, chemin_sortie=sortie(), enable_rayonnement=False)
+
+    def energie_J():
+        return np.sum(modele.RhoCp * sim.T) * modele.params.ds ** 3 + sum(
+            zone.capacite_thermique_J_K * zone.T for zone in modele.zones_air.values())
+
+    E_avant = energie_J()
+    sim._etape_convection_implicite()
+    assert abs(energie_J() - E_avant) < 1e-9 * abs(E_avant)
+
+
+def test_zones_automatiques():
+    """Une zone par volume d'air connexe: cloisons -> nouvelles zones, porte -> fusion; volumes et surfaces."""
+    logger = LoggerSimulation(niveau="ERROR")
+    modele = construire_maison_benchmark(logger, dims_m=(5.0, 6.0, 5.0))
+    volume_total = modele.zones_air[-1].volume_m3
+    modele.zones_air[-1].set_apport_puissance(900.0)
+    for x in (2.2, 2.8):
+        modele.construire_volume_metres((x, 1.6, 1.3), (x, 4.4, 3.6), "PLACO")
+    modele.preparer_simulation()
+
+    A, ds = modele.Alpha, modele.params.ds
+    assert list(modele.zones_air) == [-1, -2, -3]
+    assert abs(sum(zone.puissance_apport_W for zone in modele.zones_air.values()) - 900.0) < 1e-9
+    for id_zone, zone in modele.zones_air.items():
+        air = A == id_zone
+        assert abs(zone.volume_m3 - np.count_nonzero(air) * ds ** 3) < 1e-12
+        # Référence: masques par zone
+        contact = np.zeros_like(air)
+        for axe in range(3):
+            contact |= np.roll(air, 1, axe) | np.roll(air, -1, axe)
+        assert all(np.array_equal(a, b) for a, b in zip(modele.surfaces_convection_idx[id_zone],
+                                                         np.nonzero(contact & (A > 0))))
+    assert sum(zone.volume_m3 for zone in modele.zones_air.values()) < volume_total
+
+    # Porte dans la première cloison: les deux pièces fusionnent (moyenne des températures pondérée)
+    modele.zones_air[-1].T, modele.zones_air[-3].T = 18.0, 22.0  # Zones par volume décroissant: -3 au milieu
+    V_1, V_2 = modele.zones_air[-1].volume_m3, modele.zones_air[-3].volume_m3
+    i, j, k = (modele._coord_m_vers_idx(c, axe) for axe, c in enumerate((2.2, 3.0, 2.0)))
+    modele.set_material_at(i, j, k, "AIR")
+    modele.preparer_simulation()
+    assert list(modele.zones_air) == [-1, -2]
+    zone = modele.zones_air[-1]
+    assert abs(zone.volume_m3 - (V_1 + V_2 + ds ** 3)) < 1e-12
+    assert abs(zone.T - (18.0 * (V_1 + ds ** 3) + 22.0 * V_2) / zone.volume_m3) < 1e-12
+    assert np.count_nonzero(modele.Alpha == -3) == 0
+
+
+def test_etat_zones(sortie):
+    """Zones d'air en tableaux: ZoneAir vues sur l'état commun, copies détachées, énergie et instantanés."""
+    logger = LoggerSimulation(niveau="WARN")
+    modele = construire_maison_pieces(logger, nb_pieces=(2, 2))
+    etat = modele.etat_zones()
+    assert etat.ids == [-1, -2, -3, -4] and modele.etat_zones() is etat
+    zone = modele.zones_air[-3]
+    zone.T = 25.0
+    etat.puissances[:] = 100.0
+    assert etat.T[2] == 25.0 and zone.puissance_apport_W == 100.0
+    assert etat.capacites[2] == zone.capacite_thermique_J_K > 0
+
+    copie = copy.copy(zone)
+    copie.T = 0.0
+    assert zone.T == 25.0 and pickle.loads(pickle.dumps(zone)).T == 25.0
+    assert abs(etat.energie_J() - sum(z.capacite_thermique_J_K * z.T for z in modele.zones_air.values())) < 1e-6
+
+    sim = Simulation(modele, chemin_sortie=sortie())
+    sim.lancer_simulation(duree_s=60, intervalle_stockage_s=60)
+    assert sim.zones is etat and np.allclose(etat.hA, modele.params.h_convection * sim._surfaces["aires_zones"])
+    sim.stocker_etape_simulation(70.0)
+    assert sim.stockage.charger_etape(-1)["temps_air"] == {i: z.T for i, z in modele.zones_air.items()}
+
+
+def test_bilan_incremental(sortie):
+    """Énergie suivie par les flux du pas = recomptage complet; historique et statistiques bornés."""
+    logger = LoggerSimulation(niveau="WARN")
+    modele = construire_maison_benchmark(logger, dims_m=(5.0, 6.0, 5.0), dt=10.0)
+    sim = Simulation(modele, chemin_sortie=sortie(), moteur="tampons", sol=True, cadence_bilan=1000)
+    sim.lancer_simulation(duree_s=600, intervalle_stockage_s=600)
+    E_suivie = sim.bilan.energies[-1][1]
+    assert sim.bilan.nb_recomptages == 0
+    assert abs(E_suivie - sim.comptable.recompter(sim.T, sim.zones, sim.parois, sim.sol)) < 1e-12 * E_suivie
+
+    bilan = Bilan(taille_historique=5)
+    for n in range(20):
+        bilan.ajouter(float(n), 100.0 - n)
+    assert len(bilan.energies) == 5 and bilan.energies[0][0] == 15.0
+    assert bilan.premier == (0.0, 100.0, 0.0)
+    assert bilan.erreur_max_prc == 19.0 and bilan.erreur_moyenne_prc == 9.5
+
+
+def test_pertes_par_face(sortie):
+    """Pertes sur la liste de faces figée: réparties par orientation et matériau, symétrie comprise."""
+    logger = LoggerSimulation(niveau="WARN")
+    details = []
+    for symetrie in (None, True):
+        modele = construire_maison_benchmark(logger, dims_m=(5.0, 6.0, 5.0), dt=10.0)
+        sim = Simulation(modele, chemin_sortie=sortie(), symetrie=symetrie)
+        sim.lancer_simulation(duree_s=100, intervalle_stockage_s=100)
+        detail = sim.pertes_detaillees_W()
+        assert abs(detail["total_W"] - sim._calculer_pertes_W()) < 1e-9 * detail["total_W"]
+        assert abs(sum(detail["par_materiau"].values()) - detail["total_W"]) < 1e-9 * detail["total_W"]
+        assert sim.bilan.energie_perdue_J > 0
+        details.append(detail)
+    complet, reduit = details
+    assert set(complet["par_materiau"]) == set(reduit["par_materiau"])
+    for orientation in Simulation.ORIENTATIONS:
+        assert abs(reduit["par_orientation"][orientation] - complet["par_orientation"][orientation]) < 1e-6
+
+
+def test_maillage_blocs(monkeypatch, sortie):
+    """Blocs: niveau 0 = moteur multi_pas; blocs grossiers: moins de cellules, même résultat, énergie conservée."""
+    logger = LoggerSimulation(niveau="WARN")
+    resultats = []
+    for niveaux_max in (0, 3):
+        modele = construire_maison_benchmark(logger, dims_m=(5.0, 6.0, 5.0), dt=10.0)
+        sim = SimulationBlocs(modele, niveaux_max=niveaux_max, chemin_sortie=sortie())
+        assert np.array_equal(sim.grille_complete(), modele.T)
+        for _ in range(30):
+            sim._pas_de_temps()
+        resultats.append((sim.grille_complete(), modele.zones_air[-1].T, sim.maillage.nb_cellules))
+    (T_fin, air_fin, nb_fin), (T_blocs, air_blocs, nb_blocs) = resultats
+    T_ref, air_ref = _simuler(sortie(), 30, moteur="multi_pas")
+    assert np.allclose(T_fin, T_ref, rtol=0, atol=1e-10) and abs(air_fin - air_ref[-1]) < 1e-10
+    assert nb_blocs < 0.9 * nb_fin
+    assert np.allclose(T_blocs, T_fin, rtol=0, atol=1e-3) and abs(air_blocs - air_fin) < 1e-3
+
+    # Sans rayonnement, l'énergie perdue en un pas = flux vers les cellules imposées
+    modele = construire_maison_benchmark(logger, dims_m=(5.0, 6.0, 5.0), dt=10.0)
+    sim = SimulationBlocs(modele, chemin_sortie=sortie(), enable_rayonnement=False, facteur_stockage=4)
+    E_0, pertes_W = sim._energie_J(), sim._calculer_pertes_W()
+    sim._pas_de_temps()
+    assert abs(E_0 - sim._energie_J() - pertes_W * sim.dt) < 1e-9 * E_0
+    assert sim.grille_complete().shape == tuple(-(-n // 4) for n in modele.T.shape)
+
+    # Depuis la description par boîtes: même maillage, lu par régions bornées (jamais la grille fine)
+    regions = []
+    rasteriser = GeometrieBoites.rasteriser
+
+    def rasteriser_compte(geometrie, debut, fin):
+        regions.append(int(np.prod(np.asarray(fin) - debut)))
+        return rasteriser(geometrie, debut, fin)
+
+    geometrie = construire_maison_benchmark(logger, dims_m=(5.0, 6.0, 5.0), dt=10.0, geometrie=True)
+    monkeypatch.setattr(GeometrieBoites, "rasteriser", rasteriser_compte)
+    sim_geo = SimulationBlocs(geometrie, chemin_sortie=sortie())
+    assert max(regions) <= (MaillageBlocs.TAILLE_REGION * 8 + 2 * 3) ** 3 < modele.T.size
+    modele = construire_maison_benchmark(logger, dims_m=(5.0, 6.0, 5.0), dt=10.0)
+    sim = SimulationBlocs(modele, chemin_sortie=sortie())
+    assert np.array_equal(sim_geo.maillage.origines, sim.maillage.origines)
+    assert np.array_equal(sim_geo.maillage.G, sim.maillage.G)
+    assert list(geometrie.zones_air) == list(modele.zones_air)
+    assert geometrie.zones_air[-1].volume_m3 == pytest.approx(modele.zones_air[-1].volume_m3)
+    for _ in range(10):
+        sim._pas_de_temps()
+        sim_geo._pas_de_temps()
+    assert np.allclose(sim_geo.T, sim.T, rtol=0, atol=1e-10)
+    assert abs(geometrie.zones_air[-1].T - modele.zones_air[-1].T) < 1e-10
+
+
+def test_moteur_tampons(sortie):
+    """Tampons préalloués: identique bit à bit, aucun tableau alloué pendant un pas."""
+    T_ref, air_ref = _simuler(sortie(), 30, moteur="numpy")
+    T_tampons, air_tampons = _simuler(sortie(), 30, moteur="tampons")
+
+    assert np.array_equal(T_ref, T_tampons)
+    assert air_ref == air_tampons
+
+    logger = LoggerSimulation(niveau="WARN")
+    modele = construire_maison_benchmark(logger, dims_m=(5.0, 6.0, 5.0), dt=10.0)
+    # Restent quelques scalaires Python, indépendants de la taille de la grille
+    assert mesurer_allocations(modele, 3, moteur="tampons") < 4096
+    assert mesurer_allocations(modele, 3, moteur="numpy") > modele.T.nbytes
+
+
+@pytest.mark.skipif(not NUMBA_DISPONIBLE, reason="numba non installé")
+def test_moteur_numba(sortie):
+    """Le pas fusionné Numba (noyaux compilés) doit reproduire la référence, avec et sans rayonnement."""
+    for options in ({}, {"enable_rayonnement": False}):
+        T_ref, air_ref = _simuler(sortie(), 30, moteur="numpy", **options)
+        T_numba, air_numba = _simuler(sortie(), 30, moteur="numba", **options)
+
+        assert np.max(np.abs(T_ref - T_numba)) < 1e-9
+        assert air_ref.keys() == air_numba.keys()
+        assert all(abs(air_ref[i] - air_numba[i]) < 1e-9 for i in air_ref)
+
+
+def test_moteur_parallele(sortie):
+    """Tranches en threads: indépendant du nombre de threads, proche de la référence."""
+    T_ref, air_ref = _simuler(sortie(), 30, moteur="numpy")
+    T_1, air_1 = _simuler(sortie(), 30, moteur="parallele", nb_threads=1)
+    T_4, air_4 = _simuler(sortie(), 30, moteur="parallele", nb_threads=4)
+
+    assert np.array_equal(T_1, T_4)
+    assert air_1 == air_4
+    assert np.max(np.abs(T_1 - T_ref)) < 1e-9
+
+    # Pool arrêté en fin de simulation
+    modele = construire_maison_benchmark(LoggerSimulation(niveau="WARN"), dims_m=(5.0, 6.0, 5.0))
+    sim = Simulation(modele, chemin_sortie=sortie(), moteur="parallele", nb_threads=2)
+    sim.lancer_simulation(duree_s=30, intervalle_stockage_s=30)
+    assert sim.noyau.pool is None
+
+
+def test_simulation_distribuee(sortie):
+    """Sous-domaines en processus: mêmes champs et mêmes instantanés que le moteur creux."""
+    logger = LoggerSimulation(niveau="WARN")
+    modele = construire_maison_benchmark(logger, dims_m=(5.0, 6.0, 5.0), dt=10.0)
+    sim = Simulation(modele, chemin_sortie=sortie(), moteur="creux")
+    sim.lancer_simulation(300, intervalle_stockage_s=100)
+    T_air_ref = modele.zones_air[-1].T
+
+    modele = construire_maison_benchmark(logger, dims_m=(5.0, 6.0, 5.0), dt=10.0)
+    distribuee = SimulationDistribuee(modele, nb_processus=3, chemin_sortie=sortie())
+    distribuee.lancer_simulation(300, intervalle_stockage_s=100)
+
+    assert np.max(np.abs(distribuee.T - sim.T)) < 1e-9
+    assert abs(modele.zones_air[-1].T - T_air_ref) < 1e-9
+    assert [t for t, _ in distribuee.stockage.index_temps] == [t for t, _ in sim.stockage.index_temps]
+    etape_ref = sim.stockage.charger_etape(2)
+    etape = distribuee.stockage.charger_etape(2)
+    assert np.max(np.abs(etape["matrice_T"] - etape_ref["matrice_T"])) < 1e-9
+
+
+@pytest.mark.skipif(mp.get_start_method() != "fork", reason="Substitution héritée par fork uniquement")
+def test_simulation_distribuee_processus_arrete(monkeypatch, sortie):
+    """Un processus tué: les autres sont débloqués et lancer_simulation lève RuntimeError."""
+    logger = LoggerSimulation(niveau="ERROR")
+    modele = construire_maison_benchmark(logger, dims_m=(5.0, 6.0, 5.0), dt=10.0)
+    distribuee = SimulationDistribuee(modele, nb_processus=3, chemin_sortie=sortie(),
+                                      delai_attente_s=10.0)
+    assert not hasattr(distribuee, "domaines")  # Sous-domaines construits dans les processus
+
+    bloc_possede = SousDomaine.bloc_possede
+
+    def bloc_possede_mortel(domaine, T):
+        if domaine.rang == 1:
+            os._exit(3)
+        return bloc_possede(domaine, T)
+
+    monkeypatch.setattr(SousDomaine, "bloc_possede", bloc_possede_mortel)
+    debut = time.time()
+    with pytest.raises(RuntimeError, match="processus 1"):
+        distribuee.lancer_simulation(300, intervalle_stockage_s=100)
+    assert time.time() - debut < 10.0
+
+
+def test_moteur_multi_pas():
+    """Multi-pas: dt global 3.5x la CFL de la laine de verre, stable et proche d'un dt fin."""
+    logger = LoggerSimulation(niveau="WARN")
+    forme = (8, 8, 12)
+    noms = ("LAINE_VERRE", "PARPAING", "LAINE_BOIS")
+    couche = np.zeros(forme, dtype=int)
+    couche[:, :, 4:8] = 1
+    couche[:, :, 8:] = 2
+    Lambda = np.array([MATERIAUX[nom]["lambda"] for nom in noms])[couche]
+    RhoCp = np.array([MATERIAUX[nom]["rho"] * MATERIAUX[nom]["cp"] for nom in noms])[couche]
+    Alpha = Lambda / RhoCp
+    T_init = np.zeros(forme)
+    T_init[1:-1, 1:-1, 1:-1] = 20.0
+
+    resultats = {}
+    for dt in (5.0, 1800.0):
+        noyau = NoyauConductionMultiPas(Alpha, Lambda, RhoCp, Alpha > 0, 0.1, dt, logger)
+        T, T_new = T_init.copy(), T_init.copy()
+        for _ in range(int(7200 / dt)):
+            noyau.avancer(T, T_new)
+            T, T_new = T_new, T
+        resultats[dt] = (T, noyau.niveau_max)
+
+    T_ref, niveaux_ref = resultats[5.0]
+    T_mp, niveaux_mp = resultats[1800.0]
+    assert niveaux_ref == 0 and niveaux_mp == 2
+    assert T_mp.min() >= 0.0 and T_mp.max() <= 20.0
+    assert np.max(np.abs(T_mp - T_ref)) < 1.0
+
+
+def test_multi_pas_conservation():
+    """Multi-pas: énergie Σ C·T conservée à l'arrondi à travers les interfaces entre niveaux."""
+    logger = LoggerSimulation(niveau="WARN")
+    forme = (32, 32, 32)
+    noms = ("LAINE_VERRE", "PARPAING")
+    couche = np.zeros(forme, dtype=int)
+    couche[:, :, 16:] = 1
+    Lambda = np.array([MATERIAUX[nom]["lambda"] for nom in noms])[couche]
+    RhoCp = np.array([MATERIAUX[nom]["rho"] * MATERIAUX[nom]["cp"] for nom in noms])[couche]
+    Alpha = Lambda / RhoCp
+    # Point chaud à cheval sur l'interface; 2 pas de 4 sous-pas ne l'étalent que de 8 voxels:
+    # aucun flux n'atteint les bords imposés
+    T = np.zeros(forme)
+    T[14:18, 14:18, 14:18] = 20.0
+    T_new = T.copy()
+
+    noyau = NoyauConductionMultiPas(Alpha, Lambda, RhoCp, Alpha > 0, 0.1, 1800.0, logger)
+    assert noyau.niveau_max == 2 and np.count_nonzero(noyau.niveaux == 0) > 0
+    energie = np.dot(noyau.C, T.reshape(-1)[noyau.indices])
+    for _ in range(2):
+        noyau.avancer(T, T_new)
+        T, T_new = T_new, T
+    assert T[15, 15, 10] > 0.0 and T[15, 15, 19] > 0.0  # Étalé des deux côtés de l'interface
+    assert not np.any(T[:6]) and not np.any(T[:, :, 26:])
+    assert abs(np.dot(noyau.C, T.reshape(-1)[noyau.indices]) / energie - 1) < 1e-12
+
+
+def test_schemas_implicites(sortie):
+    """Euler implicite / Crank-Nicolson: proches de l'explicite, stables à grand dt."""
+    T_ref, air_ref = _simuler(sortie(), 60, schema="explicite")
+
+    for schema in ("euler_implicite", "crank_nicolson"):
+        T_imp, air_imp = _simuler(sortie(), 60, schema=schema)
+        assert np.max(np.abs(T_imp - T_ref)) < 0.05
+        assert abs(air_imp[-1] - air_ref[-1]) < 0.05
+
+    # dt = 15 min (CFL explicite largement dépassée): pas d'instabilité,
+    # les températures restent entre l'extérieur (0°C) et l'intérieur (20°C)
+    T_15min, air_15min = _simuler(sortie(), 8, dt=900.0, schema="euler_implicite")
+    assert np.all(np.isfinite(T_15min))
+    assert T_15min.min() >= -1e-6 and T_15min.max() <= 20.0 + 1e-6
+    assert 0.0 < air_15min[-1] < 20.0
+
+
+def test_regime_permanent(sortie):
+    """L'équilibre direct doit coïncider avec une longue intégration implicite."""
+    logger = LoggerSimulation(niveau="WARN")
+
+    modele = construire_maison_benchmark(logger, dims_m=(4.0, 4.0, 5.0))
+    sim = Simulation(modele, chemin_sortie=sortie())
+    resultat = sim.resoudre_regime_permanent()
+
+    # 200 pas de 6h (50 jours) en Euler implicite
+    modele_long = construire_maison_benchmark(logger, dims_m=(4.0, 4.0, 5.0), dt=6 * 3600.0)
+    sim_long = Simulation(modele_long, chemin_sortie=sortie(), schema="euler_implicite")
+    for _ in range(200):
+        sim_long._pas_de_temps()
+
+    assert np.max(np.abs(sim.T - sim_long.T)) < 1e-3
+    assert abs(resultat["temperatures_air"]["-1"] - modele_long.zones_air[-1].T) < 1e-3
+    assert abs(resultat["pertes_W"] - sim_long._calculer_pertes_W()) < 1e-2 * abs(resultat["pertes_W"])
+
+
+def test_multigrille(sortie):
+    """Préconditionneur multigrille: même équilibre, même pas implicite que Jacobi."""
+    logger = LoggerSimulation(niveau="WARN")
+
+    resultats = {}
+    for solveur in ("bicgstab", "multigrille"):
+        modele = construire_maison_benchmark(logger, dims_m=(4.0, 4.0, 5.0))
+        sim = Simulation(modele, chemin_sortie=sortie())
+        resultats[solveur] = (sim.resoudre_regime_permanent(solveur=solveur), sim.T)
+
+    (res_ref, T_ref), (res_mg, T_mg) = resultats["bicgstab"], resultats["multigrille"]
+    assert np.max(np.abs(T_mg - T_ref)) < 1e-4
+    assert abs(res_mg["pertes_W"] - res_ref["pertes_W"]) < 1e-4 * abs(res_ref["pertes_W"])
+
+    T_ilu, _ = _simuler(sortie(), 5, dt=900.0, schema="euler_implicite")
+    for preconditionneur in ("jacobi", "multigrille"):
+        T_autre, _ = _simuler(sortie(), 5, dt=900.0, schema="euler_implicite", preconditionneur=preconditionneur)
+        assert np.max(np.abs(T_autre - T_ilu)) < 1e-4
+
+
+def test_pas_adaptatif(sortie):
+    """Pas adaptatif: beaucoup moins de pas qu'à dt fixe, instants de stockage respectés."""
+    logger = LoggerSimulation(niveau="WARN")
+    duree_s = 6 * 3600.0
+
+    modele_fixe = construire_maison_benchmark(logger, dims_m=(5.0, 6.0, 5.0), dt=60.0)
+    sim_fixe = Simulation(modele_fixe, chemin_sortie=sortie(), schema="euler_implicite")
+    sim_fixe.lancer_simulation(duree_s, intervalle_stockage_s=3600)
+
+    modele = construire_maison_benchmark(logger, dims_m=(5.0, 6.0, 5.0), dt=60.0)
+    sim = Simulation(modele, chemin_sortie=sortie(), schema="euler_implicite",
+                     preconditionneur="jacobi", pas_adaptatif=True, tolerance_pas_K=0.05)
+    sim.lancer_simulation(duree_s, intervalle_stockage_s=3600)
+
+    assert sim.nb_pas_acceptes < sim_fixe.solveur.nb_pas / 5
+    assert abs(modele.zones_air[-1].T - modele_fixe.zones_air[-1].T) < 0.2
+    temps_stockes = [temps for temps, _ in sim.stockage.index_temps]
+    assert np.allclose(temps_stockes, np.arange(0.0, duree_s + 1.0, 3600.0))
@@ -15,15 +15,18 @@ class Visualisation:
     def __init__(self, simulation):
         """Initialise le visualiseur en liant la simulation."""
         self.simulation = simulation
-        self.modele = simulation.modele
+        # Modèle complet: les résultats stockés sont reconstruits sur sa grille (recadrage, symétrie)
+        self.modele = simulation.modele_complet
         self.stockage = simulation.stockage
-        self.params = simulation.params
+        self.params = self.modele.params
         self.logger = LoggerSimulation(niveau="DEBUG")
 
         self.logger.info("Visualiseur PyVista initialisé.")
 
     def _creer_grille_pyvista(self):
-        """Crée l'objet grille (ImageData) PyVista."""
+        """Crée l'objet grille PyVista (ImageData, RectilinearGrid si non uniforme)."""
+        if not self.params.uniforme:
+            return pv.RectilinearGrid(*self.params.coords_m)
         grid = pv.ImageData()
         grid.dimensions = (self.params.N_x, self.params.N_y, self.params.N_z)
         grid.spacing = (self.params.ds, self.params.ds, self.params.ds)
@@ -71,12 +74,12 @@ class Visualisation:
         # 2. Points de surface
         points_surface_vis = pv.PolyData()
         tous_points = np.array([], dtype=np.int64).reshape(0, 3)
-        ds = self.params.ds
+        x, y, z = (self.params.coordonnees_m(axe) for axe in range(3))
 
         for id_zone, indices_tuple in self.modele.surfaces_convection_idx.items():
             if indices_tuple[0].size > 0:
                 i, j, k = indices_tuple
-                points_m = np.vstack((i * ds, j * ds, k * ds)).T
+                points_m = np.vstack((x[i], y[j], z[k])).T
                 tous_points = np.vstack((tous_points, points_m))
 
         # 3. Afficher